@@ -31,6 +31,7 @@ from .helpers import (
     entity_registry,
     issue_registry,
     recorder,
+    template,
 )
 from .helpers.dispatcher import async_dispatcher_send
 from .helpers.typing import ConfigType
@@ -236,13 +237,14 @@ async def load_registries(hass: core.HomeAssistant) -> None:
         """
         platform.uname().processor  # pylint: disable=expression-not-assigned
 
-    # Load the registries and cache the result of platform.uname().processor
+    # Load the registries, the template code cache and cache the result of platform.uname().processor
     entity.async_setup(hass)
     await asyncio.gather(
         area_registry.async_load(hass),
         device_registry.async_load(hass),
         entity_registry.async_load(hass),
         issue_registry.async_load(hass),
+        template.async_load_code_cache(hass),
         hass.async_add_executor_job(_cache_uname_processor),
     )
 
@@ -5,3 +5,7 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+# The smallest max_points that leaves room for one bucket
+# in between the first and last states of an entity
+MIN_MAX_POINTS = 4
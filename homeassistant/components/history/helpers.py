@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import datetime as dt
+from typing import Any
 
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
 from homeassistant.core import HomeAssistant
 
 
@@ -21,3 +23,70 @@ def entities_may_have_state_changes_after(
             return True
 
     return False
+
+
+def _as_float(state: str) -> float | None:
+    """Return the state as a float or None if it is not numeric."""
+    try:
+        return float(state)
+    except ValueError:
+        return None
+
+
+def _append_min_max(
+    downsampled: list[dict[str, Any]], bucket: list[tuple[float, dict[str, Any]]]
+) -> None:
+    """Append the states with the minimum and maximum value in time order."""
+    if not bucket:
+        return
+    min_idx = min(range(len(bucket)), key=lambda idx: bucket[idx][0])
+    max_idx = max(range(len(bucket)), key=lambda idx: bucket[idx][0])
+    downsampled.extend(bucket[idx][1] for idx in sorted({min_idx, max_idx}))
+
+
+def downsample_compressed_states(
+    states: list[dict[str, Any]], max_points: int
+) -> list[dict[str, Any]]:
+    """Downsample a list of compressed states to about max_points.
+
+    The time range is split in buckets and only the states with the
+    minimum and maximum value in each bucket are kept, so peaks remain
+    visible in the graph. The first and last states, and states that
+    are not numeric, such as unavailable, are always kept.
+    """
+    if len(states) <= max_points:
+        return states
+    first_state = states[0]
+    last_state = states[-1]
+    start_ts: float = first_state[COMPRESSED_STATE_LAST_UPDATED]
+    span: float = last_state[COMPRESSED_STATE_LAST_UPDATED] - start_ts
+    bucket_count = max(1, (max_points - 2) // 2)
+    downsampled = [first_state]
+    bucket: list[tuple[float, dict[str, Any]]] = []
+    bucket_idx = 0
+    for state in states[1:-1]:
+        if (value := _as_float(state[COMPRESSED_STATE_STATE])) is None:
+            _append_min_max(downsampled, bucket)
+            bucket.clear()
+            downsampled.append(state)
+            continue
+        state_bucket_idx = (
+            min(
+                int(
+                    (state[COMPRESSED_STATE_LAST_UPDATED] - start_ts)
+                    / span
+                    * bucket_count
+                ),
+                bucket_count - 1,
+            )
+            if span
+            else 0
+        )
+        if state_bucket_idx != bucket_idx:
+            _append_min_max(downsampled, bucket)
+            bucket.clear()
+            bucket_idx = state_bucket_idx
+        bucket.append((value, state))
+    _append_min_max(downsampled, bucket)
+    downsampled.append(last_state)
+    return downsampled
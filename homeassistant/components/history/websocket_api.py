@@ -38,8 +38,13 @@ from homeassistant.helpers.event import (
 from homeassistant.helpers.json import JSON_DUMP
 import homeassistant.util.dt as dt_util
 
-from .const import DOMAIN, EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
-from .helpers import entities_may_have_state_changes_after
+from .const import (
+    DOMAIN,
+    EVENT_COALESCE_TIME,
+    MAX_PENDING_HISTORY_STATES,
+    MIN_MAX_POINTS,
+)
+from .helpers import downsample_compressed_states, entities_may_have_state_changes_after
 from .models import HistoryConfig
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,6 +68,44 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_stream)
 
 
+def _get_compressed_significant_states(
+    hass: HomeAssistant,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    max_points: int | None,
+) -> MutableMapping[str, list[dict[str, Any]]]:
+    """Fetch history significant_states in the compressed format.
+
+    If max_points is set, the states of each entity are downsampled
+    to about max_points.
+    """
+    states = cast(
+        MutableMapping[str, list[dict[str, Any]]],
+        history.get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+        ),
+    )
+    if max_points:
+        for entity_id, state_list in states.items():
+            states[entity_id] = downsample_compressed_states(state_list, max_points)
+    return states
+
+
 def _ws_get_significant_states(
     hass: HomeAssistant,
     msg_id: int,
@@ -74,12 +117,13 @@ def _ws_get_significant_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    max_points: int | None,
 ) -> str:
     """Fetch history significant_states and convert them to json in the executor."""
     return JSON_DUMP(
         messages.result_message(
             msg_id,
-            history.get_significant_states(
+            _get_compressed_significant_states(
                 hass,
                 start_time,
                 end_time,
@@ -89,7 +133,7 @@ def _ws_get_significant_states(
                 significant_changes_only,
                 minimal_response,
                 no_attributes,
-                True,
+                max_points,
             ),
         )
     )
@@ -105,6 +149,7 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=MIN_MAX_POINTS)),
     }
 )
 @websocket_api.async_response
@@ -165,6 +210,7 @@ async def ws_get_history_during_period(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            msg.get("max_points"),
         )
     )
 
@@ -218,24 +264,22 @@ async def _async_send_historical_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    max_points: int | None,
     send_empty: bool,
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
-    states = cast(
-        MutableMapping[str, list[dict[str, Any]]],
-        await get_instance(hass).async_add_executor_job(
-            history.get_significant_states,
-            hass,
-            start_time,
-            end_time,
-            entity_ids,
-            filters,
-            include_start_time_state,
-            significant_changes_only,
-            minimal_response,
-            no_attributes,
-            True,
-        ),
+    states = await get_instance(hass).async_add_executor_job(
+        _get_compressed_significant_states,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        max_points,
     )
     last_time = 0
 
@@ -384,6 +428,7 @@ def _async_subscribe_events(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=MIN_MAX_POINTS)),
     }
 )
 @websocket_api.async_response
@@ -426,6 +471,7 @@ async def ws_stream(
     significant_changes_only = msg["significant_changes_only"]
     no_attributes = msg["no_attributes"]
     minimal_response = msg["minimal_response"]
+    max_points: int | None = msg.get("max_points")
 
     if end_time and end_time <= utc_now:
         if (
@@ -452,6 +498,7 @@ async def ws_stream(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            max_points,
             True,
         )
         return
@@ -518,6 +565,7 @@ async def ws_stream(
         significant_changes_only,
         minimal_response,
         no_attributes,
+        max_points,
         True,
     )
 
@@ -560,5 +608,6 @@ async def ws_stream(
         significant_changes_only,
         minimal_response,
         no_attributes,
+        max_points,
         send_empty=not last_event_time,
     )
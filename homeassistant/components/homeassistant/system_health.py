@@ -2,6 +2,7 @@
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import system_info
+from homeassistant.helpers.entity import DATA_COALESCED_STATE_WRITES
 
 
 @callback
@@ -16,7 +17,7 @@ async def system_health_info(hass):
     """Get info for the info page."""
     info = await system_info.async_get_system_info(hass)
 
-    return {
+    health_info = {
         "version": f"core-{info.get('version')}",
         "installation_type": info.get("installation_type"),
         "dev": info.get("dev"),
@@ -31,3 +32,7 @@ async def system_health_info(hass):
         "timezone": info.get("timezone"),
         "config_dir": hass.config.config_dir,
     }
+    if coalesced := hass.data.get(DATA_COALESCED_STATE_WRITES):
+        health_info["coalesced_state_writes"] = sum(coalesced.values())
+
+    return health_info
@@ -50,6 +50,7 @@ async def async_attach_trigger(
     removes = []
 
     event_data_schema = None
+    event_data_match: tuple[str, str] | None = None
     if CONF_EVENT_DATA in config:
         # Render the schema input
         template.attach(hass, config[CONF_EVENT_DATA])
@@ -62,6 +63,16 @@ async def async_attach_trigger(
             {vol.Required(key): value for key, value in event_data.items()},
             extra=vol.ALLOW_EXTRA,
         )
+        # Index the listener by the first string value, such as a device_id,
+        # so the schema is only checked for the events with that value
+        event_data_match = next(
+            (
+                (key, value)
+                for key, value in event_data.items()
+                if isinstance(value, str)
+            ),
+            None,
+        )
 
     event_context_schema = None
     if CONF_EVENT_CONTEXT in config:
@@ -114,7 +125,12 @@ async def async_attach_trigger(
         )
 
     removes = [
-        hass.bus.async_listen(event_type, handle_event, event_filter=filter_event)
+        hass.bus.async_listen(
+            event_type,
+            handle_event,
+            event_filter=filter_event,
+            event_data_match=event_data_match,
+        )
         for event_type in event_types
     ]
 
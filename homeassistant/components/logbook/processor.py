@@ -1,6 +1,7 @@
 """Event parser and human readable log generator."""
 from __future__ import annotations
 
+from collections import OrderedDict
 from collections.abc import Callable, Generator, Sequence
 from contextlib import suppress
 from dataclasses import dataclass
@@ -10,13 +11,14 @@ from typing import Any
 from sqlalchemy.engine import Result
 from sqlalchemy.engine.row import Row
 
+from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import (
     bytes_to_uuid_hex_or_none,
     process_datetime_to_timestamp,
     process_timestamp_to_utc_isoformat,
 )
-from homeassistant.components.recorder.util import session_scope
+from homeassistant.components.recorder.util import extract_metadata_ids, session_scope
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.const import (
     ATTR_DOMAIN,
@@ -58,6 +60,10 @@ from .models import EventAsRow, LazyEventPartialState, LogbookConfig, async_even
 from .queries import statement_for_request
 from .queries.common import PSEUDO_EVENT_STATE_CHANGED
 
+# The number of context origins to remember, events caused by
+# an older context are not augmented with its origin
+MAX_CONTEXT_LOOKUP_SIZE = 16384
+
 
 @dataclass
 class LogbookRun:
@@ -149,17 +155,38 @@ class EventProcessor:
             #
             return result.yield_per(1024)
 
-        stmt = statement_for_request(
-            start_day,
-            end_day,
-            self.event_types,
-            self.entity_ids,
-            self.device_ids,
-            self.filters,
-            self.context_id,
-        )
         with session_scope(hass=self.hass) as session:
-            return self.humanify(yield_rows(session.execute(stmt)))
+            instance = get_instance(self.hass)
+            metadata_ids: list[int] | None = None
+            if self.entity_ids:
+                entity_id_to_metadata_id = instance.states_meta_manager.get_many(
+                    self.entity_ids, session, False
+                )
+                metadata_ids = extract_metadata_ids(entity_id_to_metadata_id)
+            event_type_to_event_type_id = instance.event_type_manager.get_many(
+                self.event_types, session, False
+            )
+            event_type_ids = tuple(
+                event_type_id
+                for event_type_id in event_type_to_event_type_id.values()
+                if event_type_id is not None
+            )
+            stmt = statement_for_request(
+                start_day,
+                end_day,
+                event_type_ids,
+                self.entity_ids,
+                metadata_ids,
+                self.device_ids,
+                self.filters,
+                self.context_id,
+            )
+            events = self.humanify(yield_rows(session.execute(stmt)))
+
+        # The rows of the next query are new objects that would
+        # not hit the event cache so there is no reason to keep it
+        self.logbook_run.event_cache.clear()
+        return events
 
     def humanify(
         self, rows: Generator[EventAsRow, None, None] | Sequence[Row] | Result
@@ -253,19 +280,31 @@ def _humanify(
 
 
 class ContextLookup:
-    """A lookup class for context origins."""
+    """A lookup class for context origins.
+
+    The least recently seen contexts are forgotten when there are
+    more than MAX_CONTEXT_LOOKUP_SIZE.
+    """
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Memorize context origin."""
         self.hass = hass
         self._memorize_new = True
-        self._lookup: dict[bytes | None, Row | EventAsRow | None] = {None: None}
+        self._lookup: OrderedDict[bytes | None, Row | EventAsRow | None] = OrderedDict(
+            {None: None}
+        )
 
     def memorize(self, row: Row | EventAsRow) -> bytes | None:
         """Memorize a context from the database."""
         if self._memorize_new:
             context_id_bin: bytes = row.context_id_bin
-            self._lookup.setdefault(context_id_bin, row)
+            lookup = self._lookup
+            if context_id_bin in lookup:
+                lookup.move_to_end(context_id_bin)
+                return context_id_bin
+            lookup[context_id_bin] = row
+            if len(lookup) > MAX_CONTEXT_LOOKUP_SIZE:
+                lookup.popitem(last=False)
             return context_id_bin
         return None
 
@@ -1,6 +1,7 @@
 """Queries for logbook."""
 from __future__ import annotations
 
+from collections.abc import Collection
 from datetime import datetime as dt
 
 from sqlalchemy.sql.lambdas import StatementLambdaElement
@@ -19,8 +20,9 @@ from .entities_and_devices import entities_devices_stmt
 def statement_for_request(
     start_day_dt: dt,
     end_day_dt: dt,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...],
     entity_ids: list[str] | None = None,
+    states_metadata_ids: Collection[int] | None = None,
     device_ids: list[str] | None = None,
     filters: Filters | None = None,
     context_id: str | None = None,
@@ -32,12 +34,14 @@ def statement_for_request(
     # No entities: logbook sends everything for the timeframe
     # limited by the context_id and the yaml configured filter
     if not entity_ids and not device_ids:
-        states_entity_filter = filters.states_entity_filter() if filters else None
+        states_entity_filter = (
+            filters.states_metadata_entity_filter() if filters else None
+        )
         events_entity_filter = filters.events_entity_filter() if filters else None
         return all_stmt(
             start_day,
             end_day,
-            event_types,
+            event_type_ids,
             states_entity_filter,
             events_entity_filter,
             context_id_bin,
@@ -50,25 +54,27 @@ def statement_for_request(
 
     # entities and devices: logbook sends everything for the timeframe for the entities and devices
     if entity_ids and device_ids:
+        assert states_metadata_ids is not None
         json_quoted_entity_ids = [json_dumps(entity_id) for entity_id in entity_ids]
         json_quoted_device_ids = [json_dumps(device_id) for device_id in device_ids]
         return entities_devices_stmt(
             start_day,
             end_day,
-            event_types,
-            entity_ids,
+            event_type_ids,
+            states_metadata_ids,
             json_quoted_entity_ids,
             json_quoted_device_ids,
         )
 
     # entities: logbook sends everything for the timeframe for the entities
     if entity_ids:
+        assert states_metadata_ids is not None
         json_quoted_entity_ids = [json_dumps(entity_id) for entity_id in entity_ids]
         return entities_stmt(
             start_day,
             end_day,
-            event_types,
-            entity_ids,
+            event_type_ids,
+            states_metadata_ids,
             json_quoted_entity_ids,
         )
 
@@ -78,6 +84,6 @@ def statement_for_request(
     return devices_stmt(
         start_day,
         end_day,
-        event_types,
+        event_type_ids,
         json_quoted_device_ids,
     )
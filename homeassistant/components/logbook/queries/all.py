@@ -23,14 +23,14 @@ from .common import (
 def all_stmt(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...],
     states_entity_filter: ColumnElement | None = None,
     events_entity_filter: ColumnElement | None = None,
     context_id_bin: bytes | None = None,
 ) -> StatementLambdaElement:
     """Generate a logbook query for all entities."""
     stmt = lambda_stmt(
-        lambda: select_events_without_states(start_day, end_day, event_types)
+        lambda: select_events_without_states(start_day, end_day, event_type_ids)
     )
     if context_id_bin is not None:
         # Once all the old `state_changed` events
@@ -17,8 +17,10 @@ from homeassistant.components.recorder.db_schema import (
     STATES_CONTEXT_ID_BIN_INDEX,
     EventData,
     Events,
+    EventTypes,
     StateAttributes,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.filters import like_domain_matchers
 
@@ -44,7 +46,7 @@ PSEUDO_EVENT_STATE_CHANGED: Final = None
 
 EVENT_COLUMNS = (
     Events.event_id.label("event_id"),
-    Events.event_type.label("event_type"),
+    EventTypes.event_type.label("event_type"),
     Events.event_data.label("event_data"),
     Events.time_fired_ts.label("time_fired_ts"),
     Events.context_id_bin.label("context_id_bin"),
@@ -55,7 +57,7 @@ EVENT_COLUMNS = (
 STATE_COLUMNS = (
     States.state_id.label("state_id"),
     States.state.label("state"),
-    States.entity_id.label("entity_id"),
+    StatesMeta.entity_id.label("entity_id"),
     SHARED_ATTRS_JSON["icon"].as_string().label("icon"),
     OLD_FORMAT_ATTRS_JSON["icon"].as_string().label("old_format_icon"),
 )
@@ -63,7 +65,7 @@ STATE_COLUMNS = (
 STATE_CONTEXT_ONLY_COLUMNS = (
     States.state_id.label("state_id"),
     States.state.label("state"),
-    States.entity_id.label("entity_id"),
+    StatesMeta.entity_id.label("entity_id"),
     literal(value=None, type_=sqlalchemy.String).label("icon"),
     literal(value=None, type_=sqlalchemy.String).label("old_format_icon"),
 )
@@ -109,13 +111,13 @@ NOT_CONTEXT_ONLY = literal(value=None, type_=sqlalchemy.String).label("context_o
 def select_events_context_id_subquery(
     start_day: float,
     end_day: float,
-    event_types: tuple[str, ...],
+    event_type_ids: tuple[int, ...],
 ) -> Select:
     """Generate the select for a context_id subquery."""
     return (
         select(Events.context_id_bin)
         .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
-        .where(Events.event_type.in_(event_types))
+        .where(Events.event_type_id.in_(event_type_ids))
         .outerjoin(EventData, (Events.data_id == EventData.data_id))
     )
 
@@ -141,13 +143,14 @@ def select_states_context_only() -> Select:
 
 
 def select_events_without_states(
-    start_day: float, end_day: float, event_types: tuple[str, ...]
+    start_day: float, end_day: float, event_type_ids: tuple[int, ...]
 ) -> Select:
     """Generate an events select that does not join states."""
     return (
         select(*EVENT_ROWS_NO_STATES, NOT_CONTEXT_ONLY)
         .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
-        .where(Events.event_type.in_(event_types))
+        .where(Events.event_type_id.in_(event_type_ids))
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
         .outerjoin(EventData, (Events.data_id == EventData.data_id))
     )
 
@@ -173,7 +176,9 @@ def legacy_select_events_context_id(
             *STATE_COLUMNS,
             NOT_CONTEXT_ONLY,
         )
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
         .outerjoin(States, (Events.event_id == States.event_id))
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
         .where(
             (States.last_updated_ts == States.last_changed_ts)
             | States.last_changed_ts.is_(None)
@@ -199,6 +204,7 @@ def apply_states_filters(sel: Select, start_day: float, end_day: float) -> Selec
             (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
         )
         .outerjoin(OLD_STATE, (States.old_state_id == OLD_STATE.state_id))
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
         .where(_missing_state_matcher())
         .where(_not_continuous_entity_matcher())
         .where(
@@ -244,7 +250,7 @@ def _not_possible_continuous_domain_matcher() -> ColumnElement[bool]:
     """
     return sqlalchemy.and_(
         *[
-            ~States.entity_id.like(entity_domain)
+            ~StatesMeta.entity_id.like(entity_domain)
             for entity_domain in (
                 *ALWAYS_CONTINUOUS_ENTITY_ID_LIKE,
                 *CONDITIONALLY_CONTINUOUS_ENTITY_ID_LIKE,
@@ -261,7 +267,7 @@ def _conditionally_continuous_domain_matcher() -> ColumnElement[bool]:
     """
     return sqlalchemy.or_(
         *[
-            States.entity_id.like(entity_domain)
+            StatesMeta.entity_id.like(entity_domain)
             for entity_domain in CONDITIONALLY_CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
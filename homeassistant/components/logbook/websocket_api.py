@@ -33,8 +33,12 @@ MAX_PENDING_LOGBOOK_EVENTS = 2048
 EVENT_COALESCE_TIME = 0.35
 # minimum size that we will split the query
 BIG_QUERY_HOURS = 25
-# how many hours to deliver in the first chunk when we split the query
-BIG_QUERY_RECENT_HOURS = 24
+# how many hours to deliver in each chunk when we split the query
+BIG_QUERY_CHUNK_HOURS = 24
+# the queries exclude events at their start time, chunks after the first one
+# start this much earlier to include the events at the boundary. It is the
+# resolution of the event times so an event is never returned twice.
+CHUNK_BOUNDARY_OVERLAP = timedelta(microseconds=1)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -88,21 +92,15 @@ async def _async_send_historical_events(
     """Select historical data from the database and deliver it to the websocket.
 
     If the query is considered a big query we will split the request into
-    two chunks so that they get the recent events first and the select
-    that is expected to take a long time comes in after to ensure
-    they are not stuck at a loading screen and can start looking at
-    the data right away.
+    chunks of BIG_QUERY_CHUNK_HOURS so that they get the recent events first
+    and the older events come in after to ensure they are not stuck at a
+    loading screen and can start looking at the data right away. Only one
+    chunk of events is held in memory at a time.
 
     This function returns the time of the most recent event we sent to the
     websocket.
     """
-    is_big_query = (
-        not event_processor.entity_ids
-        and not event_processor.device_ids
-        and ((end_time - start_time) > timedelta(hours=BIG_QUERY_HOURS))
-    )
-
-    if not is_big_query:
+    if not _is_big_query(event_processor, start_time, end_time):
         message, last_event_time = await _async_get_ws_stream_events(
             hass,
             msg_id,
@@ -121,41 +119,57 @@ async def _async_send_historical_events(
             connection.send_message(message)
         return last_event_time
 
-    # This is a big query so we deliver
-    # the first three hours and then
-    # we fetch the old data
-    recent_query_start = end_time - timedelta(hours=BIG_QUERY_RECENT_HOURS)
-    recent_message, recent_query_last_event_time = await _async_get_ws_stream_events(
-        hass,
-        msg_id,
-        recent_query_start,
-        end_time,
-        formatter,
-        event_processor,
-        partial=True,
-    )
-    if recent_query_last_event_time:
-        connection.send_message(recent_message)
-
-    older_message, older_query_last_event_time = await _async_get_ws_stream_events(
-        hass,
-        msg_id,
-        start_time,
-        recent_query_start,
-        formatter,
-        event_processor,
-        partial,
-    )
-    # If there is no last_event_time, there are no historical
-    # results, but we still send an empty message
-    # if its the last one (not partial) so
-    # consumers of the api know their request was
-    # answered but there were no results
-    if older_query_last_event_time or not partial or force_send:
-        connection.send_message(older_message)
+    # This is a big query so we deliver the chunks
+    # from the most recent to the oldest one
+    last_event_time: dt | None = None
+    chunk_end = end_time
+    while chunk_end > start_time:
+        # The remainder is added to the last chunk instead of
+        # being delivered as a tiny chunk of its own
+        is_last_chunk = chunk_end - start_time <= timedelta(hours=BIG_QUERY_HOURS)
+        chunk_start = (
+            start_time
+            if is_last_chunk
+            else chunk_end - timedelta(hours=BIG_QUERY_CHUNK_HOURS)
+        )
+        message, chunk_last_event_time = await _async_get_ws_stream_events(
+            hass,
+            msg_id,
+            chunk_start,
+            chunk_end,
+            formatter,
+            event_processor,
+            partial if is_last_chunk else True,
+            query_start_time=_chunk_query_start(chunk_start, start_time),
+        )
+        # If there is no last_event_time, there are no historical
+        # results, but we still send an empty message
+        # if its the last one (not partial) so
+        # consumers of the api know their request was
+        # answered but there were no results
+        if chunk_last_event_time or (is_last_chunk and (not partial or force_send)):
+            connection.send_message(message)
+        last_event_time = last_event_time or chunk_last_event_time
+        chunk_end = chunk_start
 
     # Returns the time of the newest event
-    return recent_query_last_event_time or older_query_last_event_time
+    return last_event_time
+
+
+def _chunk_query_start(chunk_start: dt, start_time: dt) -> dt:
+    """Return the start time of the query for a chunk of a big query."""
+    if chunk_start == start_time:
+        return start_time
+    return chunk_start - CHUNK_BOUNDARY_OVERLAP
+
+
+def _is_big_query(
+    event_processor: EventProcessor, start_time: dt, end_time: dt
+) -> bool:
+    """Check if the query is expected to return a lot of events."""
+    return not event_processor.limited_select and (end_time - start_time) > timedelta(
+        hours=BIG_QUERY_HOURS
+    )
 
 
 async def _async_get_ws_stream_events(
@@ -166,6 +180,7 @@ async def _async_get_ws_stream_events(
     formatter: Callable[[int, Any], dict[str, Any]],
     event_processor: EventProcessor,
     partial: bool,
+    query_start_time: dt | None = None,
 ) -> tuple[str, dt | None]:
     """Async wrapper around _ws_formatted_get_events."""
     return await get_instance(hass).async_add_executor_job(
@@ -176,6 +191,7 @@ async def _async_get_ws_stream_events(
         formatter,
         event_processor,
         partial,
+        query_start_time,
     )
 
 
@@ -197,9 +213,14 @@ def _ws_stream_get_events(
     formatter: Callable[[int, Any], dict[str, Any]],
     event_processor: EventProcessor,
     partial: bool,
+    query_start_day: dt | None = None,
 ) -> tuple[str, dt | None]:
-    """Fetch events and convert them to json in the executor."""
-    events = event_processor.get_events(start_day, end_day)
+    """Fetch events and convert them to json in the executor.
+
+    The events are queried from query_start_day if it is set, the message
+    still covers the time frame from start_day.
+    """
+    events = event_processor.get_events(query_start_day or start_day, end_day)
     last_time = None
     if events:
         last_time = dt_util.utc_from_timestamp(events[-1]["when"])
@@ -439,11 +460,32 @@ def _ws_formatted_get_events(
     event_processor: EventProcessor,
 ) -> str:
     """Fetch events and convert them to json in the executor."""
-    return JSON_DUMP(
-        messages.result_message(
-            msg_id, event_processor.get_events(start_time, end_time)
+    if not _is_big_query(event_processor, start_time, end_time):
+        return JSON_DUMP(
+            messages.result_message(
+                msg_id, event_processor.get_events(start_time, end_time)
+            )
         )
-    )
+
+    # Fetch and serialize big queries in chunks so only the rows and
+    # event dicts of one chunk are held in memory at a time, the much
+    # smaller serialized chunks are kept until the response is built
+    serialized_chunks: list[str] = []
+    chunk_start = start_time
+    while chunk_start < end_time:
+        chunk_end = (
+            end_time
+            if end_time - chunk_start <= timedelta(hours=BIG_QUERY_HOURS)
+            else chunk_start + timedelta(hours=BIG_QUERY_CHUNK_HOURS)
+        )
+        if events := event_processor.get_events(
+            _chunk_query_start(chunk_start, start_time), chunk_end
+        ):
+            serialized_chunks.append(JSON_DUMP(events)[1:-1])
+        chunk_start = chunk_end
+
+    response = JSON_DUMP(messages.result_message(msg_id, ["TO_REPLACE"]))
+    return response.replace('"TO_REPLACE"', ",".join(serialized_chunks))
 
 
 @websocket_api.websocket_command(
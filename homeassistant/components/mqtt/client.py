@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from collections.abc import Callable, Coroutine, Iterable
 from functools import lru_cache
 import inspect
@@ -79,11 +80,16 @@ if TYPE_CHECKING:
     # Only import for paho-mqtt type checking here, imports are done locally
     # because integrations should be able to optionally rely on MQTT.
     import paho.mqtt.client as mqtt
+    from paho.mqtt.matcher import MQTTMatcher
 
 _LOGGER = logging.getLogger(__name__)
 
 DISCOVERY_COOLDOWN = 2
 TIMEOUT_ACK = 10
+# The number of topics for which the matching subscriptions are cached
+MATCHING_SUBSCRIPTIONS_CACHE_SIZE = 8192
+# The number of received messages handled before yielding to the event loop
+MAX_MESSAGES_PER_BATCH = 512
 
 SubscribePayloadType = str | bytes  # Only bytes if encoding is None
 
@@ -223,7 +229,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob[[ReceiveMessage], Coroutine[Any, Any, None] | None] = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str | None = attr.ib(default="utf-8")
@@ -314,6 +319,13 @@ class MQTT:
         self.conf = conf
         self._simple_subscriptions: dict[str, list[Subscription]] = {}
         self._wildcard_subscriptions: list[Subscription] = []
+        # Topic trie of the wildcard subscriptions by topic filter, to find
+        # the subscriptions matching a topic in O(topic levels)
+        self._wildcard_matcher: MQTTMatcher = _create_matcher()
+        # Messages received by the paho thread waiting to be handled
+        # in the event loop, which is woken up once per batch
+        self._pending_messages: deque[mqtt.MQTTMessage] = deque()
+        self._pending_messages_scheduled = False
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -473,6 +485,10 @@ class MQTT:
             )
         else:
             self._wildcard_subscriptions.append(subscription)
+            try:
+                self._wildcard_matcher[subscription.topic].append(subscription)
+            except KeyError:
+                self._wildcard_matcher[subscription.topic] = [subscription]
 
     @callback
     def _async_untrack_subscription(self, subscription: Subscription) -> None:
@@ -491,6 +507,10 @@ class MQTT:
                     del simple_subscriptions[topic]
             else:
                 self._wildcard_subscriptions.remove(subscription)
+                topic_subscriptions = self._wildcard_matcher[topic]
+                topic_subscriptions.remove(subscription)
+                if not topic_subscriptions:
+                    del self._wildcard_matcher[topic]
         except (KeyError, ValueError) as ex:
             raise HomeAssistantError("Can't remove subscription twice") from ex
 
@@ -508,9 +528,7 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
         self._async_track_subscription(subscription)
         self._matching_subscriptions.cache_clear()
 
@@ -669,16 +687,44 @@ class MQTT:
         self, _mqttc: mqtt.Client, _userdata: None, msg: mqtt.MQTTMessage
     ) -> None:
         """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        self._pending_messages.append(msg)
+        if not self._pending_messages_scheduled:
+            self._pending_messages_scheduled = True
+            self.hass.loop.call_soon_threadsafe(self._async_handle_pending_messages)
 
-    @lru_cache(None)  # pylint: disable=method-cache-max-size-none
+    @callback
+    def _async_handle_pending_messages(self) -> None:
+        """Handle a batch of the messages received by the paho thread.
+
+        If more messages are pending after the batch, another batch is
+        scheduled so a flood of retained messages does not block the
+        event loop.
+        """
+        pending_messages = self._pending_messages
+        try:
+            for _ in range(min(len(pending_messages), MAX_MESSAGES_PER_BATCH)):
+                msg = pending_messages.popleft()
+                try:
+                    self._mqtt_handle_message(msg)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Exception while handling message on topic %s", msg.topic
+                    )
+        finally:
+            # Reset the flag before checking for pending messages, since
+            # the paho thread only schedules a batch when the flag is not set
+            self._pending_messages_scheduled = False
+            if pending_messages:
+                self._pending_messages_scheduled = True
+                self.hass.loop.call_soon(self._async_handle_pending_messages)
+
+    @lru_cache(MATCHING_SUBSCRIPTIONS_CACHE_SIZE)
     def _matching_subscriptions(self, topic: str) -> list[Subscription]:
         subscriptions: list[Subscription] = []
         if topic in self._simple_subscriptions:
             subscriptions.extend(self._simple_subscriptions[topic])
-        for subscription in self._wildcard_subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
+        for topic_subscriptions in self._wildcard_matcher.iter_match(topic):
+            subscriptions.extend(topic_subscriptions)
         return subscriptions
 
     @callback
@@ -823,11 +869,9 @@ def _raise_on_error(result_code: int) -> None:
     _raise_on_errors((result_code,))
 
 
-def _matcher_for_topic(subscription: str) -> Any:
+def _create_matcher() -> MQTTMatcher:
+    """Create a topic trie to match topics against topic filters."""
     # pylint: disable-next=import-outside-toplevel
     from paho.mqtt.matcher import MQTTMatcher
 
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
+    return MQTTMatcher()
@@ -42,6 +42,9 @@ KEEPALIVE_TIME = 30
 
 EXCLUDE_ATTRIBUTES = f"{DOMAIN}_exclude_attributes_by_domain"
 
+STATES_META_SCHEMA_VERSION = 37
+EVENT_TYPE_IDS_SCHEMA_VERSION = 38
+
 
 class SupportedDialect(StrEnum):
     """Supported dialects."""
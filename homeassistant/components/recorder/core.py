@@ -11,11 +11,17 @@ import queue
 import sqlite3
 import threading
 import time
-from typing import Any, TypeVar, cast
+from typing import Any, NamedTuple, TypeVar
 
 import async_timeout
-from lru import LRU  # pylint: disable=no-name-in-module
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
+from sqlalchemy import (
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    func,
+    insert,
+    select,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
@@ -30,6 +36,7 @@ from homeassistant.const import (
     MATCH_ALL,
 )
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import entity_sources
 from homeassistant.helpers.event import (
     async_track_time_change,
@@ -37,6 +44,7 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
 )
 from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
@@ -46,23 +54,28 @@ from . import migration, statistics
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
+    EVENT_TYPE_IDS_SCHEMA_VERSION,
     KEEPALIVE_TIME,
     MARIADB_PYMYSQL_URL_PREFIX,
     MARIADB_URL_PREFIX,
     MAX_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
-    SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
+    STATES_META_SCHEMA_VERSION,
     SupportedDialect,
 )
 from .db_schema import (
+    LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX,
     SCHEMA_VERSION,
+    TABLE_STATES,
     Base,
     EventData,
     Events,
+    EventTypes,
     StateAttributes,
     States,
+    StatesMeta,
     Statistics,
     StatisticsRuns,
     StatisticsShortTerm,
@@ -76,13 +89,12 @@ from .models import (
     process_timestamp,
 )
 from .pool import POOL_SIZE, MutexPool, RecorderPool
-from .queries import (
-    find_shared_attributes_id,
-    find_shared_data_id,
-    get_shared_attributes,
-    get_shared_event_datas,
-)
+from .queries import has_entity_ids_to_migrate, has_event_types_to_migrate
 from .run_history import RunHistory
+from .table_managers.event_data import EventDataManager
+from .table_managers.event_types import EventTypeManager
+from .table_managers.state_attributes import StateAttributesManager
+from .table_managers.states_meta import StatesMetaManager
 from .tasks import (
     AdjustLRUSizeTask,
     AdjustStatisticsTask,
@@ -91,7 +103,10 @@ from .tasks import (
     CommitTask,
     ContextIDMigrationTask,
     DatabaseLockTask,
+    EntityIDMigrationTask,
+    EntityIDPostMigrationTask,
     EventTask,
+    EventTypeIDMigrationTask,
     ImportStatisticsTask,
     KeepAliveTask,
     PerodicCleanupTask,
@@ -105,9 +120,10 @@ from .tasks import (
 )
 from .util import (
     build_mysqldb_conv,
-    chunked,
     dburl_to_path,
     end_incomplete_runs,
+    execute_stmt_lambda_element,
+    get_index_by_name,
     is_second_sunday,
     move_away_broken_database,
     session_scope,
@@ -126,14 +142,10 @@ DEFAULT_URL = "sqlite:///{hass_config_path}"
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
-# The number of attribute ids to cache in memory
-#
-# Based on:
-# - The number of overlapping attributes
-# - How frequently states with overlapping attributes will change
-# - How much memory our low end hardware has
-STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
-EVENT_DATA_ID_CACHE_SIZE = 2048
+# The attributes and event data ids that were cached at
+# shutdown are saved to warm the caches at the next start
+ID_CACHE_STORAGE_KEY = "recorder.id_cache"
+ID_CACHE_STORAGE_VERSION = 1
 
 SHUTDOWN_TASK = object()
 
@@ -153,6 +165,34 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
 
 
+class PendingState(NamedTuple):
+    """A state that will be inserted at the next commit."""
+
+    entity_id: str
+    dbstate: States
+    # The old state when it was not yet inserted
+    # at the time the state was processed
+    old_state: States | None
+
+
+def _pending_state_to_row(
+    pending: PendingState, columns: Iterable[str]
+) -> dict[str, Any]:
+    """Convert a pending state to a row for a Core INSERT.
+
+    Resolves the ids of the old state, attributes, and states_meta
+    rows that were not known when the state was processed.
+    """
+    dbstate = pending.dbstate
+    if (old_state := pending.old_state) is not None:
+        dbstate.old_state_id = old_state.state_id
+    if (state_attributes := dbstate.state_attributes) is not None:
+        dbstate.attributes_id = state_attributes.attributes_id
+    if (states_meta := getattr(dbstate, "states_meta_rel", None)) is not None:
+        dbstate.metadata_id = states_meta.metadata_id
+    return {column: getattr(dbstate, column) for column in columns}
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -207,11 +247,15 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._old_states: dict[str | None, States] = {}
-        self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
-        self._event_data_ids: LRU = LRU(EVENT_DATA_ID_CACHE_SIZE)
-        self._pending_state_attributes: dict[str, StateAttributes] = {}
-        self._pending_event_data: dict[str, EventData] = {}
-        self._pending_expunge: list[States] = []
+        self.event_data_manager = EventDataManager(self)
+        self.state_attributes_manager = StateAttributesManager(self)
+        self._id_cache_store: Store[dict[str, Any]] = Store(
+            hass, ID_CACHE_STORAGE_VERSION, ID_CACHE_STORAGE_KEY
+        )
+        self._id_cache_snapshot: dict[str, Any] | None = None
+        self._pending_states: list[PendingState] = []
+        self.event_type_manager = EventTypeManager(self)
+        self.states_meta_manager = StatesMetaManager(self)
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
@@ -417,6 +461,8 @@ class Recorder(threading.Thread):
         self.queue_task(StopTask())
         self._async_stop_listeners()
         await self.hass.async_add_executor_job(self.join)
+        if self._id_cache_snapshot:
+            await self._id_cache_store.async_save(self._id_cache_snapshot)
 
     @callback
     def _async_hass_started(self, hass: HomeAssistant) -> None:
@@ -490,17 +536,44 @@ class Recorder(threading.Thread):
         self.queue_task(ADJUST_LRU_SIZE_TASK)
         self.async_periodic_statistics()
 
+    def _restore_id_caches(self) -> None:
+        """Warm the attributes and event data id caches from the last run."""
+        try:
+            snapshot = asyncio.run_coroutine_threadsafe(
+                self._id_cache_store.async_load(), self.hass.loop
+            ).result()
+        except (CancelledError, HomeAssistantError) as err:
+            _LOGGER.warning("Unable to load the recorder id cache: %s", err)
+            return
+        if not snapshot:
+            return
+        with session_scope(session=self.get_session()) as session:
+            self.state_attributes_manager.restore_snapshot(
+                snapshot["state_attributes"], session
+            )
+            self.event_data_manager.restore_snapshot(snapshot["event_data"], session)
+
+    def _snapshot_id_caches(self) -> None:
+        """Snapshot the attributes and event data id caches to save at shutdown."""
+        state_attributes = self.state_attributes_manager.snapshot()
+        event_data = self.event_data_manager.snapshot()
+        if state_attributes["ids"] or event_data["ids"]:
+            self._id_cache_snapshot = {
+                "state_attributes": state_attributes,
+                "event_data": event_data,
+            }
+
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
 
         If the number of entities has increased, increase the size of the LRU
-        cache to avoid thrashing.
+        cache to avoid thrashing. The attributes and event data caches also
+        grow when they are full and still need to look up ids in the database.
         """
-        state_attributes_lru = self._state_attributes_ids
-        current_size = state_attributes_lru.get_size()
         new_size = self.hass.states.async_entity_ids_count() * 2
-        if new_size > current_size:
-            state_attributes_lru.set_size(new_size)
+        self.state_attributes_manager.adjust_lru_size(new_size)
+        self.event_data_manager.adjust_lru_size(0)
+        self.states_meta_manager.adjust_lru_size(new_size)
 
     @callback
     def async_periodic_statistics(self) -> None:
@@ -636,6 +709,7 @@ class Recorder(threading.Thread):
 
         if schema_status.valid:
             self._setup_run()
+            self._activate_table_managers_or_queue_migrations()
         else:
             self.migration_in_progress = True
             self.migration_is_live = migration.live_migration(schema_status)
@@ -663,6 +737,7 @@ class Recorder(threading.Thread):
         if not schema_status.valid:
             if self._migrate_schema_and_setup_run(schema_status):
                 self.schema_version = SCHEMA_VERSION
+                self._activate_table_managers_or_queue_migrations()
                 if not self._event_listener:
                     # If the schema migration takes so long that the end
                     # queue watcher safety kicks in because MAX_QUEUE_BACKLOG
@@ -686,12 +761,37 @@ class Recorder(threading.Thread):
             self._schedule_compile_missing_statistics(session)
 
         _LOGGER.debug("Recorder processing the queue")
+        self._restore_id_caches()
         self._adjust_lru_size()
         self.hass.add_job(self._async_set_recorder_ready_migration_done)
         self.queue_task(ContextIDMigrationTask())
         self._run_event_loop()
         self._shutdown()
 
+    def _activate_table_managers_or_queue_migrations(self) -> None:
+        """Activate the table managers or schedule the migrations.
+
+        The event_types and states_meta tables can only be used
+        for queries once every row in the events and states tables
+        has been linked to them.
+        """
+        with session_scope(session=self.get_session()) as session:
+            if self.schema_version >= EVENT_TYPE_IDS_SCHEMA_VERSION:
+                if execute_stmt_lambda_element(session, has_event_types_to_migrate()):
+                    self.queue_task(EventTypeIDMigrationTask())
+                else:
+                    self.event_type_manager.active = True
+            if self.schema_version < STATES_META_SCHEMA_VERSION:
+                return
+            if execute_stmt_lambda_element(session, has_entity_ids_to_migrate()):
+                self.queue_task(EntityIDMigrationTask())
+                return
+            self.states_meta_manager.active = True
+            if get_index_by_name(
+                session, TABLE_STATES, LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX
+            ):
+                self.queue_task(EntityIDPostMigrationTask())
+
     def _run_event_loop(self) -> None:
         """Run the event loop for the recorder."""
         # Use a session for the event read loop
@@ -730,12 +830,14 @@ class Recorder(threading.Thread):
     def _pre_process_state_change_events(self, events: list[Event]) -> None:
         """Load startup state attributes from the database.
 
-        Since the _state_attributes_ids cache is empty at startup
+        Since the state attributes cache only has the ids from the last run
         we restore it from the database to avoid having to look up
         the attributes in the database for every state change
         until its primed.
         """
         assert self.event_session is not None
+        if self.schema_version >= STATES_META_SCHEMA_VERSION:
+            self.states_meta_manager.load(events, self.event_session)
         if hashes := [
             StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
             for event in events
@@ -743,32 +845,24 @@ class Recorder(threading.Thread):
                 shared_attrs_bytes := self._serialize_state_attributes_from_event(event)
             )
         ]:
-            with self.event_session.no_autoflush:
-                for hash_chunk in chunked(hashes, SQLITE_MAX_BIND_VARS):
-                    for id_, shared_attrs in self.event_session.execute(
-                        get_shared_attributes(hash_chunk)
-                    ).fetchall():
-                        self._state_attributes_ids[shared_attrs] = id_
+            self.state_attributes_manager.load_from_hashes(hashes, self.event_session)
 
     def _pre_process_non_state_change_events(self, events: list[Event]) -> None:
         """Load startup event attributes from the database.
 
-        Since the _event_data_ids cache is empty at startup
+        Since the event data cache only has the ids from the last run
         we restore it from the database to avoid having to look up
         the data in the database for every event until its primed.
         """
         assert self.event_session is not None
+        if self.schema_version >= EVENT_TYPE_IDS_SCHEMA_VERSION:
+            self.event_type_manager.load(events, self.event_session)
         if hashes := [
             EventData.hash_shared_data_bytes(shared_event_bytes)
             for event in events
             if (shared_event_bytes := self._serialize_event_data_from_event(event))
         ]:
-            with self.event_session.no_autoflush:
-                for hash_chunk in chunked(hashes, SQLITE_MAX_BIND_VARS):
-                    for id_, shared_data in self.event_session.execute(
-                        get_shared_event_datas(hash_chunk)
-                    ).fetchall():
-                        self._event_data_ids[shared_data] = id_
+            self.event_data_manager.load_from_hashes(hashes, self.event_session)
 
     def _guarded_process_one_task_or_recover(self, task: RecorderTask) -> None:
         """Process a task, guarding against exceptions to ensure the loop does not collapse."""
@@ -898,42 +992,6 @@ class Recorder(threading.Thread):
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
-    def _find_shared_attr_in_db(self, attr_hash: int, shared_attrs: str) -> int | None:
-        """Find shared attributes in the db from the hash and shared_attrs."""
-        #
-        # Avoid the event session being flushed since it will
-        # commit all the pending events and states to the database.
-        #
-        # The lookup has already have checked to see if the data is cached
-        # or going to be written in the next commit so there is no
-        # need to flush before checking the database.
-        #
-        assert self.event_session is not None
-        with self.event_session.no_autoflush:
-            if attributes_id := self.event_session.execute(
-                find_shared_attributes_id(attr_hash, shared_attrs)
-            ).first():
-                return cast(int, attributes_id[0])
-        return None
-
-    def _find_shared_data_in_db(self, data_hash: int, shared_data: str) -> int | None:
-        """Find shared event data in the db from the hash and shared_attrs."""
-        #
-        # Avoid the event session being flushed since it will
-        # commit all the pending events and states to the database.
-        #
-        # The lookup has already have checked to see if the data is cached
-        # or going to be written in the next commit so there is no
-        # need to flush before checking the database.
-        #
-        assert self.event_session is not None
-        with self.event_session.no_autoflush:
-            if data_id := self.event_session.execute(
-                find_shared_data_id(data_hash, shared_data)
-            ).first():
-                return cast(int, data_id[0])
-        return None
-
     def _serialize_event_data_from_event(self, event: Event) -> bytes | None:
         """Serialize event data."""
         try:
@@ -944,34 +1002,61 @@ class Recorder(threading.Thread):
 
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
-        assert self.event_session is not None
+        event_session = self.event_session
+        assert event_session is not None
         dbevent = Events.from_event(event)
+        if self.schema_version >= EVENT_TYPE_IDS_SCHEMA_VERSION:
+            self._link_event_type(dbevent, event.event_type)
         if not event.data:
-            self.event_session.add(dbevent)
+            event_session.add(dbevent)
             return
         if not (shared_data_bytes := self._serialize_event_data_from_event(event)):
             return
         shared_data = shared_data_bytes.decode("utf-8")
+        event_data_manager = self.event_data_manager
         # Matching attributes found in the pending commit
-        if pending_event_data := self._pending_event_data.get(shared_data):
+        if pending_event_data := event_data_manager.get_pending(shared_data):
             dbevent.event_data_rel = pending_event_data
         # Matching attributes id found in the cache
-        elif data_id := self._event_data_ids.get(shared_data):
+        elif data_id := event_data_manager.get_from_cache(shared_data):
             dbevent.data_id = data_id
         else:
             data_hash = EventData.hash_shared_data_bytes(shared_data_bytes)
             # Matching attributes found in the database
-            if data_id := self._find_shared_data_in_db(data_hash, shared_data):
-                self._event_data_ids[shared_data] = dbevent.data_id = data_id
+            if data_id := event_data_manager.get_from_db(
+                data_hash, shared_data, event_session
+            ):
+                dbevent.data_id = data_id
             # No matching attributes found, save them in the DB
             else:
                 dbevent_data = EventData(shared_data=shared_data, hash=data_hash)
-                dbevent.event_data_rel = self._pending_event_data[
-                    shared_data
-                ] = dbevent_data
-                self.event_session.add(dbevent_data)
-
-        self.event_session.add(dbevent)
+                event_data_manager.add_pending(shared_data, dbevent_data)
+                dbevent.event_data_rel = dbevent_data
+                event_session.add(dbevent_data)
+
+        event_session.add(dbevent)
+
+    def _link_event_type(self, dbevent: Events, event_type: str) -> None:
+        """Link an event to its event_types row."""
+        event_session = self.event_session
+        assert event_session is not None
+        event_type_manager = self.event_type_manager
+        # Matching event_type found in the pending commit
+        if pending_event_types := event_type_manager.get_pending(event_type):
+            dbevent.event_type_rel = pending_event_types
+        # Matching event_type_id found in the cache or the database
+        elif event_type_id := event_type_manager.get(event_type, event_session, True):
+            dbevent.event_type_id = event_type_id
+        # No matching event_type found, save it in the DB
+        else:
+            event_types = EventTypes(event_type=event_type)
+            event_type_manager.add_pending(event_types)
+            event_session.add(event_types)
+            dbevent.event_type_rel = event_types
+        if event_type_manager.active:
+            # Once the migration has finished the event_type
+            # is only stored in the event_types table
+            dbevent.event_type = None
 
     def _serialize_state_attributes_from_event(self, event: Event) -> bytes | None:
         """Serialize state changed event data."""
@@ -992,47 +1077,78 @@ class Recorder(threading.Thread):
 
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
-        assert self.event_session is not None
+        event_session = self.event_session
+        assert event_session is not None
         dbstate = States.from_event(event)
         if not (
             shared_attrs_bytes := self._serialize_state_attributes_from_event(event)
         ):
             return
 
+        entity_id: str = event.data["entity_id"]
+        if self.schema_version >= STATES_META_SCHEMA_VERSION:
+            self._link_states_meta(dbstate, entity_id)
+
         shared_attrs = shared_attrs_bytes.decode("utf-8")
         dbstate.attributes = None
+        state_attributes_manager = self.state_attributes_manager
         # Matching attributes found in the pending commit
-        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+        if pending_attributes := state_attributes_manager.get_pending(shared_attrs):
             dbstate.state_attributes = pending_attributes
         # Matching attributes id found in the cache
-        elif attributes_id := self._state_attributes_ids.get(shared_attrs):
+        elif attributes_id := state_attributes_manager.get_from_cache(shared_attrs):
             dbstate.attributes_id = attributes_id
         else:
             attr_hash = StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
             # Matching attributes found in the database
-            if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
+            if attributes_id := state_attributes_manager.get_from_db(
+                attr_hash, shared_attrs, event_session
+            ):
                 dbstate.attributes_id = attributes_id
-                self._state_attributes_ids[shared_attrs] = attributes_id
             # No matching attributes found, save them in the DB
             else:
                 dbstate_attributes = StateAttributes(
                     shared_attrs=shared_attrs, hash=attr_hash
                 )
+                state_attributes_manager.add_pending(shared_attrs, dbstate_attributes)
                 dbstate.state_attributes = dbstate_attributes
-                self._pending_state_attributes[shared_attrs] = dbstate_attributes
-                self.event_session.add(dbstate_attributes)
+                event_session.add(dbstate_attributes)
 
-        if old_state := self._old_states.pop(dbstate.entity_id, None):
-            if old_state.state_id:
-                dbstate.old_state_id = old_state.state_id
-            else:
-                dbstate.old_state = old_state
+        # The old state is still pending when the entity changed
+        # more than once since the last commit. In that case the
+        # old_state_id is resolved when the states are inserted.
+        if (old_state := self._old_states.pop(entity_id, None)) and (
+            old_state.state_id
+        ):
+            dbstate.old_state_id = old_state.state_id
+            old_state = None
         if event.data.get("new_state"):
-            self._old_states[dbstate.entity_id] = dbstate
-            self._pending_expunge.append(dbstate)
+            self._old_states[entity_id] = dbstate
         else:
             dbstate.state = None
-        self.event_session.add(dbstate)
+        self._pending_states.append(PendingState(entity_id, dbstate, old_state))
+
+    def _link_states_meta(self, dbstate: States, entity_id: str) -> None:
+        """Link a state to its states_meta row."""
+        event_session = self.event_session
+        assert event_session is not None
+        states_meta_manager = self.states_meta_manager
+        # Matching states_meta found in the pending commit
+        if pending_states_meta := states_meta_manager.get_pending(entity_id):
+            dbstate.states_meta_rel = pending_states_meta
+        # Matching metadata_id found in the cache or the database
+        elif metadata_id := states_meta_manager.get(entity_id, event_session, True):
+            dbstate.metadata_id = metadata_id
+        # No matching states_meta found, save it in the DB
+        else:
+            states_meta = StatesMeta(entity_id=entity_id)
+            states_meta_manager.add_pending(states_meta)
+            event_session.add(states_meta)
+            dbstate.states_meta_rel = states_meta
+        if states_meta_manager.active:
+            # Once the migration has finished the entity_id
+            # is only stored in the states_meta table
+            dbstate.entity_id = None
 
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1046,7 +1162,12 @@ class Recorder(threading.Thread):
 
     def _event_session_has_pending_writes(self) -> bool:
         return bool(
-            self.event_session and (self.event_session.new or self.event_session.dirty)
+            self.event_session
+            and (
+                self._pending_states
+                or self.event_session.new
+                or self.event_session.dirty
+            )
         )
 
     def _commit_event_session_or_retry(self) -> None:
@@ -1075,27 +1196,18 @@ class Recorder(threading.Thread):
         assert self.event_session is not None
         self._commits_without_expire += 1
 
+        if self._pending_states:
+            self._insert_pending_states()
         self.event_session.commit()
-        if self._pending_expunge:
-            for dbstate in self._pending_expunge:
-                # Expunge the state so its not expired
-                # until we use it later for dbstate.old_state
-                if dbstate in self.event_session:
-                    self.event_session.expunge(dbstate)
-            self._pending_expunge = []
-
-        # We just committed the state attributes to the database
-        # and we now know the attributes_ids.  We can save
-        # many selects for matching attributes by loading them
-        # into the LRU cache now.
-        for state_attr in self._pending_state_attributes.values():
-            self._state_attributes_ids[
-                state_attr.shared_attrs
-            ] = state_attr.attributes_id
-        self._pending_state_attributes = {}
-        for event_data in self._pending_event_data.values():
-            self._event_data_ids[event_data.shared_data] = event_data.data_id
-        self._pending_event_data = {}
+        self._pending_states = []
+
+        # We just committed the state attributes and event data to the
+        # database and we now know their ids. We can save many selects
+        # for matching attributes by loading them into the LRU caches now.
+        self.state_attributes_manager.post_commit_pending()
+        self.event_data_manager.post_commit_pending()
+        self.event_type_manager.post_commit_pending()
+        self.states_meta_manager.post_commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1104,6 +1216,75 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _insert_pending_states(self) -> None:
+        """Insert the pending states with batched Core INSERTs.
+
+        The ORM unit of work inserts states one row at a time since
+        it needs the state_id of each row to set the old_state_id
+        of the next state of the same entity. Instead, the pending
+        states are split into generations where each entity appears
+        at most once, so each generation can be written with a single
+        executemany and its state_ids are known before the old_state_ids
+        of the next generation are resolved.
+
+        The states are never added to the session so they do not
+        need to be expunged to be used later as the old state.
+        """
+        event_session = self.event_session
+        assert event_session is not None
+        # Assign ids to the pending StatesMeta and StateAttributes
+        # before the states that reference them are inserted
+        event_session.flush()
+        generations: list[list[PendingState]] = []
+        entity_generation: dict[str, int] = {}
+        for pending in self._pending_states:
+            generation = entity_generation.get(pending.entity_id, 0)
+            entity_generation[pending.entity_id] = generation + 1
+            if generation == len(generations):
+                generations.append([])
+            generations[generation].append(pending)
+
+        connection = event_session.connection()
+        table = States.__table__
+        with_metadata_id = self.schema_version >= STATES_META_SCHEMA_VERSION
+        # The metadata_id column does not exist yet if the
+        # schema migration is still in progress
+        columns = [
+            column.key
+            for column in table.columns
+            if not column.primary_key
+            and (with_metadata_id or column.key != "metadata_id")
+        ]
+        key_column = table.c.metadata_id if with_metadata_id else table.c.entity_id
+        for generation_states in generations:
+            rows = [
+                _pending_state_to_row(pending, columns) for pending in generation_states
+            ]
+            if connection.dialect.insert_executemany_returning:
+                # The rows are matched back to the states by entity
+                # since the order of the RETURNING rows is not guaranteed
+                states_by_key = {
+                    row[key_column.key]: pending.dbstate
+                    for row, pending in zip(rows, generation_states)
+                }
+                for state_id, key in connection.execute(
+                    insert(table).returning(table.c.state_id, key_column),
+                    rows,
+                ):
+                    states_by_key[key].state_id = state_id
+                continue
+            # Without RETURNING support only the states that can be
+            # referenced as the old state later need their state_id
+            no_state_id_rows: list[dict[str, Any]] = []
+            for row, pending in zip(rows, generation_states):
+                if pending.dbstate.state is None:
+                    no_state_id_rows.append(row)
+                    continue
+                result = connection.execute(insert(table), row)
+                pending.dbstate.state_id = result.inserted_primary_key[0]
+            if no_state_id_rows:
+                connection.execute(insert(table), no_state_id_rows)
+
     def _handle_sqlite_corruption(self) -> None:
         """Handle the sqlite3 database being corrupt."""
         try:
@@ -1118,10 +1299,11 @@ class Recorder(threading.Thread):
     def _close_event_session(self) -> None:
         """Close the event session."""
         self._old_states.clear()
-        self._state_attributes_ids.clear()
-        self._event_data_ids.clear()
-        self._pending_state_attributes.clear()
-        self._pending_event_data.clear()
+        self._pending_states.clear()
+        self.state_attributes_manager.reset()
+        self.event_data_manager.reset()
+        self.event_type_manager.reset()
+        self.states_meta_manager.reset()
 
         if not self.event_session:
             return
@@ -1152,6 +1334,18 @@ class Recorder(threading.Thread):
         """Migrate context ids if needed."""
         return migration.migrate_context_ids(self)
 
+    def _migrate_event_type_ids(self) -> bool:
+        """Migrate event type ids if needed."""
+        return migration.migrate_event_type_ids(self)
+
+    def _migrate_entity_ids(self) -> bool:
+        """Migrate entity_ids if needed."""
+        return migration.migrate_entity_ids(self)
+
+    def _post_migrate_entity_ids(self) -> bool:
+        """Post migrate entity_ids if needed."""
+        return migration.post_migrate_entity_ids(self)
+
     def _send_keep_alive(self) -> None:
         """Send a keep alive to keep the db connection open."""
         assert self.event_session is not None
@@ -1353,5 +1547,6 @@ class Recorder(threading.Thread):
         self._stop_executor()
         try:
             self._end_session()
+            self._snapshot_id_caches()
         finally:
             self._close_connection()
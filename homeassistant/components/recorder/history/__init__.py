@@ -0,0 +1,198 @@
+"""Provide pre-made queries on top of the recorder component."""
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import HomeAssistant, State
+
+from . import legacy, modern
+from ... import recorder
+from ..filters import Filters
+from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
+
+# These are the APIs of this package
+__all__ = [
+    "NEED_ATTRIBUTE_DOMAINS",
+    "SIGNIFICANT_DOMAINS",
+    "get_full_significant_states_with_session",
+    "get_last_state_changes",
+    "get_significant_states",
+    "get_significant_states_with_session",
+    "state_changes_during_period",
+]
+
+
+def _use_states_meta(hass: HomeAssistant) -> bool:
+    """Return if the states_meta table can be used for queries.
+
+    Until the entity_id migration has finished, the entity_id
+    column in the states table is still the source of truth.
+    """
+    return recorder.get_instance(hass).states_meta_manager.active
+
+
+def get_full_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    no_attributes: bool = False,
+) -> MutableMapping[str, list[State]]:
+    """Return a dict of significant states during a time period."""
+    if _use_states_meta(hass):
+        return modern.get_full_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+        )
+    return legacy.get_full_significant_states_with_session(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        no_attributes,
+    )
+
+
+def get_last_state_changes(
+    hass: HomeAssistant, number_of_states: int, entity_id: str
+) -> MutableMapping[str, list[State]]:
+    """Return the last number_of_states."""
+    if _use_states_meta(hass):
+        return modern.get_last_state_changes(hass, number_of_states, entity_id)
+    return legacy.get_last_state_changes(hass, number_of_states, entity_id)
+
+
+def get_significant_states(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+) -> MutableMapping[str, list[State | dict[str, Any]]]:
+    """Return a dict of significant states during a time period."""
+    if _use_states_meta(hass):
+        return modern.get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+        )
+    return legacy.get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        compressed_state_format,
+    )
+
+
+def get_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+) -> MutableMapping[str, list[State | dict[str, Any]]]:
+    """Return a dict of significant states during a time period."""
+    if _use_states_meta(hass):
+        return modern.get_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+        )
+    return legacy.get_significant_states_with_session(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        compressed_state_format,
+    )
+
+
+def state_changes_during_period(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_id: str | None = None,
+    no_attributes: bool = False,
+    descending: bool = False,
+    limit: int | None = None,
+    include_start_time_state: bool = True,
+) -> MutableMapping[str, list[State]]:
+    """Return a list of states that changed during a time period."""
+    if _use_states_meta(hass):
+        return modern.state_changes_during_period(
+            hass,
+            start_time,
+            end_time,
+            entity_id,
+            no_attributes,
+            descending,
+            limit,
+            include_start_time_state,
+        )
+    return legacy.state_changes_during_period(
+        hass,
+        start_time,
+        end_time,
+        entity_id,
+        no_attributes,
+        descending,
+        limit,
+        include_start_time_state,
+    )
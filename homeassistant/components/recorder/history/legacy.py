@@ -22,10 +22,10 @@ from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_
 from homeassistant.core import HomeAssistant, State, split_entity_id
 import homeassistant.util.dt as dt_util
 
-from .. import recorder
-from .db_schema import RecorderRuns, StateAttributes, States
-from .filters import Filters
-from .models import (
+from ... import recorder
+from ..db_schema import RecorderRuns, StateAttributes, States
+from ..filters import Filters
+from ..models import (
     LazyState,
     LazyStatePreSchema31,
     process_datetime_to_timestamp,
@@ -34,31 +34,18 @@ from .models import (
     row_to_compressed_state,
     row_to_compressed_state_pre_schema_31,
 )
-from .util import execute_stmt_lambda_element, session_scope
+from ..util import execute_stmt_lambda_element, session_scope
+from .const import (
+    IGNORE_DOMAINS_ENTITY_ID_LIKE,
+    LAST_CHANGED_KEY,
+    NEED_ATTRIBUTE_DOMAINS,
+    SIGNIFICANT_DOMAINS,
+    SIGNIFICANT_DOMAINS_ENTITY_ID_LIKE,
+    STATE_KEY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-STATE_KEY = "state"
-LAST_CHANGED_KEY = "last_changed"
-
-SIGNIFICANT_DOMAINS = {
-    "climate",
-    "device_tracker",
-    "humidifier",
-    "thermostat",
-    "water_heater",
-}
-SIGNIFICANT_DOMAINS_ENTITY_ID_LIKE = [f"{domain}.%" for domain in SIGNIFICANT_DOMAINS]
-IGNORE_DOMAINS = {"zone", "scene"}
-IGNORE_DOMAINS_ENTITY_ID_LIKE = [f"{domain}.%" for domain in IGNORE_DOMAINS]
-NEED_ATTRIBUTE_DOMAINS = {
-    "climate",
-    "humidifier",
-    "input_datetime",
-    "thermostat",
-    "water_heater",
-}
-
 
 _BASE_STATES = (
     States.entity_id,
@@ -30,13 +30,18 @@ from homeassistant.util.ulid import ulid_to_bytes
 from .const import SupportedDialect
 from .db_schema import (
     CONTEXT_ID_BIN_MAX_LENGTH,
+    LEGACY_EVENTS_EVENT_TYPE_TIME_FIRED_TS_INDEX,
+    LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX,
     SCHEMA_VERSION,
     STATISTICS_TABLES,
+    TABLE_EVENTS,
     TABLE_STATES,
     Base,
     Events,
+    EventTypes,
     SchemaChanges,
     States,
+    StatesMeta,
     Statistics,
     StatisticsMeta,
     StatisticsRuns,
@@ -44,6 +49,9 @@ from .db_schema import (
 )
 from .models import process_timestamp
 from .queries import (
+    batch_cleanup_entity_ids,
+    find_entity_ids_to_migrate,
+    find_event_types_to_migrate,
     find_events_context_ids_to_migrate,
     find_states_context_ids_to_migrate,
 )
@@ -978,6 +986,12 @@ def _apply_update(  # noqa: C901
             )
         _create_index(session_maker, "events", "ix_events_context_id_bin")
         _create_index(session_maker, "states", "ix_states_context_id_bin")
+    elif new_version == 37:
+        _add_columns(session_maker, "states", [f"metadata_id {big_int}"])
+        _create_index(session_maker, "states", "ix_states_metadata_id_last_updated_ts")
+    elif new_version == 38:
+        _add_columns(session_maker, "events", [f"event_type_id {big_int}"])
+        _create_index(session_maker, "events", "ix_events_event_type_id_time_fired_ts")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1288,6 +1302,150 @@ def migrate_context_ids(instance: Recorder) -> bool:
     return is_done
 
 
+def migrate_event_type_ids(instance: Recorder) -> bool:
+    """Migrate event_type to event_type_ids."""
+    session_maker = instance.get_session
+    _LOGGER.debug("Migrating event_types")
+    event_type_manager = instance.event_type_manager
+    with session_scope(session=session_maker()) as session:
+        if events := session.execute(find_event_types_to_migrate()).all():
+            event_types = {event_type for _, event_type in events}
+            event_type_to_id = event_type_manager.get_many(event_types, session, True)
+            if missing_event_types := {
+                # We should never see None for the event_type in the events table
+                # but we need to be defensive so we don't fail the migration
+                # because of a bad event
+                event_type or ""
+                for event_type, event_id in event_type_to_id.items()
+                if event_id is None
+            }:
+                missing_db_event_types = [
+                    EventTypes(event_type=event_type)
+                    for event_type in missing_event_types
+                ]
+                session.add_all(missing_db_event_types)
+                session.flush()  # Assign ids
+                for db_event_type in missing_db_event_types:
+                    # We cannot add the assigned ids to the event_type_manager
+                    # because the commit could get rolled back
+                    assert db_event_type.event_type is not None
+                    event_type_to_id[
+                        db_event_type.event_type
+                    ] = db_event_type.event_type_id
+
+            session.execute(
+                update(Events),
+                [
+                    {
+                        "event_id": event_id,
+                        "event_type": None,
+                        "event_type_id": event_type_to_id[event_type or ""],
+                    }
+                    for event_id, event_type in events
+                ],
+            )
+
+        # If there is more work to do return False
+        # so that we can be called again
+        is_done = not events
+
+    if is_done:
+        # Drop the old index which is no longer needed
+        _drop_index(
+            session_maker,
+            TABLE_EVENTS,
+            LEGACY_EVENTS_EVENT_TYPE_TIME_FIRED_TS_INDEX,
+            quiet=True,
+        )
+
+    _LOGGER.debug("Migrating event_types done=%s", is_done)
+    return is_done
+
+
+def migrate_entity_ids(instance: Recorder) -> bool:
+    """Migrate entity_ids to states_meta.
+
+    We do this in two steps because we need the history queries to work
+    while we are migrating.
+
+    1. Link the states to the states_meta table
+    2. Remove the entity_id column from the states table (in post_migrate_entity_ids)
+    """
+    _LOGGER.debug("Migrating entity_ids")
+    states_meta_manager = instance.states_meta_manager
+    with session_scope(session=instance.get_session()) as session:
+        if states := session.execute(find_entity_ids_to_migrate()).all():
+            entity_ids = {entity_id for _, entity_id in states}
+            entity_id_to_metadata_id = states_meta_manager.get_many(
+                entity_ids, session, True
+            )
+            if missing_entity_ids := {
+                # We should never see a None entity_id, but we need to be defensive
+                entity_id or ""
+                for entity_id, metadata_id in entity_id_to_metadata_id.items()
+                if metadata_id is None
+            }:
+                missing_states_metadata = [
+                    StatesMeta(entity_id=entity_id) for entity_id in missing_entity_ids
+                ]
+                session.add_all(missing_states_metadata)
+                session.flush()
+                for db_states_metadata in missing_states_metadata:
+                    # We cannot add the assigned ids to the states_meta_manager
+                    # cache until the commit is complete as the transaction
+                    # could still be rolled back
+                    entity_id_to_metadata_id[
+                        cast(str, db_states_metadata.entity_id)
+                    ] = db_states_metadata.metadata_id
+
+            session.execute(
+                update(States),
+                [
+                    {
+                        "state_id": state_id,
+                        # We cannot set "entity_id": None yet since
+                        # the history queries still need to work while the
+                        # migration is in progress and we will do this in
+                        # post_migrate_entity_ids
+                        "metadata_id": entity_id_to_metadata_id[entity_id],
+                    }
+                    for state_id, entity_id in states
+                ],
+            )
+
+        # If there is more work to do return False
+        # so that we can be called again
+        is_done = not states
+
+    _LOGGER.debug("Migrating entity_ids done=%s", is_done)
+    return is_done
+
+
+def post_migrate_entity_ids(instance: Recorder) -> bool:
+    """Remove old entity_id strings from states.
+
+    We cannot do this in migrate_entity_ids since the history queries
+    still need to work while the migration is in progress.
+    """
+    session_maker = instance.get_session
+    _LOGGER.debug("Cleanup legacy entity_ids")
+    with session_scope(session=session_maker()) as session:
+        cursor_result = session.connection().execute(batch_cleanup_entity_ids())
+        is_done = not cursor_result or cursor_result.rowcount == 0
+
+    if is_done:
+        # Drop the old index which is no longer needed
+        _drop_index(
+            session_maker,
+            TABLE_STATES,
+            LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX,
+            quiet=True,
+        )
+
+    _LOGGER.debug("Cleanup legacy entity_ids done=%s", is_done)
+    return is_done
+
+
 def _initialize_database(session: Session) -> bool:
     """Initialize a new database.
 
@@ -1,7 +1,7 @@
 """Purge old data helper."""
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Collection, Iterable
 from datetime import datetime
 from itertools import zip_longest
 import logging
@@ -9,13 +9,14 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.elements import ColumnElement
 from sqlalchemy.sql.expression import distinct
 
 from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.util.dt as dt_util
 
 from .const import SQLITE_MAX_BIND_VARS
-from .db_schema import Events, StateAttributes, States
+from .db_schema import Events, EventTypes, StateAttributes, States, StatesMeta
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
@@ -24,12 +25,16 @@ from .queries import (
     data_ids_exist_in_events_with_fast_in_distinct,
     delete_event_data_rows,
     delete_event_rows,
+    delete_event_types_rows,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
+    delete_states_meta_rows,
     delete_states_rows,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    find_entity_ids_to_purge,
+    find_event_types_to_purge,
     find_events_to_purge,
     find_latest_statistics_runs_run_id,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
@@ -110,6 +115,10 @@ def purge_old_data(
             return False
 
         _purge_old_recorder_runs(instance, session, purge_before)
+        if instance.states_meta_manager.active:
+            _purge_old_entity_ids(instance, session)
+        if instance.event_type_manager.active:
+            _purge_old_event_types(instance, session)
     if repack:
         repack_database(instance)
     return True
@@ -468,43 +477,6 @@ def _evict_purged_states_from_old_states_cache(
         old_states.pop(old_state_reversed[purged_state_id], None)
 
 
-def _evict_purged_data_from_data_cache(
-    instance: Recorder, purged_data_ids: set[int]
-) -> None:
-    """Evict purged data ids from the data ids cache."""
-    # Make a map from data_id to the data json
-    event_data_ids = instance._event_data_ids  # pylint: disable=protected-access
-    event_data_ids_reversed = {
-        data_id: data for data, data_id in event_data_ids.items()
-    }
-
-    # Evict any purged data from the event_data_ids cache
-    for purged_attribute_id in purged_data_ids.intersection(event_data_ids_reversed):
-        event_data_ids.pop(event_data_ids_reversed[purged_attribute_id], None)
-
-
-def _evict_purged_attributes_from_attributes_cache(
-    instance: Recorder, purged_attributes_ids: set[int]
-) -> None:
-    """Evict purged attribute ids from the attribute ids cache."""
-    # Make a map from attributes_id to the attributes json
-    state_attributes_ids = (
-        instance._state_attributes_ids  # pylint: disable=protected-access
-    )
-    state_attributes_ids_reversed = {
-        attributes_id: attributes
-        for attributes, attributes_id in state_attributes_ids.items()
-    }
-
-    # Evict any purged attributes from the state_attributes_ids cache
-    for purged_attribute_id in purged_attributes_ids.intersection(
-        state_attributes_ids_reversed
-    ):
-        state_attributes_ids.pop(
-            state_attributes_ids_reversed[purged_attribute_id], None
-        )
-
-
 def _purge_batch_attributes_ids(
     instance: Recorder, session: Session, attributes_ids: set[int]
 ) -> None:
@@ -515,8 +487,8 @@ def _purge_batch_attributes_ids(
         )
         _LOGGER.debug("Deleted %s attribute states", deleted_rows)
 
-    # Evict any entries in the state_attributes_ids cache referring to a purged state
-    _evict_purged_attributes_from_attributes_cache(instance, attributes_ids)
+    # Evict any entries in the state attributes cache referring to a purged state
+    instance.state_attributes_manager.evict_purged(attributes_ids)
 
 
 def _purge_batch_data_ids(
@@ -527,8 +499,8 @@ def _purge_batch_data_ids(
         deleted_rows = session.execute(delete_event_data_rows(data_ids_chunk))
         _LOGGER.debug("Deleted %s data events", deleted_rows)
 
-    # Evict any entries in the event_data_ids cache referring to a purged state
-    _evict_purged_data_from_data_cache(instance, data_ids)
+    # Evict any entries in the event data cache referring to a purged state
+    instance.event_data_manager.evict_purged(data_ids)
 
 
 def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None:
@@ -564,6 +536,51 @@ def _purge_old_recorder_runs(
     _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
 
+def _purge_old_entity_ids(instance: Recorder, session: Session) -> None:
+    """Remove entity_ids from states_meta that are no longer used by any state."""
+    purge_entity_ids: list[str] = []
+    purge_metadata_ids: list[int] = []
+    for metadata_id, entity_id in session.execute(find_entity_ids_to_purge()):
+        purge_metadata_ids.append(metadata_id)
+        purge_entity_ids.append(entity_id)
+    if not purge_metadata_ids:
+        return
+    for metadata_ids_chunk in chunked(purge_metadata_ids, SQLITE_MAX_BIND_VARS):
+        deleted_rows = session.execute(delete_states_meta_rows(metadata_ids_chunk))
+        _LOGGER.debug("Deleted %s states_meta", deleted_rows)
+    # Evict any entries in the states_meta cache referring to a purged entity_id
+    instance.states_meta_manager.evict_purged(purge_entity_ids)
+
+
+def _purge_old_event_types(instance: Recorder, session: Session) -> None:
+    """Remove event_types from event_types that are no longer used by any event."""
+    purge_event_types: list[str] = []
+    purge_event_type_ids: list[int] = []
+    for event_type_id, event_type in session.execute(find_event_types_to_purge()):
+        purge_event_type_ids.append(event_type_id)
+        purge_event_types.append(event_type)
+    if not purge_event_type_ids:
+        return
+    for event_type_ids_chunk in chunked(purge_event_type_ids, SQLITE_MAX_BIND_VARS):
+        deleted_rows = session.execute(delete_event_types_rows(event_type_ids_chunk))
+        _LOGGER.debug("Deleted %s event_types", deleted_rows)
+    # Evict any entries in the event_type cache referring to a purged event_type
+    instance.event_type_manager.evict_purged(purge_event_types)
+
+
+def _select_filtered_metadata_ids(
+    session: Session, entity_filter: Callable[[str], bool]
+) -> list[int]:
+    """Select the metadata_ids of the entity_ids matching the filter."""
+    return [
+        metadata_id
+        for (metadata_id, entity_id) in session.query(
+            StatesMeta.metadata_id, StatesMeta.entity_id
+        ).all()
+        if entity_filter(entity_id)
+    ]
+
+
 def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     """Remove filtered states and events that shouldn't be in the database."""
     _LOGGER.debug("Cleanup filtered data")
@@ -571,23 +588,58 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     assert database_engine is not None
 
     # Check if excluded entity_ids are in database
-    excluded_entity_ids: list[str] = [
+    entity_filter = instance.entity_filter
+    if instance.states_meta_manager.active:
+        excluded_metadata_ids = _select_filtered_metadata_ids(
+            session, lambda entity_id: not entity_filter(entity_id)
+        )
+        if excluded_metadata_ids and not _purge_filtered_states(
+            instance,
+            session,
+            States.metadata_id.in_(excluded_metadata_ids),
+            database_engine,
+        ):
+            return False
+    elif excluded_entity_ids := [
         entity_id
         for (entity_id,) in session.query(distinct(States.entity_id)).all()
-        if not instance.entity_filter(entity_id)
-    ]
-    if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(instance, session, excluded_entity_ids, database_engine)
+        if not entity_filter(entity_id)
+    ]:
+        _purge_filtered_states(
+            instance,
+            session,
+            States.entity_id.in_(excluded_entity_ids),
+            database_engine,
+        )
         return False
 
     # Check if excluded event_types are in database
-    excluded_event_types: list[str] = [
+    if instance.event_type_manager.active:
+        excluded_event_type_to_id = {
+            event_type: event_type_id
+            for (event_type_id, event_type) in session.query(
+                EventTypes.event_type_id, EventTypes.event_type
+            ).all()
+            if event_type in instance.exclude_t
+        }
+        if excluded_event_type_to_id and not _purge_filtered_events(
+            instance,
+            session,
+            Events.event_type_id.in_(excluded_event_type_to_id.values()),
+            excluded_event_type_to_id,
+        ):
+            return False
+    elif excluded_event_types := [
         event_type
         for (event_type,) in session.query(distinct(Events.event_type)).all()
         if event_type in instance.exclude_t
-    ]
-    if len(excluded_event_types) > 0:
-        _purge_filtered_events(instance, session, excluded_event_types)
+    ]:
+        _purge_filtered_events(
+            instance,
+            session,
+            Events.event_type.in_(excluded_event_types),
+            excluded_event_types,
+        )
         return False
 
     return True
@@ -596,21 +648,26 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
 def _purge_filtered_states(
     instance: Recorder,
     session: Session,
-    excluded_entity_ids: list[str],
+    states_filter: ColumnElement[bool],
     database_engine: DatabaseEngine,
-) -> None:
-    """Remove filtered states and linked events."""
+) -> bool:
+    """Remove filtered states and linked events.
+
+    Return true if all states matching the filter have been purged.
+    """
     state_ids: tuple[int, ...]
     attributes_ids: tuple[int, ...]
     event_ids: tuple[int, ...]
-    state_ids, attributes_ids, event_ids = zip(
-        *(
-            session.query(States.state_id, States.attributes_id, States.event_id)
-            .filter(States.entity_id.in_(excluded_entity_ids))
-            .limit(SQLITE_MAX_BIND_VARS)
-            .all()
+    if not (
+        to_purge := session.query(
+            States.state_id, States.attributes_id, States.event_id
         )
-    )
+        .filter(states_filter)
+        .limit(SQLITE_MAX_BIND_VARS)
+        .all()
+    ):
+        return True
+    state_ids, attributes_ids, event_ids = zip(*to_purge)
     filtered_event_ids = [id_ for id_ in event_ids if id_ is not None]
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
@@ -621,22 +678,29 @@ def _purge_filtered_states(
         session, {id_ for id_ in attributes_ids if id_ is not None}, database_engine
     )
     _purge_batch_attributes_ids(instance, session, unused_attribute_ids_set)
+    return False
 
 
 def _purge_filtered_events(
-    instance: Recorder, session: Session, excluded_event_types: list[str]
-) -> None:
-    """Remove filtered events and linked states."""
+    instance: Recorder,
+    session: Session,
+    events_filter: ColumnElement[bool],
+    excluded_event_types: Collection[str],
+) -> bool:
+    """Remove filtered events and linked states.
+
+    Return true if all events matching the filter have been purged.
+    """
     database_engine = instance.database_engine
     assert database_engine is not None
-    event_ids, data_ids = zip(
-        *(
-            session.query(Events.event_id, Events.data_id)
-            .filter(Events.event_type.in_(excluded_event_types))
-            .limit(SQLITE_MAX_BIND_VARS)
-            .all()
-        )
-    )
+    if not (
+        to_purge := session.query(Events.event_id, Events.data_id)
+        .filter(events_filter)
+        .limit(SQLITE_MAX_BIND_VARS)
+        .all()
+    ):
+        return True
+    event_ids, data_ids = zip(*to_purge)
     _LOGGER.debug(
         "Selected %s event_ids to remove that should be filtered", len(event_ids)
     )
@@ -652,7 +716,8 @@ def _purge_filtered_events(
         _purge_batch_data_ids(instance, session, unused_data_ids_set)
     if EVENT_STATE_CHANGED in excluded_event_types:
         session.query(StateAttributes).delete(synchronize_session=False)
-        instance._state_attributes_ids = {}  # pylint: disable=protected-access
+        instance.state_attributes_manager.reset()
+    return False
 
 
 @retryable_database_job("purge")
@@ -661,6 +726,26 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
     database_engine = instance.database_engine
     assert database_engine is not None
     with session_scope(session=instance.get_session()) as session:
+        if instance.states_meta_manager.active:
+            selected_metadata_ids = _select_filtered_metadata_ids(
+                session, entity_filter
+            )
+            _LOGGER.debug("Purging entity data for %s", selected_metadata_ids)
+            if not selected_metadata_ids:
+                return True
+            # Purge a max of SQLITE_MAX_BIND_VARS, based on the oldest states
+            # or events record.
+            if not _purge_filtered_states(
+                instance,
+                session,
+                States.metadata_id.in_(selected_metadata_ids),
+                database_engine,
+            ):
+                _LOGGER.debug("Purging entity data hasn't fully completed yet")
+                return False
+            _purge_old_entity_ids(instance, session)
+            return True
+
         selected_entity_ids: list[str] = [
             entity_id
             for (entity_id,) in session.query(distinct(States.entity_id)).all()
@@ -671,7 +756,10 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
             # Purge a max of SQLITE_MAX_BIND_VARS, based on the oldest states
             # or events record.
             _purge_filtered_states(
-                instance, session, selected_entity_ids, database_engine
+                instance,
+                session,
+                States.entity_id.in_(selected_entity_ids),
+                database_engine,
             )
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
@@ -12,9 +12,11 @@ from .const import SQLITE_MAX_BIND_VARS
 from .db_schema import (
     EventData,
     Events,
+    EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -58,6 +60,40 @@ def find_shared_data_id(attr_hash: int, shared_data: str) -> StatementLambdaElem
     )
 
 
+def get_shared_attributes_by_ids(
+    attributes_ids: list[int],
+) -> StatementLambdaElement:
+    """Load shared attributes from the database by attributes_id."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).where(StateAttributes.attributes_id.in_(attributes_ids))
+    )
+
+
+def get_shared_event_datas_by_ids(data_ids: list[int]) -> StatementLambdaElement:
+    """Load shared event data from the database by data_id."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.shared_data).where(
+            EventData.data_id.in_(data_ids)
+        )
+    )
+
+
+def find_max_attributes_id() -> StatementLambdaElement:
+    """Find the max attributes_id."""
+    # https://github.com/sqlalchemy/sqlalchemy/issues/9189
+    # pylint: disable-next=not-callable
+    return lambda_stmt(lambda: select(func.max(StateAttributes.attributes_id)))
+
+
+def find_max_data_id() -> StatementLambdaElement:
+    """Find the max data_id."""
+    # https://github.com/sqlalchemy/sqlalchemy/issues/9189
+    # pylint: disable-next=not-callable
+    return lambda_stmt(lambda: select(func.max(EventData.data_id)))
+
+
 def _state_attrs_exist(attr: int | None) -> Select:
     """Check if a state attributes id exists in the states table."""
     # https://github.com/sqlalchemy/sqlalchemy/issues/9189
@@ -695,3 +731,138 @@ def find_states_context_ids_to_migrate() -> StatementLambdaElement:
         .filter(States.context_id_bin.is_(None))
         .limit(SQLITE_MAX_BIND_VARS)
     )
+
+
+def find_entity_ids_to_migrate() -> StatementLambdaElement:
+    """Find entity_id to migrate."""
+    return lambda_stmt(
+        lambda: select(
+            States.state_id,
+            States.entity_id,
+        )
+        .filter(States.metadata_id.is_(None))
+        .limit(SQLITE_MAX_BIND_VARS)
+    )
+
+
+def has_entity_ids_to_migrate() -> StatementLambdaElement:
+    """Check if there are states without a metadata_id."""
+    return lambda_stmt(
+        lambda: select(States.state_id).filter(States.metadata_id.is_(None)).limit(1)
+    )
+
+
+def batch_cleanup_entity_ids() -> StatementLambdaElement:
+    """Find entity_id to cleanup."""
+    # Select from a derived table because MariaDB doesn't yet support
+    # 'LIMIT & IN/ALL/ANY/SOME subquery' and MySQL does not allow
+    # selecting from the table being updated in a subquery.
+    return lambda_stmt(
+        lambda: update(States)
+        .where(
+            States.state_id.in_(
+                select(
+                    select(States.state_id)
+                    .filter(States.entity_id.is_not(None))
+                    .limit(5000)
+                    .subquery()
+                    .c.state_id
+                )
+            )
+        )
+        .values(entity_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_states_metadata_ids(entity_ids: Iterable[str]) -> StatementLambdaElement:
+    """Find metadata_ids by entity_ids."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id).filter(
+            StatesMeta.entity_id.in_(entity_ids)
+        )
+    )
+
+
+def find_all_states_metadata_ids() -> StatementLambdaElement:
+    """Find all metadata_ids and entity_ids."""
+    return lambda_stmt(lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id))
+
+
+def find_entity_ids_to_purge() -> StatementLambdaElement:
+    """Find metadata_ids and entity_ids that are no longer used by any state."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id).where(
+            ~select(States.state_id)
+            .where(States.metadata_id == StatesMeta.metadata_id)
+            .exists()
+        )
+    )
+
+
+def delete_states_meta_rows(metadata_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete states_meta rows."""
+    return lambda_stmt(
+        lambda: delete(StatesMeta)
+        .where(StatesMeta.metadata_id.in_(metadata_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_event_type_ids(event_types: Iterable[str]) -> StatementLambdaElement:
+    """Find event_type_ids by event_types."""
+    return lambda_stmt(
+        lambda: select(EventTypes.event_type_id, EventTypes.event_type).filter(
+            EventTypes.event_type.in_(event_types)
+        )
+    )
+
+
+def find_event_types_to_migrate() -> StatementLambdaElement:
+    """Find events with an event_type to migrate."""
+    return lambda_stmt(
+        lambda: select(
+            Events.event_id,
+            Events.event_type,
+        )
+        .filter(Events.event_type_id.is_(None))
+        .limit(SQLITE_MAX_BIND_VARS)
+    )
+
+
+def has_event_types_to_migrate() -> StatementLambdaElement:
+    """Check if there are events without an event_type_id."""
+    return lambda_stmt(
+        lambda: select(Events.event_id).filter(Events.event_type_id.is_(None)).limit(1)
+    )
+
+
+def find_event_types_to_purge() -> StatementLambdaElement:
+    """Find event_type_ids and event_types that are no longer used by any event."""
+    return lambda_stmt(
+        lambda: select(EventTypes.event_type_id, EventTypes.event_type).where(
+            ~select(Events.event_id)
+            .where(Events.event_type_id == EventTypes.event_type_id)
+            .exists()
+        )
+    )
+
+
+def delete_event_types_rows(event_type_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete event_types rows."""
+    return lambda_stmt(
+        lambda: delete(EventTypes)
+        .where(EventTypes.event_type_id.in_(event_type_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def select_event_type_ids(event_types: tuple[str, ...]) -> Select:
+    """Generate a select for event type ids.
+
+    This query is intentionally not a lambda statement as it is used inside
+    other lambda statements.
+    """
+    return select(EventTypes.event_type_id).where(
+        EventTypes.event_type.in_(event_types)
+    )
@@ -54,6 +54,17 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_cache_info(instance: Recorder) -> dict[str, Any]:
+    """Get the hit rates of the id caches."""
+    cache_info: dict[str, Any] = {}
+    if (hit_rate := instance.state_attributes_manager.cache_hit_rate) is not None:
+        cache_info["state_attributes_cache_hit_rate"] = f"{hit_rate:.1%}"
+    if (hit_rate := instance.event_data_manager.cache_hit_rate) is not None:
+        cache_info["event_data_cache_hit_rate"] = f"{hit_rate:.1%}"
+    return cache_info
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -61,6 +72,7 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     run_history = instance.run_history
     database_name = urlparse(instance.db_url).path.lstrip("/")
     db_engine_info = _async_get_db_engine_info(instance)
+    cache_info = _async_get_cache_info(instance)
     db_stats: dict[str, Any] = {}
 
     if instance.async_db_ready.done():
@@ -71,4 +83,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": run_history.first.start,
             "current_recorder_run": run_history.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | cache_info
@@ -1 +1,227 @@
 """Managers for each table."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from lru import LRU  # pylint: disable=no-name-in-module
+from sqlalchemy.orm.session import Session
+
+from ..const import SQLITE_MAX_BIND_VARS
+from ..util import chunked
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+_DataT = TypeVar("_DataT")
+
+
+class BaseLRUTableManager(Generic[_DataT]):
+    """Base class for managing the shared data tables.
+
+    Maps the shared data of a row to its id with an LRU
+    cache that grows when it is too small for the working set.
+    """
+
+    def __init__(self, recorder: Recorder, lru_size: int, max_lru_size: int) -> None:
+        """Initialize the LRU table manager."""
+        self._id_map: dict[str, int] = LRU(lru_size)
+        self._pending: dict[str, _DataT] = {}
+        self._max_lru_size = max_lru_size
+        # Lookups of ids that were evicted from the cache, or
+        # never loaded, since the last time the size was adjusted
+        self._found_in_db = 0
+        self.recorder = recorder
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Return the fraction of lookups that were answered from the cache."""
+        if not (lookups := self.cache_hits + self.cache_misses):
+            return None
+        return self.cache_hits / lookups
+
+    def get_from_cache(self, shared_data: str) -> int | None:
+        """Resolve shared data to the id from the cache.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (data_id := self._id_map.get(shared_data)) is not None:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+        return data_id
+
+    def get_from_db(
+        self, data_hash: int, shared_data: str, session: Session
+    ) -> int | None:
+        """Resolve shared data to the id from the database and cache it.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        with session.no_autoflush:
+            if (
+                data_id := self._find_id_in_db(data_hash, shared_data, session)
+            ) is None:
+                return None
+        self._found_in_db += 1
+        self._id_map[shared_data] = data_id
+        return data_id
+
+    def load_from_hashes(self, hashes: Iterable[int], session: Session) -> None:
+        """Load the ids of the shared data matching the hashes into the cache.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        with session.no_autoflush:
+            for hash_chunk in chunked(hashes, SQLITE_MAX_BIND_VARS):
+                for data_id, shared_data in self._find_by_hashes(hash_chunk, session):
+                    self._id_map[shared_data] = data_id
+
+    def get_pending(self, shared_data: str) -> _DataT | None:
+        """Get pending data that have not be assigned ids yet.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        return self._pending.get(shared_data)
+
+    def add_pending(self, shared_data: str, db_data: _DataT) -> None:
+        """Add pending data that will be committed at the next interval.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending[shared_data] = db_data
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to load the ids of the new rows into the LRU.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        for shared_data, db_data in self._pending.items():
+            self._id_map[shared_data] = self._id_from_row(db_data)
+        self._pending.clear()
+
+    def reset(self) -> None:
+        """Reset the manager after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._id_map.clear()
+        self._pending.clear()
+
+    def evict_purged(self, data_ids: set[int]) -> None:
+        """Evict purged ids from the cache when they are no longer used.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        id_map = self._id_map
+        shared_data_by_id = {
+            data_id: shared_data for shared_data, data_id in id_map.items()
+        }
+        for purged_id in data_ids.intersection(shared_data_by_id):
+            id_map.pop(shared_data_by_id[purged_id], None)
+
+    def adjust_lru_size(self, min_size: int) -> None:
+        """Adjust the LRU cache size.
+
+        The cache grows to at least min_size. When the cache is full
+        and ids still had to be looked up in the database since the
+        last adjustment, the working set does not fit and the cache
+        doubles in size up to the maximum size.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        lru: LRU = self._id_map
+        current_size = lru.get_size()
+        new_size = max(current_size, min_size)
+        if self._found_in_db and len(lru) >= current_size:
+            new_size = max(new_size, min(current_size * 2, self._max_lru_size))
+        self._found_in_db = 0
+        if new_size > current_size:
+            lru.set_size(new_size)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a snapshot of the cached ids to warm the cache at the next start.
+
+        Only the ids are saved, from least to most recently used, since
+        the shared data is loaded back from the database by id.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        lru: LRU = self._id_map
+        data_ids = list(reversed(lru.values()))
+        return {
+            "size": lru.get_size(),
+            "max_id": max(data_ids, default=0),
+            "ids": data_ids,
+        }
+
+    def restore_snapshot(self, snapshot: dict[str, Any], session: Session) -> None:
+        """Warm the cache from a snapshot taken at the last shutdown.
+
+        The snapshot is ignored if it references ids beyond the current
+        max id since the database has been replaced or restored.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not (data_ids := snapshot["ids"]):
+            return
+        with session.no_autoflush:
+            max_id = self._find_max_id(session)
+            if max_id is None or snapshot["max_id"] > max_id:
+                _LOGGER.debug(
+                    "Ignoring %s cache snapshot with max id %s, database max id is %s",
+                    type(self).__name__,
+                    snapshot["max_id"],
+                    max_id,
+                )
+                return
+            self.adjust_lru_size(min(snapshot["size"], self._max_lru_size))
+            shared_data_by_id: dict[int, str] = {}
+            for ids_chunk in chunked(data_ids, SQLITE_MAX_BIND_VARS):
+                shared_data_by_id.update(self._find_by_ids(ids_chunk, session))
+        id_map = self._id_map
+        for data_id in data_ids:
+            if (shared_data := shared_data_by_id.get(data_id)) is not None:
+                id_map[shared_data] = data_id
+
+    def _find_id_in_db(
+        self, data_hash: int, shared_data: str, session: Session
+    ) -> int | None:
+        """Find the id of the shared data in the database."""
+        raise NotImplementedError
+
+    def _find_by_hashes(
+        self, hashes: list[int], session: Session
+    ) -> Iterable[tuple[int, str]]:
+        """Find the ids and shared data matching the hashes in the database."""
+        raise NotImplementedError
+
+    def _find_by_ids(
+        self, data_ids: list[int], session: Session
+    ) -> Iterable[tuple[int, str]]:
+        """Find the ids and shared data of the ids in the database."""
+        raise NotImplementedError
+
+    def _find_max_id(self, session: Session) -> int | None:
+        """Find the max id in the database."""
+        raise NotImplementedError
+
+    def _id_from_row(self, db_data: _DataT) -> int:
+        """Return the id of a committed row."""
+        raise NotImplementedError
@@ -0,0 +1,73 @@
+"""Support managing EventData."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, cast
+
+from sqlalchemy.orm.session import Session
+
+from . import BaseLRUTableManager
+from ..db_schema import EventData
+from ..queries import (
+    find_max_data_id,
+    find_shared_data_id,
+    get_shared_event_datas,
+    get_shared_event_datas_by_ids,
+)
+from ..util import execute_stmt_lambda_element
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+CACHE_SIZE = 2048
+MAX_CACHE_SIZE = 16384
+
+
+class EventDataManager(BaseLRUTableManager[EventData]):
+    """Manage the EventData table.
+
+    Maps the shared_data of an event to the data_id
+    used to link rows in the events table.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the event data manager."""
+        super().__init__(recorder, CACHE_SIZE, MAX_CACHE_SIZE)
+
+    def _find_id_in_db(
+        self, data_hash: int, shared_data: str, session: Session
+    ) -> int | None:
+        """Find the data_id of the shared_data in the database."""
+        if data_id := session.execute(
+            find_shared_data_id(data_hash, shared_data)
+        ).first():
+            return cast(int, data_id[0])
+        return None
+
+    def _find_by_hashes(
+        self, hashes: list[int], session: Session
+    ) -> Iterable[tuple[int, str]]:
+        """Find the data_ids and shared_data matching the hashes."""
+        return cast(
+            Iterable[tuple[int, str]],
+            session.execute(get_shared_event_datas(hashes)).fetchall(),
+        )
+
+    def _find_by_ids(
+        self, data_ids: list[int], session: Session
+    ) -> Iterable[tuple[int, str]]:
+        """Find the data_ids and shared_data of the data_ids."""
+        return cast(
+            Iterable[tuple[int, str]],
+            execute_stmt_lambda_element(
+                session, get_shared_event_datas_by_ids(data_ids)
+            ),
+        )
+
+    def _find_max_id(self, session: Session) -> int | None:
+        """Find the max data_id."""
+        return cast(int | None, session.execute(find_max_data_id()).scalar())
+
+    def _id_from_row(self, db_data: EventData) -> int:
+        """Return the data_id of a committed EventData."""
+        return db_data.data_id
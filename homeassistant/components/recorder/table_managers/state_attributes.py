@@ -0,0 +1,81 @@
+"""Support managing StateAttributes."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, cast
+
+from sqlalchemy.orm.session import Session
+
+from . import BaseLRUTableManager
+from ..db_schema import StateAttributes
+from ..queries import (
+    find_max_attributes_id,
+    find_shared_attributes_id,
+    get_shared_attributes,
+    get_shared_attributes_by_ids,
+)
+from ..util import execute_stmt_lambda_element
+
+if TYPE_CHECKING:
+    from ..core import Recorder
+
+# The number of attribute ids to cache in memory
+#
+# Based on:
+# - The number of overlapping attributes
+# - How frequently states with overlapping attributes will change
+# - How much memory our low end hardware has
+CACHE_SIZE = 2048
+# The cache will not grow past this size unless there
+# are more than half as many entities
+MAX_CACHE_SIZE = 16384
+
+
+class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
+    """Manage the StateAttributes table.
+
+    Maps the shared_attrs of a state to the attributes_id
+    used to link rows in the states table.
+    """
+
+    def __init__(self, recorder: Recorder) -> None:
+        """Initialize the state attributes manager."""
+        super().__init__(recorder, CACHE_SIZE, MAX_CACHE_SIZE)
+
+    def _find_id_in_db(
+        self, data_hash: int, shared_data: str, session: Session
+    ) -> int | None:
+        """Find the attributes_id of the shared_attrs in the database."""
+        if attributes_id := session.execute(
+            find_shared_attributes_id(data_hash, shared_data)
+        ).first():
+            return cast(int, attributes_id[0])
+        return None
+
+    def _find_by_hashes(
+        self, hashes: list[int], session: Session
+    ) -> Iterable[tuple[int, str]]:
+        """Find the attributes_ids and shared_attrs matching the hashes."""
+        return cast(
+            Iterable[tuple[int, str]],
+            session.execute(get_shared_attributes(hashes)).fetchall(),
+        )
+
+    def _find_by_ids(
+        self, data_ids: list[int], session: Session
+    ) -> Iterable[tuple[int, str]]:
+        """Find the attributes_ids and shared_attrs of the attributes_ids."""
+        return cast(
+            Iterable[tuple[int, str]],
+            execute_stmt_lambda_element(
+                session, get_shared_attributes_by_ids(data_ids)
+            ),
+        )
+
+    def _find_max_id(self, session: Session) -> int | None:
+        """Find the max attributes_id."""
+        return cast(int | None, session.execute(find_max_attributes_id()).scalar())
+
+    def _id_from_row(self, db_data: StateAttributes) -> int:
+        """Return the attributes_id of a committed StateAttributes."""
+        return db_data.attributes_id
@@ -356,3 +356,59 @@ class ContextIDMigrationTask(RecorderTask):
         if not instance._migrate_context_ids():  # pylint: disable=[protected-access]
             # Schedule a new migration task if this one didn't finish
             instance.queue_task(ContextIDMigrationTask())
+
+
+@dataclass
+class EntityIDMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to migrate entity_ids to StatesMeta."""
+
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Run entity_id migration task."""
+        if not instance._migrate_entity_ids():  # pylint: disable=[protected-access]
+            # Schedule a new migration task if this one didn't finish
+            instance.queue_task(EntityIDMigrationTask())
+        else:
+            # The migration has finished, now we start the post migration
+            # to remove the old entity_id data from the states table
+            # at this point we can also start using the StatesMeta table
+            # so we set active to True
+            instance.states_meta_manager.active = True
+            instance.queue_task(EntityIDPostMigrationTask())
+
+
+@dataclass
+class EntityIDPostMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to cleanup after entity_ids migration.
+
+    Removes the now unused entity_id values from the states table.
+    """
+
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Run entity_id post migration task."""
+        if (
+            not instance._post_migrate_entity_ids()  # pylint: disable=[protected-access]
+        ):
+            # Schedule a new migration task if this one didn't finish
+            instance.queue_task(EntityIDPostMigrationTask())
+
+
+@dataclass
+class EventTypeIDMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to migrate event type ids."""
+
+    # commit_before is the default so there are no pending
+    # event_types that are about to be added to the database
+
+    def run(self, instance: Recorder) -> None:
+        """Run event type id migration task."""
+        if not instance._migrate_event_type_ids():  # pylint: disable=[protected-access]
+            # Schedule a new migration task if this one didn't finish
+            instance.queue_task(EventTypeIDMigrationTask())
+        else:
+            # The migration has finished, now we can use the
+            # event_types table for queries
+            instance.event_type_manager.active = True
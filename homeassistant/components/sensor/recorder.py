@@ -25,14 +25,16 @@ from homeassistant.components.recorder.models import (
 )
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_STATE_CHANGED,
     REVOLUTIONS_PER_MINUTE,
     UnitOfIrradiance,
     UnitOfSoundPressure,
     UnitOfVolume,
 )
-from homeassistant.core import HomeAssistant, State, callback, split_entity_id
+from homeassistant.core import Event, HomeAssistant, State, callback, split_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import entity_sources
+from homeassistant.helpers.event import async_track_utc_time_change
 from homeassistant.util import dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 
@@ -70,20 +72,312 @@ WARN_UNSUPPORTED_UNIT = "sensor_warn_unsupported_unit"
 WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
+# The running values of the sensors for which statistics are compiled
+STATES_ACCUMULATOR = "sensor_statistics_states_accumulator"
+# The length of a short term statistics period
+SHORT_TERM_PERIOD = datetime.timedelta(minutes=5)
+# How many ended periods are kept for the statistics compiler
+MAX_ENDED_PERIODS = 12
+
+
+def _is_statistics_sensor(hass: HomeAssistant, state: State) -> bool:
+    """Return True if statistics are compiled for the sensor."""
+    return bool(
+        get_instance(hass).entity_filter(state.entity_id)
+        and try_parse_enum(SensorStateClass, state.attributes.get(ATTR_STATE_CLASS))
+    )
 
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     """Get the current state of all sensors for which to compile statistics."""
-    all_sensors = hass.states.all(DOMAIN)
-    instance = get_instance(hass)
     return [
-        state
-        for state in all_sensors
-        if instance.entity_filter(state.entity_id)
-        and try_parse_enum(SensorStateClass, state.attributes.get(ATTR_STATE_CLASS))
+        state for state in hass.states.all(DOMAIN) if _is_statistics_sensor(hass, state)
     ]
 
 
+def _period_start(time: datetime.datetime) -> datetime.datetime:
+    """Return the start of the short term statistics period of a time."""
+    return time.replace(minute=time.minute - time.minute % 5, second=0, microsecond=0)
+
+
+class PeriodMeasurements:
+    """The running values of a measurement sensor during a period.
+
+    The values are what _time_weighted_average, min and max compute from the
+    states of the period, without keeping the states.
+    """
+
+    __slots__ = (
+        "start",
+        "units",
+        "value",
+        "value_since",
+        "mean_since",
+        "accumulated",
+        "min",
+        "max",
+    )
+
+    def __init__(self, start: datetime.datetime) -> None:
+        """Initialize the running values of a period."""
+        self.start = start
+        self.units: set[str | None] = set()
+        self.value: float | None = None
+        self.value_since = start
+        # The mean is taken since the first valid state
+        self.mean_since = start
+        self.accumulated = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def unit(self) -> str | None:
+        """Return the unit of the states."""
+        return next(iter(self.units))
+
+    def add(self, state: State) -> None:
+        """Add a state to the running values."""
+        try:
+            fstate = _parse_float(state.state)
+        except (ValueError, TypeError):
+            return
+        self.units.add(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT))
+        start_time = max(state.last_updated, self.start)
+        if self.value is None:
+            self.mean_since = start_time
+        else:
+            duration = start_time - self.value_since
+            self.accumulated += self.value * duration.total_seconds()
+        self.value = fstate
+        self.value_since = start_time
+        self.min = min(self.min, fstate)
+        self.max = max(self.max, fstate)
+
+    def mean(self, end: datetime.datetime) -> float:
+        """Return the time weighted average of the period."""
+        assert self.value is not None
+        duration = end - self.value_since
+        accumulated = self.accumulated + self.value * duration.total_seconds()
+        return accumulated / (end - self.mean_since).total_seconds()
+
+
+class PeriodTotals:
+    """The states of a total sensor during a period which matter for the sum.
+
+    A state which continues a run of states which do not decrease and have
+    the same unit and last_reset replaces the previous state of the run. The
+    sum only depends on the first and the last state of such a run.
+    """
+
+    __slots__ = ("states", "_last", "_replace_last")
+
+    def __init__(self) -> None:
+        """Initialize the states of a period."""
+        self.states: list[State] = []
+        self._last: tuple[float, str | None, Any] | None = None
+        self._replace_last = False
+
+    def add(self, state: State) -> None:
+        """Add a state of the period."""
+        try:
+            fstate = _parse_float(state.state)
+        except (ValueError, TypeError):
+            return
+        last = (
+            fstate,
+            state.attributes.get(ATTR_UNIT_OF_MEASUREMENT),
+            state.attributes.get(ATTR_LAST_RESET),
+        )
+        continues_run = (
+            self._last is not None
+            and 0 <= self._last[0] <= fstate
+            and self._last[1:] == last[1:]
+        )
+        if continues_run and self._replace_last:
+            self.states[-1] = state
+        else:
+            self.states.append(state)
+        self._last = last
+        self._replace_last = continues_run
+
+
+class _PeriodRecord:
+    """The running values of a sensor during a period."""
+
+    __slots__ = ("start_state", "values", "complete")
+
+    def __init__(
+        self,
+        start: datetime.datetime,
+        start_state: State | None,
+        state_class: SensorStateClass,
+    ) -> None:
+        """Initialize the record with the state at the start of the period."""
+        self.start_state = start_state
+        self.values: PeriodMeasurements | PeriodTotals = (
+            PeriodMeasurements(start)
+            if state_class == SensorStateClass.MEASUREMENT
+            else PeriodTotals()
+        )
+        # The state at the start is not known if it changed during the period
+        self.complete = start_state is None or start_state.last_updated < start
+        if start_state is not None:
+            self.values.add(start_state)
+
+    def add(self, state: State, state_class: SensorStateClass) -> None:
+        """Add a state of the period."""
+        if isinstance(self.values, PeriodMeasurements) != (
+            state_class == SensorStateClass.MEASUREMENT
+        ):
+            self.complete = False
+        self.values.add(state)
+
+
+# The states of a sensor during a period or its running values
+PeriodHistory = list[State] | PeriodMeasurements | PeriodTotals
+
+
+class StatesAccumulator:
+    """Keep the running values of the sensors for which statistics are compiled.
+
+    The values of each short term statistics period are updated as the states
+    change. When a period ends, the values are handed over to the statistics
+    compiler, so the history of the period does not need to be queried from
+    the database. Only the states since the accumulator was started are
+    known, periods which started before that, for example right after a
+    restart, must still be compiled from the database.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the accumulator and start collecting states."""
+        self.hass = hass
+        # The last state of each sensor, which is the state at the start of
+        # the next period it changes in
+        self._last_states: dict[str, State] = {}
+        self._periods: dict[datetime.datetime, dict[str, _PeriodRecord]] = {}
+        # The ended periods are popped by the statistics compiler, which runs
+        # in the recorder thread
+        self._ended_periods: dict[datetime.datetime, dict[str, PeriodHistory]] = {}
+        self._ended_before = _period_start(dt_util.utcnow())
+        # The history of periods starting at or after this time is complete
+        self.complete_since = dt_util.utcnow()
+        for state in hass.states.async_all(DOMAIN):
+            if _is_statistics_sensor(hass, state):
+                self._last_states[state.entity_id] = state
+                self.complete_since = max(self.complete_since, state.last_updated)
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED, self._async_state_changed, run_immediately=True
+        )
+        async_track_utc_time_change(
+            hass, self._async_end_periods, minute=range(0, 60, 5), second=0
+        )
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Update the running values of the period of the new state."""
+        entity_id: str = event.data["entity_id"]
+        if (new_state := event.data["new_state"]) is None:
+            self._last_states.pop(entity_id, None)
+            return
+        if new_state.domain != DOMAIN:
+            return
+        state_class = try_parse_enum(
+            SensorStateClass, new_state.attributes.get(ATTR_STATE_CLASS)
+        )
+        if (start_state := self._last_states.get(entity_id)) is None:
+            if state_class is None or not _is_statistics_sensor(self.hass, new_state):
+                return
+            start_state = event.data["old_state"]
+        elif state_class is None:
+            del self._last_states[entity_id]
+            return
+        self._last_states[entity_id] = new_state
+
+        period = _period_start(new_state.last_updated)
+        if period < self._ended_before:
+            # The period was already handed over, it is compiled from
+            # the database instead
+            self._ended_periods.pop(period, None)
+            return
+        records = self._periods.setdefault(period, {})
+        if (record := records.get(entity_id)) is None:
+            record = records[entity_id] = _PeriodRecord(
+                period, start_state, state_class
+            )
+        record.add(new_state, state_class)
+
+    @callback
+    def _async_end_periods(self, now: datetime.datetime) -> None:
+        """Hand the periods which ended over to the statistics compiler."""
+        end = _period_start(now)
+        periods = {period for period in self._periods if period < end}
+        periods.add(end - SHORT_TERM_PERIOD)
+        for period in sorted(periods):
+            records = self._periods.pop(period, {})
+            if period >= self.complete_since:
+                self._ended_periods[period] = self._async_period_history(
+                    period, records
+                )
+        self._ended_before = max(self._ended_before, end)
+        # Periods which were not compiled in time are compiled from the database
+        for period in list(self._ended_periods):
+            if period < end - MAX_ENDED_PERIODS * SHORT_TERM_PERIOD:
+                self._ended_periods.pop(period, None)
+
+    @callback
+    def _async_period_history(
+        self, period: datetime.datetime, records: dict[str, _PeriodRecord]
+    ) -> dict[str, PeriodHistory]:
+        """Return the states or running values of the sensors during a period."""
+        history: dict[str, PeriodHistory] = {}
+        for entity_id, record in records.items():
+            if record.complete:
+                history[entity_id] = record.values
+        later_periods = sorted(p for p in self._periods if p > period)
+        for entity_id, last_state in self._last_states.items():
+            if entity_id in records:
+                continue
+            # The state did not change during the period, it was the state
+            # at the start of the next period it changed in
+            state: State | None = last_state
+            for later_period in later_periods:
+                if (record := self._periods[later_period].get(entity_id)) is not None:
+                    state = record.start_state
+                    break
+            if state is not None:
+                history[entity_id] = [state]
+        return history
+
+    def pop_period(self, start: datetime.datetime) -> dict[str, PeriodHistory] | None:
+        """Return the history of a period which ended, if it is known.
+
+        This is called from the recorder thread.
+        """
+        return self._ended_periods.pop(start, None)
+
+
+@callback
+def _async_start_states_accumulator(hass: HomeAssistant) -> None:
+    """Start the states accumulator."""
+    if STATES_ACCUMULATOR not in hass.data:
+        hass.data[STATES_ACCUMULATOR] = StatesAccumulator(hass)
+
+
+def _get_accumulated_history(
+    hass: HomeAssistant, start: datetime.datetime
+) -> dict[str, PeriodHistory]:
+    """Get the history of the period starting at start from the states accumulator.
+
+    The accumulator is started by the first compile. Sensors which are not
+    in the returned history must be queried from the database.
+    """
+    accumulator: StatesAccumulator | None = hass.data.get(STATES_ACCUMULATOR)
+    if accumulator is None:
+        hass.add_job(_async_start_states_accumulator, hass)
+        return {}
+    return accumulator.pop_period(start) or {}
+
+
 def _time_weighted_average(
     fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
 ) -> float:
@@ -145,6 +439,32 @@ def _parse_float(state: str) -> float:
     return fstate
 
 
+def _warn_unsupported_unit(
+    hass: HomeAssistant,
+    entity_id: str,
+    state_unit: str | None,
+    statistics_unit: str | None,
+) -> None:
+    """Warn once that the unit of a sensor cannot be converted."""
+    if WARN_UNSUPPORTED_UNIT not in hass.data:
+        hass.data[WARN_UNSUPPORTED_UNIT] = set()
+    if entity_id not in hass.data[WARN_UNSUPPORTED_UNIT]:
+        hass.data[WARN_UNSUPPORTED_UNIT].add(entity_id)
+        _LOGGER.warning(
+            (
+                "The unit of %s (%s) cannot be converted to the unit of"
+                " previously compiled statistics (%s). Generation of long term"
+                " statistics will be suppressed unless the unit changes back to"
+                " %s or a compatible unit. Go to %s to fix this"
+            ),
+            entity_id,
+            state_unit,
+            statistics_unit,
+            statistics_unit,
+            LINK_DEV_STATISTICS,
+        )
+
+
 def _normalize_states(
     hass: HomeAssistant,
     session: Session,
@@ -215,23 +535,7 @@ def _normalize_states(
         state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
         # Exclude states with unsupported unit from statistics
         if state_unit not in converter.VALID_UNITS:
-            if WARN_UNSUPPORTED_UNIT not in hass.data:
-                hass.data[WARN_UNSUPPORTED_UNIT] = set()
-            if entity_id not in hass.data[WARN_UNSUPPORTED_UNIT]:
-                hass.data[WARN_UNSUPPORTED_UNIT].add(entity_id)
-                _LOGGER.warning(
-                    (
-                        "The unit of %s (%s) cannot be converted to the unit of"
-                        " previously compiled statistics (%s). Generation of long term"
-                        " statistics will be suppressed unless the unit changes back to"
-                        " %s or a compatible unit. Go to %s to fix this"
-                    ),
-                    entity_id,
-                    state_unit,
-                    statistics_unit,
-                    statistics_unit,
-                    LINK_DEV_STATISTICS,
-                )
+            _warn_unsupported_unit(hass, entity_id, state_unit, statistics_unit)
             continue
 
         valid_fstates.append(
@@ -246,6 +550,45 @@ def _normalize_states(
     return statistics_unit, valid_fstates
 
 
+def _normalize_measurements(
+    hass: HomeAssistant,
+    old_metadatas: dict[str, tuple[int, StatisticMetaData]],
+    measurements: PeriodMeasurements,
+    end: datetime.datetime,
+    entity_id: str,
+) -> tuple[str | None, tuple[float, float, float] | None]:
+    """Normalize the unit of the running values of a measurement sensor.
+
+    Returns the statistics unit and the mean, min and max in that unit. The
+    unit conversions are linear, so converting the running values gives the
+    same result as converting the states.
+    """
+    if measurements.value is None:
+        return None, None
+
+    old_metadata = old_metadatas[entity_id][1] if entity_id in old_metadatas else None
+    state_unit = measurements.unit
+    statistics_unit: str | None
+    if not old_metadata:
+        statistics_unit = state_unit
+    else:
+        statistics_unit = old_metadata["unit_of_measurement"]
+
+    values = (measurements.mean(end), measurements.min, measurements.max)
+    if statistics_unit not in statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER:
+        return state_unit, values
+
+    converter = statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER[statistics_unit]
+    if state_unit not in converter.VALID_UNITS:
+        _warn_unsupported_unit(hass, entity_id, state_unit, statistics_unit)
+        return statistics_unit, None
+    mean, min_, max_ = (
+        converter.convert(value, from_unit=state_unit, to_unit=statistics_unit)
+        for value in values
+    )
+    return statistics_unit, (mean, min_, max_)
+
+
 def _suggest_report_issue(hass: HomeAssistant, entity_id: str) -> str:
     """Suggest to report an issue."""
     domain = entity_sources(hass).get(entity_id, {}).get("domain")
@@ -384,6 +727,37 @@ def compile_statistics(
     return compiled
 
 
+def _get_history_from_database(
+    hass: HomeAssistant,
+    session: Session,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    entities_full_history: list[str],
+    entities_significant_history: list[str],
+) -> MutableMapping[str, list[State]]:
+    """Query the history between start and end from the database."""
+    history_list: MutableMapping[str, list[State]] = {}
+    if entities_full_history:
+        history_list = history.get_full_significant_states_with_session(
+            hass,
+            session,
+            start - datetime.timedelta.resolution,
+            end,
+            entity_ids=entities_full_history,
+            significant_changes_only=False,
+        )
+    if entities_significant_history:
+        _history_list = history.get_full_significant_states_with_session(
+            hass,
+            session,
+            start - datetime.timedelta.resolution,
+            end,
+            entity_ids=entities_significant_history,
+        )
+        history_list = {**history_list, **_history_list}
+    return history_list
+
+
 def _compile_statistics(  # noqa: C901
     hass: HomeAssistant,
     session: Session,
@@ -403,40 +777,62 @@ def _compile_statistics(  # noqa: C901
     entities_full_history = [
         i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
     ]
-    history_list: MutableMapping[str, list[State]] = {}
-    if entities_full_history:
-        history_list = history.get_full_significant_states_with_session(
-            hass,
-            session,
-            start - datetime.timedelta.resolution,
-            end,
-            entity_ids=entities_full_history,
-            significant_changes_only=False,
-        )
     entities_significant_history = [
         i.entity_id
         for i in sensor_states
         if "sum" not in wanted_statistics[i.entity_id]
     ]
-    if entities_significant_history:
-        _history_list = history.get_full_significant_states_with_session(
+    history_list: MutableMapping[str, list[State]] = {}
+    period_measurements: dict[str, PeriodMeasurements] = {}
+    for entity_id, period_history in _get_accumulated_history(hass, start).items():
+        if entity_id not in wanted_statistics:
+            continue
+        if isinstance(period_history, list):
+            history_list[entity_id] = period_history
+        elif isinstance(period_history, PeriodTotals):
+            if "sum" in wanted_statistics[entity_id]:
+                history_list[entity_id] = period_history.states
+        elif "sum" not in wanted_statistics[entity_id]:
+            # States with different units are normalized from the database
+            if len(period_history.units) <= 1:
+                period_measurements[entity_id] = period_history
+    accumulated = history_list.keys() | period_measurements.keys()
+    history_list.update(
+        _get_history_from_database(
             hass,
             session,
-            start - datetime.timedelta.resolution,
+            start,
             end,
-            entity_ids=entities_significant_history,
+            [i for i in entities_full_history if i not in accumulated],
+            [i for i in entities_significant_history if i not in accumulated],
         )
-        history_list = {**history_list, **_history_list}
+    )
     # If there are no recent state changes, the sensor's state may already be pruned
     # from the recorder. Get the state from the state machine instead.
     for _state in sensor_states:
         if _state.entity_id not in history_list:
             history_list[_state.entity_id] = [_state]
 
-    to_process = []
+    to_process: list[
+        tuple[
+            str,
+            str | None,
+            str,
+            list[tuple[float, State]] | tuple[float, float, float],
+        ]
+    ] = []
     to_query = []
     for _state in sensor_states:
         entity_id = _state.entity_id
+        state_class = _state.attributes[ATTR_STATE_CLASS]
+        if (measurements := period_measurements.get(entity_id)) is not None:
+            statistics_unit, values = _normalize_measurements(
+                hass, old_metadatas, measurements, end, entity_id
+            )
+            if values is not None:
+                to_process.append((entity_id, statistics_unit, state_class, values))
+            continue
+
         if entity_id not in history_list:
             continue
 
@@ -452,8 +848,6 @@ def _compile_statistics(  # noqa: C901
         if not fstates:
             continue
 
-        state_class = _state.attributes[ATTR_STATE_CLASS]
-
         to_process.append((entity_id, statistics_unit, state_class, fstates))
         if "sum" in wanted_statistics[entity_id]:
             to_query.append(entity_id)
@@ -504,6 +898,12 @@ def _compile_statistics(  # noqa: C901
 
         # Make calculations
         stat: StatisticData = {"start": start}
+        if isinstance(fstates, tuple):
+            # The running values of the period
+            stat["mean"], stat["min"], stat["max"] = fstates
+            result.append({"meta": meta, "stat": stat})
+            continue
+
         if "max" in wanted_statistics[entity_id]:
             stat["max"] = max(
                 *itertools.islice(
@@ -0,0 +1,32 @@
+"""Provide info to system health."""
+from typing import Any
+
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_get_template_render_stats
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Get info for the info page."""
+    render_stats = async_get_template_render_stats(hass)
+    info: dict[str, Any] = {
+        "tracked_templates": len(render_stats),
+        "renders": sum(stats.renders for _, stats in render_stats),
+        "render_time_ms": round(
+            sum(stats.render_time for _, stats in render_stats) * 1000, 1
+        ),
+    }
+    if render_stats:
+        template, stats = render_stats[0]
+        info["slowest_template"] = template.template
+        info["slowest_template_renders"] = stats.renders
+        info["slowest_template_render_time_ms"] = round(stats.render_time * 1000, 1)
+    return info
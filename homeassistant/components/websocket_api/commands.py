@@ -37,6 +37,7 @@ from homeassistant.helpers.json import (
 )
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import (
+    DATA_LOOP_IMPORT_TIME,
     Integration,
     IntegrationNotFound,
     async_get_integration,
@@ -49,6 +50,8 @@ from homeassistant.util.json import format_unserializable_data
 from . import const, decorators, messages
 from .connection import ActiveConnection
 from .const import ERR_NOT_FOUND
+from .entity_subscriptions import async_get_entity_subscriptions
+from .state_snapshot import async_get_state_snapshot
 
 
 @callback
@@ -240,22 +243,27 @@ def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
-    states = _async_get_allowed_states(hass, connection)
-
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
     # to succeed for the UI to show.
-    response = messages.result_message(msg["id"], states)
     try:
-        connection.send_message(JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
-        connection.logger.error(
-            "Unable to serialize to JSON. Bad data found at %s",
-            format_unserializable_data(
-                find_paths_unserializable_data(response, dump=JSON_DUMP)
-            ),
+        serialized_states = async_get_state_snapshot(hass).async_get_states_json(
+            connection.user
         )
+    except (ValueError, TypeError):
+        pass
+    else:
+        _send_handle_get_states_response(connection, msg["id"], serialized_states)
+        return
+
+    states = _async_get_allowed_states(hass, connection)
+    response = messages.result_message(msg["id"], states)
+    connection.logger.error(
+        "Unable to serialize to JSON. Bad data found at %s",
+        format_unserializable_data(
+            find_paths_unserializable_data(response, dump=JSON_DUMP)
+        ),
+    )
     del response
 
     # If we can't serialize, we'll filter out unserializable states
@@ -265,10 +273,18 @@ def handle_get_states(
         with suppress(ValueError, TypeError):
             serialized.append(JSON_DUMP(state))
 
-    # We now have partially serialized states. Craft some JSON.
-    response2 = JSON_DUMP(messages.result_message(msg["id"], ["TO_REPLACE"]))
-    response2 = response2.replace('"TO_REPLACE"', ", ".join(serialized))
-    connection.send_message(response2)
+    _send_handle_get_states_response(connection, msg["id"], ",".join(serialized))
+
+
+@callback
+def _send_handle_get_states_response(
+    connection: ActiveConnection, msg_id: int, serialized_states: str
+) -> None:
+    """Send the serialized states of a get_states command."""
+    # Craft the JSON from the serialized states.
+    response = JSON_DUMP(messages.result_message(msg_id, ["TO_REPLACE"]))
+    response = response.replace('"TO_REPLACE"', serialized_states)
+    connection.send_message(response)
 
 
 @callback
@@ -284,48 +300,42 @@ def handle_subscribe_entities(
     """Handle subscribe entities command."""
     entity_ids = set(msg.get("entity_ids", []))
 
-    @callback
-    def forward_entity_changes(event: Event) -> None:
-        """Forward entity state changed events to websocket."""
-        if not connection.user.permissions.check_entity(
-            event.data["entity_id"], POLICY_READ
-        ):
-            return
-        if entity_ids and event.data["entity_id"] not in entity_ids:
-            return
-
-        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
-
     # We must never await between sending the states and listening for
     # state changed events or we will introduce a race condition
     # where some states are missed
-    states = _async_get_allowed_states(hass, connection)
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
-    )
+    connection.subscriptions[msg["id"]] = async_get_entity_subscriptions(
+        hass
+    ).async_subscribe(connection, msg["id"], entity_ids)
     connection.send_result(msg["id"])
-    data: dict[str, dict[str, dict]] = {
-        messages.ENTITY_EVENT_ADD: {
-            state.entity_id: state.as_compressed_state()
-            for state in states
-            if not entity_ids or state.entity_id in entity_ids
-        }
-    }
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
     # to succeed for the UI to show.
-    response = messages.event_message(msg["id"], data)
     try:
-        connection.send_message(JSON_DUMP(response))
-        return
+        serialized_states = async_get_state_snapshot(
+            hass
+        ).async_get_compressed_states_json(connection.user, entity_ids or None)
     except (ValueError, TypeError):
-        connection.logger.error(
-            "Unable to serialize to JSON. Bad data found at %s",
-            format_unserializable_data(
-                find_paths_unserializable_data(response, dump=JSON_DUMP)
-            ),
-        )
+        pass
+    else:
+        _send_handle_entities_init_response(connection, msg["id"], serialized_states)
+        return
+
+    states = _async_get_allowed_states(hass, connection)
+    if entity_ids:
+        states = [state for state in states if state.entity_id in entity_ids]
+    data: dict[str, dict[str, dict]] = {
+        messages.ENTITY_EVENT_ADD: {
+            state.entity_id: state.as_compressed_state() for state in states
+        }
+    }
+    response = messages.event_message(msg["id"], data)
+    connection.logger.error(
+        "Unable to serialize to JSON. Bad data found at %s",
+        format_unserializable_data(
+            find_paths_unserializable_data(response, dump=JSON_DUMP)
+        ),
+    )
     del response
 
     add_entities = data[messages.ENTITY_EVENT_ADD]
@@ -342,6 +352,19 @@ def handle_subscribe_entities(
     connection.send_message(JSON_DUMP(messages.event_message(msg["id"], data)))
 
 
+@callback
+def _send_handle_entities_init_response(
+    connection: ActiveConnection, msg_id: int, serialized_states: str
+) -> None:
+    """Send the serialized states of a subscribe_entities command."""
+    # Craft the JSON from the serialized states.
+    response = JSON_DUMP(
+        messages.event_message(msg_id, {messages.ENTITY_EVENT_ADD: "TO_REPLACE"})
+    )
+    response = response.replace('"TO_REPLACE"', f"{{{serialized_states}}}")
+    connection.send_message(response)
+
+
 @decorators.websocket_command({vol.Required("type"): "get_services"})
 @decorators.async_response
 async def handle_get_services(
@@ -405,10 +428,15 @@ async def handle_integration_setup_info(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle integrations command."""
+    loop_import_time: dict[str, float] = hass.data.get(DATA_LOOP_IMPORT_TIME, {})
     connection.send_result(
         msg["id"],
         [
-            {"domain": integration, "seconds": timedelta.total_seconds()}
+            {
+                "domain": integration,
+                "seconds": timedelta.total_seconds(),
+                "loop_import_seconds": loop_import_time.get(integration, 0),
+            }
             for integration, timedelta in cast(
                 dict[str, dt.timedelta], hass.data[DATA_SETUP_TIME]
             ).items()
@@ -54,4 +54,18 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
+# Data used to store the counters of the messages sent by all connections
+DATA_MESSAGE_STATS: Final = f"{DOMAIN}.message_stats"
+
+# Data used to store the shared subscribe_entities listener
+DATA_ENTITY_SUBSCRIPTIONS: Final = f"{DOMAIN}.entity_subscriptions"
+
+# Data used to store the serialized states for new connections
+DATA_STATE_SNAPSHOT: Final = f"{DOMAIN}.state_snapshot"
+
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+# Large messages are sent as binary frames of zlib compressed JSON to clients
+# with this feature. Its value is the zlib compression level, from 1 to 9.
+FEATURE_COMPRESSED_MESSAGES = "compressed_messages"
+# Smaller messages are always sent as JSON text
+COMPRESSED_MESSAGE_MIN_SIZE: Final = 1024
@@ -0,0 +1,155 @@
+"""Share the state changed listener of the subscribe_entities command."""
+from __future__ import annotations
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+from .connection import ActiveConnection
+from .const import DATA_ENTITY_SUBSCRIPTIONS
+from .messages import IDEN_JSON_TEMPLATE, cached_state_diff_message_json
+
+SubscriberGroupKey = tuple[str | None, frozenset[str] | None]
+
+
+class SubscriberGroup:
+    """Subscribers with the same permissions and entity filter."""
+
+    __slots__ = ("user", "entity_ids", "subscribers")
+
+    def __init__(self, user: User | None, entity_ids: frozenset[str] | None) -> None:
+        """Initialize the group.
+
+        The user is None when all subscribers can read all entities.
+        """
+        self.user = user
+        self.entity_ids = entity_ids
+        self.subscribers: dict[tuple[ActiveConnection, int], None] = {}
+
+
+class EntitySubscriptions:
+    """Forward state changes to all subscribe_entities subscribers.
+
+    A single state changed listener is shared by all connections. The
+    subscribers are grouped by their permissions and entity filter, so the
+    permissions are checked once per group, and the state diff message is
+    serialized once per state change.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the entity subscriptions."""
+        self.hass = hass
+        self._groups: dict[SubscriberGroupKey, SubscriberGroup] = {}
+        # Groups without an entity filter and groups by filtered entity_id
+        self._unfiltered_groups: list[SubscriberGroup] = []
+        self._filtered_groups: dict[str, list[SubscriberGroup]] = {}
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+        self.state_changes = 0
+        self.messages_sent = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        """Return the number of subscribers."""
+        return sum(len(group.subscribers) for group in self._groups.values())
+
+    @property
+    def group_count(self) -> int:
+        """Return the number of subscriber groups."""
+        return len(self._groups)
+
+    @callback
+    def async_subscribe(
+        self,
+        connection: ActiveConnection,
+        msg_id: int,
+        entity_ids: set[str] | None,
+    ) -> CALLBACK_TYPE:
+        """Subscribe a connection to the state changes of the entities."""
+        user = connection.user
+        # Only owners are grouped together since the permissions of other
+        # users can change while they are subscribed
+        group_user = None if user.is_owner else user
+        filter_ids = frozenset(entity_ids) if entity_ids else None
+        key = (group_user.id if group_user else None, filter_ids)
+
+        if (group := self._groups.get(key)) is None:
+            group = self._groups[key] = SubscriberGroup(group_user, filter_ids)
+            if filter_ids is None:
+                self._unfiltered_groups.append(group)
+            else:
+                for entity_id in filter_ids:
+                    self._filtered_groups.setdefault(entity_id, []).append(group)
+
+        subscriber = (connection, msg_id)
+        group.subscribers[subscriber] = None
+
+        if self._unsub_state_changed is None:
+            self._unsub_state_changed = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_forward_state_changed,
+                run_immediately=True,
+            )
+
+        @callback
+        def unsubscribe() -> None:
+            """Unsubscribe the connection."""
+            del group.subscribers[subscriber]
+            if not group.subscribers:
+                self._async_remove_group(key, group)
+
+        return unsubscribe
+
+    @callback
+    def _async_remove_group(
+        self, key: SubscriberGroupKey, group: SubscriberGroup
+    ) -> None:
+        """Remove a group without subscribers."""
+        del self._groups[key]
+        if group.entity_ids is None:
+            self._unfiltered_groups.remove(group)
+        else:
+            for entity_id in group.entity_ids:
+                groups = self._filtered_groups[entity_id]
+                groups.remove(group)
+                if not groups:
+                    del self._filtered_groups[entity_id]
+
+        if not self._groups and self._unsub_state_changed is not None:
+            self._unsub_state_changed()
+            self._unsub_state_changed = None
+
+    @callback
+    def _async_forward_state_changed(self, event: Event) -> None:
+        """Forward a state change to the subscribers allowed to read it."""
+        entity_id: str = event.data["entity_id"]
+        groups = self._unfiltered_groups
+        if filtered_groups := self._filtered_groups.get(entity_id):
+            groups = [*groups, *filtered_groups]
+
+        self.state_changes += 1
+        message_json: str | None = None
+        # Subscribers usually use the same message ids
+        messages: dict[int, str] = {}
+        for group in groups:
+            if group.user is not None and not group.user.permissions.check_entity(
+                entity_id, POLICY_READ
+            ):
+                continue
+            if message_json is None:
+                message_json = cached_state_diff_message_json(event)
+            for connection, msg_id in group.subscribers:
+                if (message := messages.get(msg_id)) is None:
+                    message = messages[msg_id] = message_json.replace(
+                        IDEN_JSON_TEMPLATE, str(msg_id), 1
+                    )
+                connection.send_message(message)
+                self.messages_sent += 1
+
+
+@callback
+def async_get_entity_subscriptions(hass: HomeAssistant) -> EntitySubscriptions:
+    """Return the shared entity subscriptions."""
+    if (subscriptions := hass.data.get(DATA_ENTITY_SUBSCRIPTIONS)) is None:
+        subscriptions = hass.data[DATA_ENTITY_SUBSCRIPTIONS] = EntitySubscriptions(hass)
+    return subscriptions
@@ -6,7 +6,9 @@ from collections.abc import Callable
 from contextlib import suppress
 import datetime as dt
 import logging
+from time import monotonic
 from typing import TYPE_CHECKING, Any, Final
+import zlib
 
 from aiohttp import WSMsgType, web
 import async_timeout
@@ -21,8 +23,11 @@ from homeassistant.util.json import json_loads
 from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
+    COMPRESSED_MESSAGE_MIN_SIZE,
     DATA_CONNECTIONS,
+    DATA_MESSAGE_STATS,
     FEATURE_COALESCE_MESSAGES,
+    FEATURE_COMPRESSED_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -63,6 +68,26 @@ class WebSocketAdapter(logging.LoggerAdapter):
         return f'[{self.extra["connid"]}] {msg}', kwargs
 
 
+class MessageStats:
+    """Counters of the messages written to websocket clients."""
+
+    __slots__ = ("messages", "bytes", "encode_time")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.messages = 0
+        self.bytes = 0
+        self.encode_time = 0.0
+
+
+@callback
+def async_get_message_stats(hass: HomeAssistant) -> MessageStats:
+    """Return the counters of the messages sent by all connections."""
+    if (stats := hass.data.get(DATA_MESSAGE_STATS)) is None:
+        stats = hass.data[DATA_MESSAGE_STATS] = MessageStats()
+    return stats
+
+
 class WebSocketHandler:
     """Handle an active websocket client connection."""
 
@@ -78,6 +103,9 @@ class WebSocketHandler:
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub: Callable[[], None] | None = None
         self.connection: ActiveConnection | None = None
+        # Counters of the messages written to this client and to all clients
+        self.stats = MessageStats()
+        self._total_stats = async_get_message_stats(hass)
 
     @property
     def description(self) -> str:
@@ -90,22 +118,21 @@ class WebSocketHandler:
         """Write outgoing messages."""
         # Exceptions if Socket disconnected or cancelled by connection handler
         to_write = self._to_write
-        logger = self._logger
-        wsock = self.wsock
         try:
             with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
                 while not self.wsock.closed:
                     if (process := await to_write.get()) is None:
                         return
-                    message = process if isinstance(process, str) else process()
+                    message = (
+                        process if isinstance(process, str) else self._encode(process)
+                    )
                     if (
                         to_write.empty()
                         or not self.connection
                         or FEATURE_COALESCE_MESSAGES
                         not in self.connection.supported_features
                     ):
-                        logger.debug("Sending %s", message)
-                        await wsock.send_str(message)
+                        await self._send(message, 1)
                         continue
 
                     messages: list[str] = [message]
@@ -113,16 +140,62 @@ class WebSocketHandler:
                         if (process := to_write.get_nowait()) is None:
                             return
                         messages.append(
-                            process if isinstance(process, str) else process()
+                            process
+                            if isinstance(process, str)
+                            else self._encode(process)
                         )
 
                     coalesced_messages = "[" + ",".join(messages) + "]"
-                    logger.debug("Sending %s", coalesced_messages)
-                    await wsock.send_str(coalesced_messages)
+                    await self._send(coalesced_messages, len(messages))
         finally:
             # Clean up the peaker checker when we shut down the writer
             self._cancel_peak_checker()
 
+    async def _send(self, message: str, count: int) -> None:
+        """Send a message with the given number of messages to the client.
+
+        Large messages are compressed for clients that support compressed
+        messages, unless permessage-deflate already compresses the frames.
+        """
+        self._logger.debug("Sending %s", message)
+        wsock = self.wsock
+        if (
+            len(message) >= COMPRESSED_MESSAGE_MIN_SIZE
+            and not wsock.compress
+            and (connection := self.connection) is not None
+            and (
+                level := connection.supported_features.get(FEATURE_COMPRESSED_MESSAGES)
+            )
+        ):
+            data = zlib.compress(message.encode("utf-8"), min(max(int(level), 1), 9))
+            self._count_sent(len(data), count)
+            await wsock.send_bytes(data)
+            return
+        # The JSON is usually ASCII so the encoded length does not need computing
+        self._count_sent(
+            len(message) if message.isascii() else len(message.encode("utf-8")),
+            count,
+        )
+        await wsock.send_str(message)
+
+    def _encode(self, process: Callable[[], str]) -> str:
+        """Encode a lazily serialized message and count the time it took."""
+        start = monotonic()
+        message = process()
+        self._count_encode_time(monotonic() - start)
+        return message
+
+    def _count_encode_time(self, elapsed: float) -> None:
+        """Count the time spent encoding a message."""
+        self.stats.encode_time += elapsed
+        self._total_stats.encode_time += elapsed
+
+    def _count_sent(self, size: int, count: int) -> None:
+        """Count the messages and the bytes of the payload sent to the client."""
+        for stats in (self.stats, self._total_stats):
+            stats.messages += count
+            stats.bytes += size
+
     @callback
     def _cancel_peak_checker(self) -> None:
         """Cancel the peak checker."""
@@ -144,7 +217,9 @@ class WebSocketHandler:
             return
 
         if isinstance(message, dict):
+            start = monotonic()
             message = message_to_json(message)
+            self._count_encode_time(monotonic() - start)
 
         to_write = self._to_write
 
@@ -215,7 +290,11 @@ class WebSocketHandler:
             self._logger.warning("Timeout preparing request from %s", request.remote)
             return wsock
 
-        self._logger.debug("Connected from %s", request.remote)
+        # The compression is the negotiated permessage-deflate window
+        # size in bits, 0 means the client did not enable it
+        self._logger.debug(
+            "Connected from %s, compression: %s", request.remote, wsock.compress
+        )
         self._handle_task = asyncio.current_task()
 
         @callback
@@ -324,6 +403,13 @@ class WebSocketHandler:
                 else:
                     self._logger.warning("Disconnected: %s", disconnect_warn)
 
+                self._logger.debug(
+                    "Sent %s messages with %s bytes, encoding took %.3f seconds",
+                    self.stats.messages,
+                    self.stats.bytes,
+                    self.stats.encode_time,
+                )
+
                 if connection is not None:
                     self.hass.data[DATA_CONNECTIONS] -= 1
                     self.connection = None
@@ -98,6 +98,14 @@ def cached_state_diff_message(iden: int, event: Event) -> str:
     return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
 
 
+def cached_state_diff_message_json(event: Event) -> str:
+    """Return the serialized state diff message with the IDEN_JSON_TEMPLATE.
+
+    The caller replaces the IDEN_JSON_TEMPLATE with the message id.
+    """
+    return _cached_state_diff_message(event)
+
+
 @lru_cache(maxsize=128)
 def _cached_state_diff_message(event: Event) -> str:
     """Cache and serialize the event to json.
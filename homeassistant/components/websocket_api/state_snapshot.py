@@ -0,0 +1,147 @@
+"""Keep the states serialized for the initial payload of new connections."""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.json import JSON_DUMP
+
+from .const import DATA_STATE_SNAPSHOT
+
+
+def _serialize_state(state: State) -> str:
+    """Serialize a state for get_states."""
+    return JSON_DUMP(state)
+
+
+def _serialize_compressed_state(state: State) -> str:
+    """Serialize a state for subscribe_entities as an entity_id: state pair."""
+    return JSON_DUMP({state.entity_id: state.as_compressed_state()})[1:-1]
+
+
+class SerializedStates:
+    """Serialized states in the order of the state machine.
+
+    States are serialized when they are requested after they changed, and
+    the joined states are kept until the next state change.
+    """
+
+    __slots__ = ("hass", "serializer", "serialized", "changed", "joined")
+
+    def __init__(self, hass: HomeAssistant, serializer: Callable[[State], str]) -> None:
+        """Initialize the serialized states."""
+        self.hass = hass
+        self.serializer = serializer
+        self.serialized: dict[str, str] = {}
+        self.changed: set[str] = set()
+        self.joined: str | None = None
+        for state in hass.states.async_all():
+            self.async_state_changed(state.entity_id, False)
+
+    @callback
+    def async_state_changed(self, entity_id: str, removed: bool) -> None:
+        """Mark the serialized state of an entity as changed."""
+        self.joined = None
+        if removed:
+            self.serialized.pop(entity_id, None)
+            self.changed.discard(entity_id)
+            return
+        # Keep the position of existing entities like the state machine does
+        self.serialized.setdefault(entity_id, "")
+        self.changed.add(entity_id)
+
+    @callback
+    def async_get_json(self, user: User, entity_ids: set[str] | None) -> str:
+        """Return the joined serialized states the user is allowed to read.
+
+        Raises ValueError or TypeError if a state cannot be serialized.
+        """
+        serialized = self.serialized
+        if changed := self.changed:
+            get_state = self.hass.states.get
+            for entity_id in list(changed):
+                if (state := get_state(entity_id)) is None:
+                    # A state_changed event was fired for an entity that
+                    # is not in the state machine, there is nothing to send
+                    serialized.pop(entity_id, None)
+                else:
+                    # The entity stays changed if its state cannot be
+                    # serialized, so the next call raises again
+                    serialized[entity_id] = self.serializer(state)
+                changed.remove(entity_id)
+
+        if entity_ids is None and user.permissions.access_all_entities(POLICY_READ):
+            if self.joined is None:
+                self.joined = ",".join(serialized.values())
+            return self.joined
+
+        check_entity = user.permissions.check_entity
+        return ",".join(
+            serialized_state
+            for entity_id, serialized_state in serialized.items()
+            if (entity_ids is None or entity_id in entity_ids)
+            and check_entity(entity_id, POLICY_READ)
+        )
+
+
+class StateSnapshot:
+    """Serialized states of the state machine.
+
+    Every state is only serialized once, no matter how many connections
+    ask for it. Connections that can read all entities share the joined
+    states until the next state change.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the state snapshot."""
+        self.hass = hass
+        self._states: SerializedStates | None = None
+        self._compressed_states: SerializedStates | None = None
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED, self._async_state_changed, run_immediately=True
+        )
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Mark the serialized state of the entity as changed."""
+        entity_id: str = event.data["entity_id"]
+        removed = event.data["new_state"] is None
+        if self._states is not None:
+            self._states.async_state_changed(entity_id, removed)
+        if self._compressed_states is not None:
+            self._compressed_states.async_state_changed(entity_id, removed)
+
+    @callback
+    def async_get_states_json(self, user: User) -> str:
+        """Return the serialized states for get_states.
+
+        Raises ValueError or TypeError if a state cannot be serialized.
+        """
+        if self._states is None:
+            self._states = SerializedStates(self.hass, _serialize_state)
+        return self._states.async_get_json(user, None)
+
+    @callback
+    def async_get_compressed_states_json(
+        self, user: User, entity_ids: set[str] | None
+    ) -> str:
+        """Return the serialized compressed states for subscribe_entities.
+
+        Raises ValueError or TypeError if a state cannot be serialized.
+        """
+        if self._compressed_states is None:
+            self._compressed_states = SerializedStates(
+                self.hass, _serialize_compressed_state
+            )
+        return self._compressed_states.async_get_json(user, entity_ids)
+
+
+@callback
+def async_get_state_snapshot(hass: HomeAssistant) -> StateSnapshot:
+    """Return the state snapshot."""
+    if (snapshot := hass.data.get(DATA_STATE_SNAPSHOT)) is None:
+        snapshot = hass.data[DATA_STATE_SNAPSHOT] = StateSnapshot(hass)
+    return snapshot
@@ -0,0 +1,31 @@
+"""Provide info to system health."""
+from typing import Any
+
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+
+from .entity_subscriptions import async_get_entity_subscriptions
+from .http import async_get_message_stats
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Get info for the info page."""
+    subscriptions = async_get_entity_subscriptions(hass)
+    message_stats = async_get_message_stats(hass)
+    return {
+        "entity_subscribers": subscriptions.subscriber_count,
+        "entity_subscriber_groups": subscriptions.group_count,
+        "entity_state_changes": subscriptions.state_changes,
+        "entity_messages_sent": subscriptions.messages_sent,
+        "messages_sent": message_stats.messages,
+        "bytes_sent": message_stats.bytes,
+        "encode_time": round(message_stats.encode_time, 3),
+    }
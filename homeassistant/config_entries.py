@@ -964,7 +964,7 @@ class ConfigEntriesFlowManager(data_entry_flow.FlowManager):
         await async_process_deps_reqs(self.hass, self._hass_config, integration)
 
         try:
-            integration.get_platform("config_flow")
+            await integration.async_get_platform("config_flow")
         except ImportError as err:
             _LOGGER.error(
                 "Error occurred loading configuration flow for integration %s: %s",
@@ -11,6 +11,7 @@ from collections.abc import (
     Callable,
     Collection,
     Coroutine,
+    Hashable,
     Iterable,
     Mapping,
 )
@@ -821,7 +822,14 @@ class HomeAssistant:
 class Context:
     """The context that triggered something."""
 
-    __slots__ = ("user_id", "parent_id", "id", "origin_event")
+    __slots__ = (
+        "user_id",
+        "parent_id",
+        "_id",
+        "_id_time",
+        "_id_randomness",
+        "origin_event",
+    )
 
     def __init__(
         self,
@@ -830,11 +838,60 @@ class Context:
         id: str | None = None,  # pylint: disable=redefined-builtin
     ) -> None:
         """Init the context."""
-        self.id = id or ulid_util.ulid()
+        self._id: str | None = id or ulid_util.ulid()
+        self._id_time: datetime.datetime | None = None
+        self._id_randomness = 0
         self.user_id = user_id
         self.parent_id = parent_id
         self.origin_event: Event | None = None
 
+    @classmethod
+    def _at_time(cls, id_time: datetime.datetime) -> Self:
+        """Create a context with an id for id_time that is generated when used.
+
+        Most contexts created for state changes are never read, so
+        only the random bits are drawn and the ULID is encoded when
+        the id is accessed.
+        """
+        context = cls.__new__(cls)
+        context._id = None
+        context._id_time = id_time
+        context._id_randomness = ulid_util.ulid_randomness()
+        context.user_id = None
+        context.parent_id = None
+        context.origin_event = None
+        return context
+
+    def _without_origin_event(self) -> Self:
+        """Return a copy of the context that does not reference the origin event.
+
+        A lazy id is copied as its time and random bits, so both
+        contexts generate the same id when it is used.
+        """
+        context = self.__class__.__new__(self.__class__)
+        context._id = self._id
+        context._id_time = self._id_time
+        context._id_randomness = self._id_randomness
+        context.user_id = self.user_id
+        context.parent_id = self.parent_id
+        context.origin_event = None
+        return context
+
+    @property
+    def id(self) -> str:  # pylint: disable=invalid-name
+        """Return the id of the context."""
+        if self._id is None:
+            assert self._id_time is not None
+            self._id = ulid_util.ulid_from_randomness(
+                dt_util.utc_to_timestamp(self._id_time), self._id_randomness
+            )
+        return self._id
+
+    @id.setter
+    def id(self, id: str) -> None:  # pylint: disable=redefined-builtin
+        """Set the id of the context."""
+        self._id = id
+
     def __eq__(self, other: Any) -> bool:
         """Compare contexts."""
         return bool(self.__class__ == other.__class__ and self.id == other.id)
@@ -873,9 +930,8 @@ class Event:
         self.data = data or {}
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
-        self.context: Context = context or Context(
-            id=ulid_util.ulid_at_time(dt_util.utc_to_timestamp(self.time_fired))
-        )
+        # pylint: disable-next=protected-access
+        self.context: Context = context or Context._at_time(self.time_fired)
 
     def as_dict(self) -> dict[str, Any]:
         """Create a dict representation of this Event.
@@ -913,8 +969,17 @@ class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
-        """Initialize a new event bus."""
+        """Initialize a new event bus.
+
+        The lists of listeners are replaced instead of modified when
+        listeners are added or removed so they can be iterated while
+        firing an event without making a copy.
+        """
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        # Listeners indexed by event type, event data key and value
+        self._match_listeners: dict[
+            str, dict[str, dict[Hashable, list[_FilterableJob]]]
+        ] = {}
         self._hass = hass
 
     @callback
@@ -923,7 +988,14 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, listeners_by_key in self._match_listeners.items():
+            listeners[event_type] = listeners.get(event_type, 0) + sum(
+                len(match_listeners)
+                for listeners_by_value in listeners_by_key.values()
+                for match_listeners in listeners_by_value.values()
+            )
+        return listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -960,12 +1032,17 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._listeners.get(event_type)
+        listeners_by_key = self._match_listeners.get(event_type)
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        match_all_listeners: list[_FilterableJob] | None = None
+        match_all_listeners_by_key: dict[
+            str, dict[Hashable, list[_FilterableJob]]
+        ] | None = None
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            match_all_listeners = self._listeners.get(MATCH_ALL)
+            match_all_listeners_by_key = self._match_listeners.get(MATCH_ALL)
 
         event = Event(event_type, event_data, origin, time_fired, context)
         if not event.context.origin_event:
@@ -973,9 +1050,50 @@ class EventBus:
 
         _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
-            return
+        # The listeners of all events run before the listeners of the event
+        # type, and the indexed listeners after the other ones of each
+        if match_all_listeners:
+            self._async_run_listeners(event, match_all_listeners)
+        if match_all_listeners_by_key and event_data:
+            self._async_run_match_listeners(
+                event, event_data, match_all_listeners_by_key
+            )
+        if listeners:
+            self._async_run_listeners(event, listeners)
+        if listeners_by_key and event_data:
+            self._async_run_match_listeners(event, event_data, listeners_by_key)
+
+    @callback
+    def _async_run_match_listeners(
+        self,
+        event: Event,
+        event_data: dict[str, Any],
+        listeners_by_key: dict[str, dict[Hashable, list[_FilterableJob]]],
+    ) -> None:
+        """Run the indexed listeners matching the event data.
+
+        This method must be run in the event loop.
+        """
+        # The listeners may remove themselves from the index while running
+        for data_key, listeners_by_value in list(listeners_by_key.items()):
+            if (value := event_data.get(data_key)) is None:
+                continue
+            try:
+                match_listeners = listeners_by_value.get(value)
+            except TypeError:
+                # The value is not hashable so it cannot match
+                continue
+            if match_listeners:
+                self._async_run_listeners(event, match_listeners)
+
+    @callback
+    def _async_run_listeners(
+        self, event: Event, listeners: list[_FilterableJob]
+    ) -> None:
+        """Run the listeners of an event.
 
+        This method must be run in the event loop.
+        """
         for job, event_filter, run_immediately in listeners:
             if event_filter is not None:
                 try:
@@ -1019,6 +1137,7 @@ class EventBus:
         listener: Callable[[Event], Coroutine[Any, Any, None] | None],
         event_filter: Callable[[Event], bool] | None = None,
         run_immediately: bool = False,
+        event_data_match: tuple[str, Hashable] | None = None,
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -1029,6 +1148,14 @@ class EventBus:
         @callback that returns a boolean value, determines if the
         listener callable should run.
 
+        An optional event_data_match, a tuple of an event data key and
+        a value, only runs the listener for events with that value in
+        their data. The listeners are indexed by the value, so prefer it
+        over an event_filter that only compares a value of the event data,
+        such as the entity_id. The event_filter is applied after the
+        event data has matched. Indexed listeners run after the other
+        listeners of the same event_type.
+
         If run_immediately is passed, the callback will be run
         right away instead of using call_soon. Only use this if
         the callback results in scheduling another task.
@@ -1039,18 +1166,23 @@ class EventBus:
             raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
         if run_immediately and not is_callback(listener):
             raise HomeAssistantError(f"Event listener {listener} is not a callback")
-        return self._async_listen_filterable_job(
-            event_type,
-            _FilterableJob(
-                HassJob(listener, f"listen {event_type}"), event_filter, run_immediately
-            ),
+        filterable_job = _FilterableJob(
+            HassJob(listener, f"listen {event_type}"), event_filter, run_immediately
         )
+        if event_data_match is not None:
+            return self._async_listen_match_filterable_job(
+                event_type, event_data_match, filterable_job
+            )
+        return self._async_listen_filterable_job(event_type, filterable_job)
 
     @callback
     def _async_listen_filterable_job(
         self, event_type: str, filterable_job: _FilterableJob
     ) -> CALLBACK_TYPE:
-        self._listeners.setdefault(event_type, []).append(filterable_job)
+        self._listeners[event_type] = [
+            *self._listeners.get(event_type, ()),
+            filterable_job,
+        ]
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -1058,6 +1190,30 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def _async_listen_match_filterable_job(
+        self,
+        event_type: str,
+        event_data_match: tuple[str, Hashable],
+        filterable_job: _FilterableJob,
+    ) -> CALLBACK_TYPE:
+        data_key, value = event_data_match
+        listeners_by_value = self._match_listeners.setdefault(
+            event_type, {}
+        ).setdefault(data_key, {})
+        listeners_by_value[value] = [
+            *listeners_by_value.get(value, ()),
+            filterable_job,
+        ]
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_match_listener(
+                event_type, event_data_match, filterable_job
+            )
+
+        return remove_listener
+
     def listen_once(
         self,
         event_type: str,
@@ -1134,17 +1290,54 @@ class EventBus:
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(filterable_job)
-
-            # delete event_type list if empty
-            if not self._listeners[event_type]:
-                self._listeners.pop(event_type)
+            listeners = self._listeners[event_type].copy()
+            listeners.remove(filterable_job)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
             _LOGGER.exception(
                 "Unable to remove unknown job listener %s", filterable_job
             )
+            return
+
+        # delete event_type list if empty
+        if listeners:
+            self._listeners[event_type] = listeners
+        else:
+            self._listeners.pop(event_type)
+
+    @callback
+    def _async_remove_match_listener(
+        self,
+        event_type: str,
+        event_data_match: tuple[str, Hashable],
+        filterable_job: _FilterableJob,
+    ) -> None:
+        """Remove a listener of a specific event_type and event data.
+
+        This method must be run in the event loop.
+        """
+        data_key, value = event_data_match
+        try:
+            listeners_by_key = self._match_listeners[event_type]
+            listeners_by_value = listeners_by_key[data_key]
+            listeners = listeners_by_value[value].copy()
+            listeners.remove(filterable_job)
+        except (KeyError, ValueError):
+            _LOGGER.exception(
+                "Unable to remove unknown job listener %s", filterable_job
+            )
+            return
+
+        # delete the empty lists and indexes
+        if listeners:
+            listeners_by_value[value] = listeners
+            return
+        del listeners_by_value[value]
+        if not listeners_by_value:
+            del listeners_by_key[data_key]
+        if not listeners_by_key:
+            del self._match_listeners[event_type]
 
 
 class State:
@@ -1200,7 +1393,11 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = ReadOnlyDict(attributes or {})
+        self.attributes = (
+            attributes
+            if type(attributes) is ReadOnlyDict  # pylint: disable=unidiomatic-typecheck
+            else ReadOnlyDict(attributes or {})
+        )
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
@@ -1315,9 +1512,8 @@ class State:
         since it can never be garbage collected as each event would
         reference the previous one.
         """
-        self.context = Context(
-            self.context.user_id, self.context.parent_id, self.context.id
-        )
+        # pylint: disable-next=protected-access
+        self.context = self.context._without_origin_event()
 
     def __repr__(self) -> str:
         """Return the representation of the states."""
@@ -1335,6 +1531,9 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: dict[str, State] = {}
+        # The states of each domain, maintained with the states so
+        # lookups by domain do not have to scan all the states
+        self._domain_index: dict[str, dict[str, State]] = {}
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1358,8 +1557,10 @@ class StateMachine:
             return list(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), ()))
 
+        # Scan the states to keep the order of the state machine
+        # when the states of several domains are requested
         return [
             state.entity_id
             for state in self._states.values()
@@ -1378,11 +1579,9 @@ class StateMachine:
             return len(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return len(self._domain_index.get(domain_filter.lower(), ()))
 
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
-        )
+        return sum(len(self._domain_index.get(domain, ())) for domain in domain_filter)
 
     def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
         """Create a list of all states."""
@@ -1402,8 +1601,10 @@ class StateMachine:
             return list(self._states.values())
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), {}).values())
 
+        # Scan the states to keep the order of the state machine
+        # when the states of several domains are requested
         return [
             state for state in self._states.values() if state.domain in domain_filter
         ]
@@ -1449,6 +1650,10 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
         old_state.expire()
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
@@ -1536,6 +1741,10 @@ class StateMachine:
             same_state = old_state.state == new_state and not force_update
             same_attr = old_state.attributes == attributes
             last_changed = old_state.last_changed if same_state else None
+            if same_attr:
+                # Share the read only attributes of the old state
+                # instead of copying them into a new ReadOnlyDict
+                attributes = old_state.attributes
 
         if same_state and same_attr:
             return
@@ -1543,7 +1752,8 @@ class StateMachine:
         now = dt_util.utcnow()
 
         if context is None:
-            context = Context(id=ulid_util.ulid_at_time(dt_util.utc_to_timestamp(now)))
+            # The ULID of the context is only generated when it is used
+            context = Context._at_time(now)  # pylint: disable=protected-access
         state = State(
             entity_id,
             new_state,
@@ -1556,6 +1766,9 @@ class StateMachine:
         if old_state is not None:
             old_state.expire()
         self._states[entity_id] = state
+        if (domain_states := self._domain_index.get(state.domain)) is None:
+            domain_states = self._domain_index[state.domain] = {}
+        domain_states[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
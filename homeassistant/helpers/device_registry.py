@@ -21,6 +21,7 @@ from . import storage
 from .debounce import Debouncer
 from .frame import report
 from .json import JSON_DUMP, find_paths_unserializable_data
+from .registry import RegistryIndexType, index_entry, reindex_entry, unindex_entry
 from .typing import UNDEFINED, UndefinedType
 
 if TYPE_CHECKING:
@@ -255,6 +256,9 @@ class DeviceRegistryItems(UserDict[str, _EntryTypeT]):
                 del self._connections[connection]
             for identifier in old_entry.identifiers:
                 del self._identifiers[identifier]
+            self._reindex_entry(key, old_entry, entry)
+        else:
+            self._index_entry(key, entry)
         # type ignore linked to mypy issue: https://github.com/python/mypy/issues/13596
         super().__setitem__(key, entry)  # type: ignore[assignment]
         for connection in entry.connections:
@@ -269,8 +273,20 @@ class DeviceRegistryItems(UserDict[str, _EntryTypeT]):
             del self._connections[connection]
         for identifier in entry.identifiers:
             del self._identifiers[identifier]
+        self._unindex_entry(key, entry)
         super().__delitem__(key)
 
+    def _index_entry(self, key: str, entry: _EntryTypeT) -> None:
+        """Index an entry that is added."""
+
+    def _reindex_entry(
+        self, key: str, old_entry: _EntryTypeT, entry: _EntryTypeT
+    ) -> None:
+        """Index an entry that replaces an existing entry."""
+
+    def _unindex_entry(self, key: str, entry: _EntryTypeT) -> None:
+        """Unindex an entry that is removed."""
+
     def get_entry(
         self,
         identifiers: set[tuple[str, str]],
@@ -288,10 +304,60 @@ class DeviceRegistryItems(UserDict[str, _EntryTypeT]):
         return None
 
 
+class ActiveDeviceRegistryItems(DeviceRegistryItems[DeviceEntry]):
+    """Container for active device registry items, maps device id -> entry.
+
+    Maintains additional indexes:
+    - area_id -> device ids
+    - config_entry_id -> device ids
+    """
+
+    def __init__(self) -> None:
+        """Initialize the container."""
+        super().__init__()
+        self._area_id_index: RegistryIndexType = {}
+        self._config_entry_id_index: RegistryIndexType = {}
+
+    def _index_entry(self, key: str, entry: DeviceEntry) -> None:
+        """Index an entry that is added."""
+        index_entry(self._area_id_index, key, (entry.area_id,))
+        index_entry(self._config_entry_id_index, key, entry.config_entries)
+
+    def _reindex_entry(
+        self, key: str, old_entry: DeviceEntry, entry: DeviceEntry
+    ) -> None:
+        """Index an entry that replaces an existing entry."""
+        reindex_entry(self._area_id_index, key, (old_entry.area_id,), (entry.area_id,))
+        reindex_entry(
+            self._config_entry_id_index,
+            key,
+            old_entry.config_entries,
+            entry.config_entries,
+        )
+
+    def _unindex_entry(self, key: str, entry: DeviceEntry) -> None:
+        """Unindex an entry that is removed."""
+        unindex_entry(self._area_id_index, key, (entry.area_id,))
+        unindex_entry(self._config_entry_id_index, key, entry.config_entries)
+
+    def get_devices_for_area_id(self, area_id: str) -> list[DeviceEntry]:
+        """Get devices for area."""
+        return [self.data[key] for key in self._area_id_index.get(area_id, ())]
+
+    def get_devices_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> list[DeviceEntry]:
+        """Get devices for config entry."""
+        return [
+            self.data[key]
+            for key in self._config_entry_id_index.get(config_entry_id, ())
+        ]
+
+
 class DeviceRegistry:
     """Class to hold a registry of devices."""
 
-    devices: DeviceRegistryItems[DeviceEntry]
+    devices: ActiveDeviceRegistryItems
     deleted_devices: DeviceRegistryItems[DeletedDeviceEntry]
 
     def __init__(self, hass: HomeAssistant) -> None:
@@ -303,6 +369,7 @@ class DeviceRegistry:
             STORAGE_KEY,
             atomic_writes=True,
             minor_version=STORAGE_VERSION_MINOR,
+            journal=True,
         )
 
     @callback
@@ -590,7 +657,7 @@ class DeviceRegistry:
 
         data = await self._store.async_load()
 
-        devices: DeviceRegistryItems[DeviceEntry] = DeviceRegistryItems()
+        devices = ActiveDeviceRegistryItems()
         deleted_devices: DeviceRegistryItems[DeletedDeviceEntry] = DeviceRegistryItems()
 
         if data is not None:
@@ -765,7 +832,7 @@ async def async_get_registry(hass: HomeAssistant) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> list[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    return registry.devices.get_devices_for_area_id(area_id)
 
 
 @callback
@@ -773,11 +840,7 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> list[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    return registry.devices.get_devices_for_config_entry_id(config_entry_id)
 
 
 @callback
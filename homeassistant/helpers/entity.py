@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from abc import ABC
 import asyncio
+from collections import Counter
 from collections.abc import Coroutine, Iterable, Mapping, MutableMapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -40,8 +41,11 @@ from homeassistant.util import dt as dt_util, ensure_unique_string, slugify
 
 from . import device_registry as dr, entity_registry as er
 from .device_registry import DeviceEntryType
-from .event import async_track_entity_registry_updated_event
-from .typing import StateType
+from .event import (
+    async_track_device_registry_updated_event,
+    async_track_entity_registry_updated_event,
+)
+from .typing import UNDEFINED, StateType, UndefinedType
 
 if TYPE_CHECKING:
     from .entity_platform import EntityPlatform
@@ -49,6 +53,7 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 SLOW_UPDATE_WARNING = 10
 DATA_ENTITY_SOURCE = "entity_info"
+DATA_COALESCED_STATE_WRITES = "coalesced_state_writes"
 SOURCE_CONFIG_ENTRY = "config_entry"
 SOURCE_PLATFORM_CONFIG = "platform_config"
 
@@ -268,6 +273,18 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _platform_state = EntityPlatformState.NOT_ADDED
 
+    # Name of the device the entity belongs to, cleared when the entity
+    # or device registry entry is updated
+    _cached_device_name: str | None | UndefinedType = UNDEFINED
+    _unsub_device_updates: CALLBACK_TYPE | None = None
+
+    # Minimum time between state writes, set by the EntityPlatform
+    _platform_state_write_interval: timedelta | None = None
+
+    # Loop time of the last coalesced state write and the pending write
+    _state_write_time: float | None = None
+    _state_write_timer: asyncio.TimerHandle | None = None
+
     # Entity Properties
     _attr_assumed_state: bool = False
     _attr_attribution: str | None = None
@@ -287,6 +304,7 @@ class Entity(ABC):
     _attr_name: str | None
     _attr_should_poll: bool = True
     _attr_state: StateType = STATE_UNKNOWN
+    _attr_state_write_interval: timedelta | None
     _attr_supported_features: int | None = None
     _attr_translation_key: str | None
     _attr_unique_id: str | None = None
@@ -443,6 +461,19 @@ class Entity(ABC):
             return self.entity_description.force_update
         return False
 
+    @property
+    def state_write_interval(self) -> timedelta | None:
+        """Return the minimum time between two state writes.
+
+        If set, calls to async_write_ha_state within the interval after a
+        write are coalesced into a single write of the latest state at the
+        end of the interval. Defaults to the STATE_WRITE_INTERVAL of the
+        entity platform.
+        """
+        if hasattr(self, "_attr_state_write_interval"):
+            return self._attr_state_write_interval
+        return self._platform_state_write_interval
+
     @property
     def supported_features(self) -> int | None:
         """Flag supported features."""
@@ -556,8 +587,51 @@ class Entity(ABC):
                 f"No entity id specified for entity {self.name}"
             )
 
+        if (
+            interval := self.state_write_interval
+        ) is not None and self._async_coalesce_state_write(interval):
+            return
+
+        self._async_write_ha_state()
+
+    @callback
+    def _async_coalesce_state_write(self, interval: timedelta) -> bool:
+        """Coalesce a state write with the other writes of the interval.
+
+        Returns True if the write is deferred to the end of the interval.
+        """
+        if self._state_write_timer is None:
+            loop = self.hass.loop
+            now = loop.time()
+            if self._state_write_time is None or now >= (
+                write_at := self._state_write_time + interval.total_seconds()
+            ):
+                self._state_write_time = now
+                return False
+            self._state_write_timer = loop.call_at(
+                write_at, self._async_write_coalesced_state
+            )
+
+        coalesced: Counter[str] = self.hass.data.setdefault(
+            DATA_COALESCED_STATE_WRITES, Counter()
+        )
+        coalesced[self.entity_id] += 1
+        return True
+
+    @callback
+    def _async_write_coalesced_state(self) -> None:
+        """Write the latest state at the end of the coalescing interval."""
+        self._state_write_timer = None
+        self._state_write_time = self.hass.loop.time()
         self._async_write_ha_state()
 
+    @callback
+    def _async_cancel_coalesced_state_write(self) -> None:
+        """Cancel the pending coalesced state write."""
+        if self._state_write_timer is not None:
+            self._state_write_timer.cancel()
+            self._state_write_timer = None
+
     def _stringify_state(self, available: bool) -> str:
         """Convert state to string."""
         if not available:
@@ -624,26 +698,9 @@ class Entity(ABC):
         if (icon := (entry and entry.icon) or self.icon) is not None:
             attr[ATTR_ICON] = icon
 
-        def friendly_name() -> str | None:
-            """Return the friendly name.
-
-            If has_entity_name is False, this returns self.name
-            If has_entity_name is True, this returns device.name + self.name
-            """
-            if not self.has_entity_name or not self.registry_entry:
-                return self.name
-
-            device_registry = dr.async_get(self.hass)
-            if not (device_id := self.registry_entry.device_id) or not (
-                device_entry := device_registry.async_get(device_id)
-            ):
-                return self.name
-
-            if not self.name:
-                return device_entry.name_by_user or device_entry.name
-            return f"{device_entry.name_by_user or device_entry.name} {self.name}"
-
-        if (name := (entry and entry.name) or friendly_name()) is not None:
+        if (
+            name := (entry and entry.name) or self._friendly_name_internal()
+        ) is not None:
             attr[ATTR_FRIENDLY_NAME] = name
 
         if (supported_features := self.supported_features) is not None:
@@ -666,6 +723,16 @@ class Entity(ABC):
         if DATA_CUSTOMIZE in self.hass.data:
             attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
 
+        force_update = self.force_update
+        if (
+            not force_update
+            and (current := self.hass.states.get(self.entity_id)) is not None
+            and current.state == state
+            and current.attributes == attr
+        ):
+            # Nothing changed, the state machine would discard the write
+            return
+
         if (
             self._context_set is not None
             and dt_util.utcnow() - self._context_set > self.context_recent_time
@@ -674,9 +741,37 @@ class Entity(ABC):
             self._context_set = None
 
         self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update, self._context
+            self.entity_id, state, attr, force_update, self._context
         )
 
+    def _friendly_name_internal(self) -> str | None:
+        """Return the friendly name.
+
+        If has_entity_name is False, this returns self.name
+        If has_entity_name is True, this returns device.name + self.name
+        """
+        if not self.has_entity_name or not self.registry_entry:
+            return self.name
+
+        if (device_name := self._cached_device_name) is UNDEFINED:
+            device_name = self._cached_device_name = self._device_name_internal()
+
+        if device_name is None:
+            return self.name
+        if not self.name:
+            return device_name
+        return f"{device_name} {self.name}"
+
+    def _device_name_internal(self) -> str | None:
+        """Return the name of the device the entity belongs to."""
+        assert self.registry_entry is not None
+        device_registry = dr.async_get(self.hass)
+        if not (device_id := self.registry_entry.device_id) or not (
+            device_entry := device_registry.async_get(device_id)
+        ):
+            return None
+        return device_entry.name_by_user or device_entry.name
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -785,6 +880,7 @@ class Entity(ABC):
         self.hass = hass
         self.platform = platform
         self.parallel_updates = parallel_updates
+        self._platform_state_write_interval = platform.state_write_interval
         self._platform_state = EntityPlatformState.ADDED
 
     def _call_on_remove_callbacks(self) -> None:
@@ -800,10 +896,12 @@ class Entity(ABC):
 
         self._platform_state = EntityPlatformState.NOT_ADDED
         self._call_on_remove_callbacks()
+        self._async_cancel_coalesced_state_write()
 
         self.hass = None  # type: ignore[assignment]
         self.platform = None
         self.parallel_updates = None
+        self._platform_state_write_interval = None
 
     async def add_to_platform_finish(self) -> None:
         """Finish adding an entity to a platform."""
@@ -829,6 +927,7 @@ class Entity(ABC):
         self._platform_state = EntityPlatformState.REMOVED
 
         self._call_on_remove_callbacks()
+        self._async_cancel_coalesced_state_write()
 
         await self.async_internal_will_remove_from_hass()
         await self.async_will_remove_from_hass()
@@ -893,6 +992,7 @@ class Entity(ABC):
                     self.hass, self.entity_id, self._async_registry_updated
                 )
             )
+            self._async_subscribe_device_updates()
 
     async def async_internal_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass.
@@ -901,6 +1001,37 @@ class Entity(ABC):
         """
         if self.platform:
             self.hass.data[DATA_ENTITY_SOURCE].pop(self.entity_id)
+        self._async_unsubscribe_device_updates()
+
+    @callback
+    def _async_subscribe_device_updates(self) -> None:
+        """Subscribe to updates of the device the entity belongs to."""
+        self._async_unsubscribe_device_updates()
+        self._cached_device_name = UNDEFINED
+        if self.registry_entry is None or not (
+            device_id := self.registry_entry.device_id
+        ):
+            return
+        self._unsub_device_updates = async_track_device_registry_updated_event(
+            self.hass, device_id, self._async_device_registry_updated
+        )
+
+    @callback
+    def _async_unsubscribe_device_updates(self) -> None:
+        """Unsubscribe from updates of the device the entity belongs to."""
+        if self._unsub_device_updates is not None:
+            self._unsub_device_updates()
+            self._unsub_device_updates = None
+
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        """Handle device registry update."""
+        self._cached_device_name = UNDEFINED
+        if event.data["action"] != "update" or not self.has_entity_name:
+            return
+        changes = event.data["changes"]
+        if "name" in changes or "name_by_user" in changes:
+            self.async_write_ha_state()
 
     async def _async_registry_updated(self, event: Event) -> None:
         """Handle entity registry update."""
@@ -923,6 +1054,11 @@ class Entity(ABC):
             return
 
         assert old is not None
+        if self.registry_entry.device_id != old.device_id:
+            self._async_subscribe_device_updates()
+        else:
+            self._cached_device_name = UNDEFINED
+
         if self.registry_entry.entity_id == old.entity_id:
             self.async_registry_entry_updated()
             self.async_write_ha_state()
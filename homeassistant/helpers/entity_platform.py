@@ -134,6 +134,11 @@ class EntityPlatform:
         self._process_updates: asyncio.Lock | None = None
 
         self.parallel_updates: asyncio.Semaphore | None = None
+        # Minimum time between state writes of the entities, see
+        # Entity.state_write_interval
+        self.state_write_interval: timedelta | None = getattr(
+            platform, "STATE_WRITE_INTERVAL", None
+        )
 
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
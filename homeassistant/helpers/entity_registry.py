@@ -49,6 +49,7 @@ from . import device_registry as dr, storage
 from .device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from .frame import report
 from .json import JSON_DUMP, find_paths_unserializable_data
+from .registry import RegistryIndexType, index_entry, reindex_entry, unindex_entry
 from .typing import UNDEFINED, UndefinedType
 
 if TYPE_CHECKING:
@@ -372,9 +373,12 @@ class EntityRegistryStore(storage.Store[dict[str, list[dict[str, Any]]]]):
 class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
     """Container for entity registry items, maps entity_id -> entry.
 
-    Maintains two additional indexes:
+    Maintains additional indexes:
     - id -> entry
     - (domain, platform, unique_id) -> entity_id
+    - device_id -> entity_ids
+    - area_id -> entity_ids
+    - config_entry_id -> entity_ids
     """
 
     def __init__(self) -> None:
@@ -382,6 +386,9 @@ class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
         super().__init__()
         self._entry_ids: dict[str, RegistryEntry] = {}
         self._index: dict[tuple[str, str, str], str] = {}
+        self._device_id_index: RegistryIndexType = {}
+        self._area_id_index: RegistryIndexType = {}
+        self._config_entry_id_index: RegistryIndexType = {}
 
     def values(self) -> ValuesView[RegistryEntry]:
         """Return the underlying values to avoid __iter__ overhead."""
@@ -393,6 +400,22 @@ class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
             old_entry = self[key]
             del self._entry_ids[old_entry.id]
             del self._index[(old_entry.domain, old_entry.platform, old_entry.unique_id)]
+            reindex_entry(
+                self._device_id_index, key, (old_entry.device_id,), (entry.device_id,)
+            )
+            reindex_entry(
+                self._area_id_index, key, (old_entry.area_id,), (entry.area_id,)
+            )
+            reindex_entry(
+                self._config_entry_id_index,
+                key,
+                (old_entry.config_entry_id,),
+                (entry.config_entry_id,),
+            )
+        else:
+            index_entry(self._device_id_index, key, (entry.device_id,))
+            index_entry(self._area_id_index, key, (entry.area_id,))
+            index_entry(self._config_entry_id_index, key, (entry.config_entry_id,))
         super().__setitem__(key, entry)
         self._entry_ids[entry.id] = entry
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
@@ -402,6 +425,9 @@ class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
         entry = self[key]
         del self._entry_ids[entry.id]
         del self._index[(entry.domain, entry.platform, entry.unique_id)]
+        unindex_entry(self._device_id_index, key, (entry.device_id,))
+        unindex_entry(self._area_id_index, key, (entry.area_id,))
+        unindex_entry(self._config_entry_id_index, key, (entry.config_entry_id,))
         super().__delitem__(key)
 
     def get_entity_id(self, key: tuple[str, str, str]) -> str | None:
@@ -412,6 +438,23 @@ class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
         """Get entry from id."""
         return self._entry_ids.get(key)
 
+    def get_entries_for_device_id(self, device_id: str) -> list[RegistryEntry]:
+        """Get entries for device."""
+        return [self.data[key] for key in self._device_id_index.get(device_id, ())]
+
+    def get_entries_for_area_id(self, area_id: str) -> list[RegistryEntry]:
+        """Get entries for area."""
+        return [self.data[key] for key in self._area_id_index.get(area_id, ())]
+
+    def get_entries_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> list[RegistryEntry]:
+        """Get entries for config entry."""
+        return [
+            self.data[key]
+            for key in self._config_entry_id_index.get(config_entry_id, ())
+        ]
+
 
 class EntityRegistry:
     """Class to hold a registry of entities."""
@@ -427,7 +470,10 @@ class EntityRegistry:
             STORAGE_KEY,
             atomic_writes=True,
             minor_version=STORAGE_VERSION_MINOR,
+            journal=True,
         )
+        # The stored data of each entry, reused while the entry is unchanged
+        self._entry_data: dict[str, tuple[RegistryEntry, dict[str, Any]]] = {}
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_modified
         )
@@ -994,34 +1040,42 @@ class EntityRegistry:
         """Return data of entity registry to store in a file."""
         data: dict[str, Any] = {}
 
-        data["entities"] = [
-            {
-                "aliases": list(entry.aliases),
-                "area_id": entry.area_id,
-                "capabilities": entry.capabilities,
-                "config_entry_id": entry.config_entry_id,
-                "device_class": entry.device_class,
-                "device_id": entry.device_id,
-                "disabled_by": entry.disabled_by,
-                "entity_category": entry.entity_category,
-                "entity_id": entry.entity_id,
-                "hidden_by": entry.hidden_by,
-                "icon": entry.icon,
-                "id": entry.id,
-                "has_entity_name": entry.has_entity_name,
-                "name": entry.name,
-                "options": entry.options,
-                "original_device_class": entry.original_device_class,
-                "original_icon": entry.original_icon,
-                "original_name": entry.original_name,
-                "platform": entry.platform,
-                "supported_features": entry.supported_features,
-                "translation_key": entry.translation_key,
-                "unique_id": entry.unique_id,
-                "unit_of_measurement": entry.unit_of_measurement,
-            }
-            for entry in self.entities.values()
-        ]
+        entry_data_cache = self._entry_data
+        self._entry_data = {}
+        entities: list[dict[str, Any]] = []
+        for entry in self.entities.values():
+            cached = entry_data_cache.get(entry.id)
+            if cached is not None and cached[0] is entry:
+                entry_data = cached[1]
+            else:
+                entry_data = {
+                    "aliases": list(entry.aliases),
+                    "area_id": entry.area_id,
+                    "capabilities": entry.capabilities,
+                    "config_entry_id": entry.config_entry_id,
+                    "device_class": entry.device_class,
+                    "device_id": entry.device_id,
+                    "disabled_by": entry.disabled_by,
+                    "entity_category": entry.entity_category,
+                    "entity_id": entry.entity_id,
+                    "hidden_by": entry.hidden_by,
+                    "icon": entry.icon,
+                    "id": entry.id,
+                    "has_entity_name": entry.has_entity_name,
+                    "name": entry.name,
+                    "options": entry.options,
+                    "original_device_class": entry.original_device_class,
+                    "original_icon": entry.original_icon,
+                    "original_name": entry.original_name,
+                    "platform": entry.platform,
+                    "supported_features": entry.supported_features,
+                    "translation_key": entry.translation_key,
+                    "unique_id": entry.unique_id,
+                    "unit_of_measurement": entry.unit_of_measurement,
+                }
+            self._entry_data[entry.id] = (entry, entry_data)
+            entities.append(entry_data)
+        data["entities"] = entities
 
         return data
 
@@ -1074,12 +1128,10 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str, include_disabled_entities: bool = False
 ) -> list[RegistryEntry]:
     """Return entries that match a device."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.device_id == device_id
-        and (not entry.disabled_by or include_disabled_entities)
-    ]
+    entries = registry.entities.get_entries_for_device_id(device_id)
+    if include_disabled_entities:
+        return entries
+    return [entry for entry in entries if not entry.disabled_by]
 
 
 @callback
@@ -1087,7 +1139,7 @@ def async_entries_for_area(
     registry: EntityRegistry, area_id: str
 ) -> list[RegistryEntry]:
     """Return entries that match an area."""
-    return [entry for entry in registry.entities.values() if entry.area_id == area_id]
+    return registry.entities.get_entries_for_area_id(area_id)
 
 
 @callback
@@ -1095,11 +1147,7 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> list[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    return registry.entities.get_entries_for_config_entry_id(config_entry_id)
 
 
 @callback
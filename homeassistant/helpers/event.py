@@ -36,6 +36,7 @@ from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+from .device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from .entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from .ratelimit import KeyedRateLimit
 from .sun import get_astral_event_next
@@ -45,15 +46,23 @@ from .typing import TemplateVarsType
 TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
 TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
 
+TRACK_STATE_CHANGE_DOMAIN_CALLBACKS = "track_state_change_domain_callbacks"
+TRACK_STATE_CHANGE_DOMAIN_LISTENER = "track_state_change_domain_listener"
+
 TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
 TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
 
 TRACK_STATE_REMOVED_DOMAIN_CALLBACKS = "track_state_removed_domain_callbacks"
 TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 
+TRACK_TEMPLATE_RESULT_INFOS = "track_template_result_infos"
+
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS = "track_device_registry_updated_callbacks"
+TRACK_DEVICE_REGISTRY_UPDATED_LISTENER = "track_device_registry_updated_listener"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -94,6 +103,29 @@ class TrackTemplate:
     rate_limit: timedelta | None = None
 
 
+@dataclass
+class TemplateRenderStats:
+    """Class for the render counters of a tracked template.
+
+    renders
+        The number of times the template was rendered.
+    render_time
+        The total time spent rendering the template in seconds.
+    max_render_time
+        The longest time a single render of the template took in seconds.
+    """
+
+    renders: int = 0
+    render_time: float = 0.0
+    max_render_time: float = 0.0
+
+    def add_render(self, render_time: float) -> None:
+        """Count a render that took render_time seconds."""
+        self.renders += 1
+        self.render_time += render_time
+        self.max_render_time = max(self.max_render_time, render_time)
+
+
 @dataclass
 class TrackTemplateResult:
     """Class for result of template tracking.
@@ -412,6 +444,74 @@ def async_track_entity_registry_updated_event(
     return remove_listener
 
 
+@bind_hass
+def async_track_device_registry_updated_event(
+    hass: HomeAssistant,
+    device_ids: str | Iterable[str],
+    action: Callable[[Event], Any],
+) -> CALLBACK_TYPE:
+    """Track specific device registry updated events indexed by device_id.
+
+    Similar to async_track_entity_registry_updated_event.
+    """
+    if not device_ids:
+        return _remove_empty_listener
+    if isinstance(device_ids, str):
+        device_ids = [device_ids]
+
+    device_callbacks: dict[str, list[HassJob[[Event], Any]]] = hass.data.setdefault(
+        TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS, {}
+    )
+
+    if TRACK_DEVICE_REGISTRY_UPDATED_LISTENER not in hass.data:
+
+        @callback
+        def _async_device_registry_updated_filter(event: Event) -> bool:
+            """Filter device registry updates by device_id."""
+            return event.data["device_id"] in device_callbacks
+
+        @callback
+        def _async_device_registry_updated_dispatcher(event: Event) -> None:
+            """Dispatch device registry updates by device_id."""
+            device_id = event.data["device_id"]
+
+            if device_id not in device_callbacks:
+                return
+
+            for job in device_callbacks[device_id][:]:
+                try:
+                    hass.async_run_hass_job(job, event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing device registry update for %s",
+                        device_id,
+                    )
+
+        hass.data[TRACK_DEVICE_REGISTRY_UPDATED_LISTENER] = hass.bus.async_listen(
+            EVENT_DEVICE_REGISTRY_UPDATED,
+            _async_device_registry_updated_dispatcher,
+            event_filter=_async_device_registry_updated_filter,
+        )
+
+    job = HassJob(action, f"track device registry updated event {device_ids}")
+
+    for device_id in device_ids:
+        device_callbacks.setdefault(device_id, []).append(job)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove device registry update listener."""
+        _async_remove_indexed_listeners(
+            hass,
+            TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS,
+            TRACK_DEVICE_REGISTRY_UPDATED_LISTENER,
+            device_ids,
+            job,
+        )
+
+    return remove_listener
+
+
 @callback
 def _async_domain_has_listeners(
     domain: str, callbacks: dict[str, list[HassJob[[Event], Any]]]
@@ -435,6 +535,60 @@ def _async_dispatch_domain_event(
             )
 
 
+@bind_hass
+def _async_track_state_change_domain_event(
+    hass: HomeAssistant,
+    domains: Iterable[str],
+    action: Callable[[Event], Any],
+) -> CALLBACK_TYPE:
+    """Track all state change events of the entities in domains indexed by domain.
+
+    MATCH_ALL as domain tracks the state change events of all entities.
+    The domains must already be lowercase.
+    """
+    domain_callbacks: dict[str, list[HassJob[[Event], Any]]] = hass.data.setdefault(
+        TRACK_STATE_CHANGE_DOMAIN_CALLBACKS, {}
+    )
+
+    if TRACK_STATE_CHANGE_DOMAIN_LISTENER not in hass.data:
+
+        @callback
+        def _async_state_change_filter(event: Event) -> bool:
+            """Filter state changes by domain."""
+            return _async_domain_has_listeners(
+                split_entity_id(event.data["entity_id"])[0], domain_callbacks
+            )
+
+        @callback
+        def _async_state_change_dispatcher(event: Event) -> None:
+            """Dispatch state changes by domain."""
+            _async_dispatch_domain_event(hass, event, domain_callbacks)
+
+        hass.data[TRACK_STATE_CHANGE_DOMAIN_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            _async_state_change_dispatcher,
+            event_filter=_async_state_change_filter,
+        )
+
+    job = HassJob(action, f"track state change domain event {domains}")
+
+    for domain in domains:
+        domain_callbacks.setdefault(domain, []).append(job)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove state change listener."""
+        _async_remove_indexed_listeners(
+            hass,
+            TRACK_STATE_CHANGE_DOMAIN_CALLBACKS,
+            TRACK_STATE_CHANGE_DOMAIN_LISTENER,
+            domains,
+            job,
+        )
+
+    return remove_listener
+
+
 @bind_hass
 def async_track_state_added_domain(
     hass: HomeAssistant,
@@ -559,7 +713,13 @@ def _async_string_to_lower_list(instr: str | Iterable[str]) -> list[str]:
 
 
 class _TrackStateChangeFiltered:
-    """Handle removal / refresh of tracker."""
+    """Handle removal / refresh of tracker.
+
+    The listeners are added to the shared indexes of the state change
+    dispatchers, by entity_id for the entities and by domain for the
+    domains and all states, so a state change is only dispatched to
+    the trackers that depend on it.
+    """
 
     def __init__(
         self,
@@ -570,9 +730,6 @@ class _TrackStateChangeFiltered:
         """Handle removal / refresh of tracker init."""
         self.hass = hass
         self._action = action
-        self._action_as_hassjob = HassJob(
-            action, f"track state change filtered {track_states}"
-        )
         self._listeners: dict[str, Callable[[], None]] = {}
         self._last_track_states: TrackStates = track_states
 
@@ -657,8 +814,13 @@ class _TrackStateChangeFiltered:
     @callback
     def _setup_entities_listener(self, domains: set[str], entities: set[str]) -> None:
         if domains:
-            entities = entities.copy()
-            entities.update(self.hass.states.async_entity_ids(domains))
+            # The state changes of these entities are
+            # already dispatched by the domains listener
+            entities = {
+                entity_id
+                for entity_id in entities
+                if split_entity_id(entity_id)[0] not in domains
+            }
 
         # Entities has changed to none
         if not entities:
@@ -668,27 +830,19 @@ class _TrackStateChangeFiltered:
             self.hass, entities, self._action
         )
 
-    @callback
-    def _state_added(self, event: Event) -> None:
-        self._cancel_listener(_ENTITIES_LISTENER)
-        self._setup_entities_listener(
-            self._last_track_states.domains, self._last_track_states.entities
-        )
-        self.hass.async_run_hass_job(self._action_as_hassjob, event)
-
     @callback
     def _setup_domains_listener(self, domains: set[str]) -> None:
         if not domains:
             return
 
-        self._listeners[_DOMAINS_LISTENER] = _async_track_state_added_domain(
-            self.hass, domains, self._state_added
+        self._listeners[_DOMAINS_LISTENER] = _async_track_state_change_domain_event(
+            self.hass, domains, self._action
         )
 
     @callback
     def _setup_all_listener(self) -> None:
-        self._listeners[_ALL_LISTENER] = self.hass.bus.async_listen(
-            EVENT_STATE_CHANGED, self._action
+        self._listeners[_ALL_LISTENER] = _async_track_state_change_domain_event(
+            self.hass, (MATCH_ALL,), self._action
         )
 
 
@@ -835,6 +989,7 @@ class TrackTemplateResultInfo:
 
         self._rate_limit = KeyedRateLimit(hass)
         self._info: dict[Template, RenderInfo] = {}
+        self._render_stats: dict[Template, TemplateRenderStats] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
 
@@ -851,8 +1006,8 @@ class TrackTemplateResultInfo:
         if super_template is not None:
             template = super_template.template
             variables = super_template.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict
+            self._info[template] = info = self._async_render_to_info(
+                template, variables, strict
             )
 
             # If the super template did not render to True, don't update other templates
@@ -872,8 +1027,8 @@ class TrackTemplateResultInfo:
                 continue
             template = track_template_.template
             variables = track_template_.variables
-            self._info[template] = info = template.async_render_to_info(
-                variables, strict=strict
+            self._info[template] = info = self._async_render_to_info(
+                template, variables, strict
             )
 
             if info.exception:
@@ -889,6 +1044,7 @@ class TrackTemplateResultInfo:
             self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
         )
         self._update_time_listeners()
+        self.hass.data.setdefault(TRACK_TEMPLATE_RESULT_INFOS, set()).add(self)
         _LOGGER.debug(
             (
                 "Template group %s listens for %s, first render blocker by super"
@@ -908,6 +1064,23 @@ class TrackTemplateResultInfo:
             "time": bool(self._time_listeners),
         }
 
+    @property
+    def render_stats(self) -> dict[Template, TemplateRenderStats]:
+        """Render counters of the tracked templates."""
+        return self._render_stats
+
+    @callback
+    def _async_render_to_info(
+        self, template: Template, variables: TemplateVarsType, strict: bool = False
+    ) -> RenderInfo:
+        """Render the template to info and count the render."""
+        start = time.perf_counter()
+        info = template.async_render_to_info(variables, strict=strict)
+        if (stats := self._render_stats.get(template)) is None:
+            stats = self._render_stats[template] = TemplateRenderStats()
+        stats.add_render(time.perf_counter() - start)
+        return info
+
     @callback
     def _setup_time_listener(self, template: Template, has_time: bool) -> None:
         if not has_time:
@@ -944,6 +1117,7 @@ class TrackTemplateResultInfo:
         assert self._track_state_changes
         self._track_state_changes.async_remove()
         self._rate_limit.async_remove()
+        self.hass.data[TRACK_TEMPLATE_RESULT_INFOS].discard(self)
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
 
@@ -996,8 +1170,8 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
+        self._info[template] = info = self._async_render_to_info(
+            template, track_template_.variables
         )
 
         try:
@@ -1133,6 +1307,28 @@ class TrackTemplateResultInfo:
         self.hass.async_run_hass_job(self._job, event, updates)
 
 
+@callback
+def async_get_template_render_stats(
+    hass: HomeAssistant,
+) -> list[tuple[Template, TemplateRenderStats]]:
+    """Return the render counters of all tracked templates.
+
+    The slowest templates, by total render time, are returned first.
+    """
+    infos: set[TrackTemplateResultInfo] = hass.data.get(
+        TRACK_TEMPLATE_RESULT_INFOS, set()
+    )
+    return sorted(
+        (
+            (template, stats)
+            for info in infos
+            for template, stats in info.render_stats.items()
+        ),
+        key=lambda template_stats: template_stats[1].render_time,
+        reverse=True,
+    )
+
+
 TrackTemplateResultListener = Callable[
     [
         Event | None,
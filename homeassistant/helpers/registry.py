@@ -0,0 +1,46 @@
+"""Provide helpers to maintain the secondary indexes of the registries."""
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable
+from typing import Literal
+
+# Maps an indexed value, like an area id, to the keys of the registry entries
+# with that value. The inner dict is an ordered set of the keys.
+RegistryIndexType = dict[str, dict[str, Literal[True]]]
+
+
+def index_entry(
+    index: RegistryIndexType, key: str, values: Iterable[str | None]
+) -> None:
+    """Add the key of an entry to the index for each of its values."""
+    for value in values:
+        if value is not None:
+            index.setdefault(value, {})[key] = True
+
+
+def unindex_entry(
+    index: RegistryIndexType, key: str, values: Iterable[str | None]
+) -> None:
+    """Remove the key of an entry from the index for each of its values."""
+    for value in values:
+        if value is None or (keys := index.get(value)) is None:
+            continue
+        keys.pop(key, None)
+        if not keys:
+            del index[value]
+
+
+def reindex_entry(
+    index: RegistryIndexType,
+    key: str,
+    old_values: Collection[str | None],
+    new_values: Collection[str | None],
+) -> None:
+    """Update the index for an entry whose values changed.
+
+    Values that did not change keep the position of the entry in the index.
+    """
+    unindex_entry(
+        index, key, [value for value in old_values if value not in new_values]
+    )
+    index_entry(index, key, new_values)
@@ -27,6 +27,9 @@ _LOGGER = logging.getLogger(__name__)
 
 STORAGE_KEY = "core.restore_state"
 STORAGE_VERSION = 1
+# Minor version 2 writes changes to a journal and refreshes last_seen daily.
+# The journal is compacted at stop, so older versions read all the states.
+STORAGE_MINOR_VERSION = 2
 
 # How long between periodically saving the current states to disk
 STATE_DUMP_INTERVAL = timedelta(minutes=15)
@@ -34,6 +37,11 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How long the last_seen time of an unchanged state is kept before it is
+# refreshed. Stored states are only expired after STATE_EXPIRATION plus
+# this interval to account for the older last_seen times.
+LAST_SEEN_REFRESH_INTERVAL = timedelta(days=1)
+
 
 class ExtraStoredData(ABC):
     """Object to hold extra stored data."""
@@ -96,6 +104,23 @@ class StoredState:
         )
 
 
+class RestoreStateStore(Store[list[dict[str, Any]]]):
+    """Store the stored states."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Migrate to the new version."""
+        if old_major_version > 1:
+            raise NotImplementedError
+        # The stored states are unchanged, the minor version only
+        # tells older versions the data can be read as before
+        return old_data
+
+
 class RestoreStateData:
     """Helper class for managing the helper saved data."""
 
@@ -113,14 +138,12 @@ class RestoreStateData:
 
         if stored_states is None:
             _LOGGER.debug("Not creating cache - no saved states found")
-            data.last_states = {}
         else:
-            data.last_states = {
-                item["state"]["entity_id"]: StoredState.from_dict(item)
-                for item in stored_states
-                if valid_entity_id(item["state"]["entity_id"])
+            # The stored states are decoded when they are restored
+            data.last_states_data = {
+                item["state"]["entity_id"]: item for item in stored_states
             }
-            _LOGGER.debug("Created cache with %s", list(data.last_states))
+            _LOGGER.debug("Created cache with %s", list(data.last_states_data))
 
         async def hass_start(hass: HomeAssistant) -> None:
             """Start the restore state task."""
@@ -139,12 +162,47 @@ class RestoreStateData:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the restore state data class."""
         self.hass: HomeAssistant = hass
-        self.store = Store[list[dict[str, Any]]](
-            hass, STORAGE_VERSION, STORAGE_KEY, encoder=JSONEncoder
+        self.store = RestoreStateStore(
+            hass,
+            STORAGE_VERSION,
+            STORAGE_KEY,
+            encoder=JSONEncoder,
+            minor_version=STORAGE_MINOR_VERSION,
+            journal=True,
         )
         self.last_states: dict[str, StoredState] = {}
+        # Stored states of the previous run which have not been decoded yet
+        self.last_states_data: dict[str, dict[str, Any]] = {}
+        # Data written by the last dump, reused for unchanged states
+        self._dumped_data: dict[str, dict[str, Any]] = {}
         self.entities: dict[str, RestoreEntity] = {}
 
+    @callback
+    def async_get_last_stored_state(self, entity_id: str) -> StoredState | None:
+        """Get the stored state of an entity from the previous run."""
+        if (stored_state := self.last_states.get(entity_id)) is not None:
+            return stored_state
+        if (item := self.last_states_data.pop(entity_id, None)) is None:
+            return None
+        if not valid_entity_id(entity_id):
+            return None
+        try:
+            stored_state = StoredState.from_dict(item)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.error("Error restoring the stored state of %s: %s", entity_id, err)
+            return None
+        self.last_states[entity_id] = stored_state
+        return stored_state
+
+    @callback
+    def _async_current_entity_ids(self, all_states: list[State]) -> set[str]:
+        """Return the ids of the entities currently backed by an entity object."""
+        return {
+            state.entity_id
+            for state in all_states
+            if not state.attributes.get(ATTR_RESTORED)
+        }
+
     @callback
     def async_get_stored_states(self) -> list[StoredState]:
         """Get the set of states which should be stored.
@@ -155,12 +213,7 @@ class RestoreStateData:
         """
         now = dt_util.utcnow()
         all_states = self.hass.states.async_all()
-        # Entities currently backed by an entity object
-        current_entity_ids = {
-            state.entity_id
-            for state in all_states
-            if not state.attributes.get(ATTR_RESTORED)
-        }
+        current_entity_ids = self._async_current_entity_ids(all_states)
 
         # Start with the currently registered states
         stored_states = [
@@ -172,7 +225,7 @@ class RestoreStateData:
             # Ignore all states that are entity registry placeholders
             not state.attributes.get(ATTR_RESTORED)
         ]
-        expiration_time = now - STATE_EXPIRATION
+        expiration_time = now - STATE_EXPIRATION - LAST_SEEN_REFRESH_INTERVAL
 
         for entity_id, stored_state in self.last_states.items():
             # Don't save old states that have entities in the current run
@@ -189,16 +242,65 @@ class RestoreStateData:
 
         return stored_states
 
+    @callback
+    def async_get_stored_data(self) -> dict[str, dict[str, Any]]:
+        """Get the data of the states which should be stored by entity_id.
+
+        The data written by the last dump is reused for states that did not
+        change, so the store only appends the changed states to its journal.
+        The last_seen time of those states is refreshed once per
+        LAST_SEEN_REFRESH_INTERVAL.
+        """
+        now = dt_util.utcnow()
+        last_seen_refresh_time = now - LAST_SEEN_REFRESH_INTERVAL
+        dumped_data = self._dumped_data
+        stored_data: dict[str, dict[str, Any]] = {}
+
+        for stored_state in self.async_get_stored_states():
+            entity_id = stored_state.state.entity_id
+            item = stored_state.as_dict()
+            if (
+                (dumped := dumped_data.get(entity_id)) is not None
+                and dumped["state"] == item["state"]
+                and dumped["extra_data"] == item["extra_data"]
+                and isinstance(dumped_last_seen := dumped["last_seen"], datetime)
+                and (
+                    dumped_last_seen == item["last_seen"]
+                    or dumped_last_seen > last_seen_refresh_time
+                )
+            ):
+                item = dumped
+            stored_data[entity_id] = item
+
+        if self.last_states_data:
+            # Stored states of the previous run which were not restored
+            # are written back as they were loaded
+            current_entity_ids = self._async_current_entity_ids(
+                self.hass.states.async_all()
+            )
+            expiration_time = now - STATE_EXPIRATION - LAST_SEEN_REFRESH_INTERVAL
+            for entity_id, item in self.last_states_data.items():
+                if (
+                    entity_id in current_entity_ids
+                    or entity_id in stored_data
+                    or not valid_entity_id(entity_id)
+                ):
+                    continue
+                last_seen = item.get("last_seen")
+                if isinstance(last_seen, str):
+                    last_seen = dt_util.parse_datetime(last_seen)
+                if last_seen is None or last_seen < expiration_time:
+                    continue
+                stored_data[entity_id] = item
+
+        self._dumped_data = stored_data
+        return stored_data
+
     async def async_dump_states(self) -> None:
         """Save the current state machine to storage."""
         _LOGGER.debug("Dumping states")
         try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
-            )
+            await self.store.async_save(list(self.async_get_stored_data().values()))
         except HomeAssistantError as exc:
             _LOGGER.error("Error saving current states", exc_info=exc)
 
@@ -308,9 +410,7 @@ class RestoreEntity(Entity):
             )
             return None
         data = await RestoreStateData.async_get_instance(self.hass)
-        if self.entity_id not in data.last_states:
-            return None
-        return data.last_states[self.entity_id]
+        return data.async_get_last_stored_state(self.entity_id)
 
     async def async_get_last_state(self) -> State | None:
         """Get the entity state from the previous run."""
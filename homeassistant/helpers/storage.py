@@ -6,15 +6,17 @@ from collections.abc import Callable, Mapping, Sequence
 from contextlib import suppress
 from copy import deepcopy
 import inspect
+import json
 from json import JSONEncoder
 import logging
+import operator
 import os
 from typing import Any, Generic, TypeVar
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import CALLBACK_TYPE, CoreState, Event, HomeAssistant, callback
 from homeassistant.loader import MAX_LOAD_CONCURRENTLY, bind_hass
-from homeassistant.util import json as json_util
+from homeassistant.util import json as json_util, ulid as ulid_util
 from homeassistant.util.file import WriteError
 
 from . import json as json_helper
@@ -27,6 +29,10 @@ _LOGGER = logging.getLogger(__name__)
 
 STORAGE_SEMAPHORE = "storage_semaphore"
 
+# The journal is compacted into the data file when it grows
+# larger than this fraction of the size of the data file
+JOURNAL_COMPACT_RATIO = 0.5
+
 _T = TypeVar("_T", bound=Mapping[str, Any] | Sequence[Any])
 
 
@@ -84,8 +90,16 @@ class Store(Generic[_T]):
         atomic_writes: bool = False,
         encoder: type[JSONEncoder] | None = None,
         minor_version: int = 1,
+        journal: bool = False,
     ) -> None:
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        With journal enabled, changes to the data are appended to a journal
+        file next to the data file instead of rewriting the whole file. The
+        journal is compacted into the data file at the final write, so older
+        versions that do not read it get all changes. Saved data is compared
+        with the next save, so it must not be mutated.
+        """
         self.version = version
         self.minor_version = minor_version
         self.key = key
@@ -98,12 +112,23 @@ class Store(Generic[_T]):
         self._load_task: asyncio.Future[_T | None] | None = None
         self._encoder = encoder
         self._atomic_writes = atomic_writes
+        self._journal = journal
+        # The last data written, its size and the id linking the journal to it
+        self._journal_base: dict[str, Any] | None = None
+        self._journal_base_size = 0
+        self._journal_size = 0
+        self._journal_id: str | None = None
 
     @property
     def path(self):
         """Return the config path."""
         return self.hass.config.path(STORAGE_DIR, self.key)
 
+    @property
+    def journal_path(self) -> str:
+        """Return the path of the journal."""
+        return f"{self.path}.journal"
+
     async def async_load(self) -> _T | None:
         """Load data.
 
@@ -146,9 +171,7 @@ class Store(Generic[_T]):
             # and we don't want that to mess with what we're trying to store.
             data = deepcopy(data)
         else:
-            data = await self.hass.async_add_executor_job(
-                json_util.load_json, self.path
-            )
+            data = await self.hass.async_add_executor_job(self._load_data)
 
             if data == {}:
                 return None
@@ -262,6 +285,9 @@ class Store(Generic[_T]):
     async def _async_callback_final_write(self, _event: Event) -> None:
         """Handle a write because Home Assistant is in final write state."""
         self._unsub_final_write_listener = None
+        if self._data is None and self._journal_size:
+            # Rewrite the last data to compact the journal into the data file
+            self._data = self._journal_base
         await self._async_handle_write_data()
 
     async def _async_handle_write_data(self, *_args):
@@ -286,13 +312,56 @@ class Store(Generic[_T]):
             except (json_util.SerializationError, WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
 
+            if self._journal_size:
+                # Compact the journal at the final write
+                self._async_ensure_final_write_listener()
+
+    def _load_data(self) -> dict[str, Any]:
+        """Load the data file and apply the journal."""
+        data = json_util.load_json(self.path)
+        if not self._journal or not data:
+            return data
+        try:
+            with open(self.journal_path, "rb") as journal_file:
+                lines = journal_file.read().splitlines()
+        except FileNotFoundError:
+            return data
+        journal_id = data.get("journal_id")
+        try:
+            for line in lines:
+                if not line:
+                    continue
+                try:
+                    entry = json_util.json_loads(line)
+                except json_util.JSON_DECODE_EXCEPTIONS:
+                    # An entry that was not completely written
+                    _LOGGER.warning("Skipping invalid journal entry for %s", self.key)
+                    continue
+                if entry["id"] == journal_id:
+                    _apply_journal_ops(data["data"], entry["ops"])
+        except (KeyError, IndexError, TypeError) as err:
+            _LOGGER.error("Error applying journal for %s: %s", self.key, err)
+            return json_util.load_json(self.path)
+        return data
+
     async def _async_write_data(self, path: str, data: dict) -> None:
         await self.hass.async_add_executor_job(self._write_data, self.path, data)
 
     def _write_data(self, path: str, data: dict) -> None:
         """Write the data."""
+        if (
+            self._journal
+            # Compact the journal at the final write
+            and self.hass.state is not CoreState.final_write
+            and self._write_journal(data)
+        ):
+            return
+
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
+        if self._journal:
+            self._journal_id = data["journal_id"] = ulid_util.ulid()
+
         _LOGGER.debug("Writing data for %s to %s", self.key, path)
         json_helper.save_json(
             path,
@@ -302,6 +371,59 @@ class Store(Generic[_T]):
             atomic_writes=self._atomic_writes,
         )
 
+        if self._journal:
+            with suppress(FileNotFoundError):
+                os.unlink(self.journal_path)
+            self._journal_base = data
+            self._journal_base_size = os.path.getsize(path)
+            self._journal_size = 0
+
+    def _write_journal(self, data: dict) -> bool:
+        """Append the changes since the last write to the journal.
+
+        Returns False when the data file needs to be rewritten instead,
+        because nothing was written yet or the journal would grow too large.
+        """
+        if (base := self._journal_base) is None or (
+            base["version"],
+            base["minor_version"],
+        ) != (data["version"], data["minor_version"]):
+            return False
+        if (ops := _journal_diff(base["data"], data["data"])) is None:
+            return False
+        if not ops:
+            _LOGGER.debug("Data for %s did not change, skipping write", self.key)
+            return True
+
+        entry = {"id": self._journal_id, "ops": ops}
+        try:
+            if self._encoder and self._encoder is not JSONEncoder:
+                line = json.dumps(entry, cls=self._encoder).encode() + b"\n"
+            else:
+                line = json_helper.json_bytes(entry) + b"\n"
+        except TypeError:
+            # Let the full write report the data that cannot be serialized
+            return False
+        if (
+            self._journal_size + len(line)
+            > self._journal_base_size * JOURNAL_COMPACT_RATIO
+        ):
+            return False
+
+        _LOGGER.debug("Appending changes for %s to %s", self.key, self.journal_path)
+        try:
+            with open(self.journal_path, "ab") as journal_file:
+                if journal_file.tell() != self._journal_size:
+                    # A previous append failed partway, so
+                    # start the entry on a fresh line
+                    line = b"\n" + line
+                journal_file.write(line)
+                self._journal_size = journal_file.tell()
+        except OSError as err:
+            raise WriteError(err) from err
+        self._journal_base = data
+        return True
+
     async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
         """Migrate to the new version."""
         raise NotImplementedError
@@ -313,3 +435,101 @@ class Store(Generic[_T]):
 
         with suppress(FileNotFoundError):
             await self.hass.async_add_executor_job(os.unlink, self.path)
+        if self._journal:
+            self._journal_base = None
+            self._journal_size = 0
+            with suppress(FileNotFoundError):
+                await self.hass.async_add_executor_job(os.unlink, self.journal_path)
+
+
+def _journal_diff(old: Any, new: Any, path: list[Any] | None = None) -> list | None:
+    """Return the operations that turn the old data into the new data.
+
+    Dicts are compared key by key. The changed items of a list are updated
+    in place when its length did not change, otherwise the items between
+    its unchanged head and tail are replaced. Returns None when the old data
+    cannot be patched, like when the keys of a changed dict are not strings.
+    """
+    ops: list = []
+    if path is None:
+        path = []
+    if old == new:
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        return _journal_diff_list(old, new, path)
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None
+    for key in old.keys() - new.keys():
+        if not isinstance(key, str):
+            return None
+        ops.append(["del", [*path, key]])
+    for key, value in new.items():
+        if key in old and old[key] == value:
+            continue
+        # Other keys are converted to strings when serialized
+        if not isinstance(key, str):
+            return None
+        if key not in old:
+            ops.append(["set", [*path, key], value])
+            continue
+        old_value = old[key]
+        if isinstance(old_value, list) and isinstance(value, list):
+            ops.extend(_journal_diff_list(old_value, value, [*path, key]))
+        elif (
+            isinstance(old_value, dict)
+            and isinstance(value, dict)
+            and (nested_ops := _journal_diff(old_value, value, [*path, key]))
+        ):
+            ops.extend(nested_ops)
+        else:
+            ops.append(["set", [*path, key], value])
+    return ops
+
+
+def _journal_diff_list(old: list, new: list, path: list[Any]) -> list:
+    """Return the operations that turn the old list into the new list."""
+    if len(old) == len(new):
+        # Update the changed items in place
+        ops: list = []
+        for index, equal in enumerate(map(operator.eq, old, new)):
+            if equal:
+                continue
+            old_item = old[index]
+            new_item = new[index]
+            if (
+                isinstance(old_item, dict)
+                and isinstance(new_item, dict)
+                and (item_ops := _journal_diff(old_item, new_item, [*path, index]))
+            ):
+                ops.extend(item_ops)
+            else:
+                ops.append(["set", [*path, index], new_item])
+        return ops
+
+    # Compare the items with map to keep the loop out of Python code
+    head = list(map(operator.eq, old, new))
+    start = head.index(False) if False in head else len(head)
+    tail = list(map(operator.eq, reversed(old[start:]), reversed(new[start:])))
+    tail_length = tail.index(False) if False in tail else len(tail)
+    old_end = len(old) - tail_length
+    new_end = len(new) - tail_length
+    return [["splice", path, start, old_end - start, new[start:new_end]]]
+
+
+def _apply_journal_ops(data: Any, ops: list) -> None:
+    """Apply the operations of a journal entry to the data."""
+    for op, path, *args in ops:
+        target = data
+        if op == "splice":
+            # The path of a splice is the list itself, which may be the data
+            for key in path:
+                target = target[key]
+            start, delete_count, items = args
+            target[start : start + delete_count] = items
+            continue
+        for key in path[:-1]:
+            target = target[key]
+        if op == "set":
+            target[path[-1]] = args[0]
+        else:
+            del target[path[-1]]
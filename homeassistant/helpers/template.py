@@ -5,13 +5,16 @@ from ast import literal_eval
 import asyncio
 import base64
 import collections.abc
+from collections import OrderedDict
 from collections.abc import Callable, Collection, Generator, Iterable
 from contextlib import contextmanager, suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from functools import cache, lru_cache, partial, wraps
+import hashlib
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter, contains
 import random
@@ -19,6 +22,7 @@ import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import threading
 from types import CodeType
 from typing import (
     Any,
@@ -50,6 +54,7 @@ from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__,
 )
 from homeassistant.core import (
     Context,
@@ -73,6 +78,7 @@ from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.thread import ThreadWithException
 
 from . import area_registry, device_registry, entity_registry, location as loc_helper
+from .storage import Store
 from .typing import TemplateVarsType
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -82,9 +88,17 @@ _SENTINEL = object()
 DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
+_ITERATED_TEMPLATE_STATES = "template.iterated_template_states"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
+_TEMPLATE_CODE_CACHE = "template.code_cache"
+
+TEMPLATE_CODE_CACHE_STORAGE_KEY = "core.template_code_cache"
+TEMPLATE_CODE_CACHE_STORAGE_VERSION = 1
+# The cache is also written when Home Assistant stops
+TEMPLATE_CODE_CACHE_SAVE_DELAY = 900
+TEMPLATE_CODE_CACHE_MAX_ENTRIES = 1024
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -976,9 +990,25 @@ _template_state_no_collect = lru_cache(maxsize=CACHED_TEMPLATE_STATES)(
 def _state_generator(
     hass: HomeAssistant, domain: str | None
 ) -> Generator[TemplateState, None, None]:
-    """State generator for a domain or all states."""
+    """State generator for a domain or all states.
+
+    The template states of the last complete iteration of the domain are
+    reused for the states that did not change since, so a re-render only
+    creates template states for the states that changed.
+    """
+    iterated: dict[str | None, dict[str, TemplateState]] = hass.data.setdefault(
+        _ITERATED_TEMPLATE_STATES, {}
+    )
+    last_template_states = iterated.get(domain, {})
+    template_states: dict[str, TemplateState] = {}
     for state in sorted(hass.states.async_all(domain), key=attrgetter("entity_id")):
-        yield _template_state_no_collect(hass, state)
+        template_state = last_template_states.get(state.entity_id)
+        # pylint: disable-next=protected-access
+        if template_state is None or template_state._state is not state:
+            template_state = _template_state_no_collect(hass, state)
+        template_states[state.entity_id] = template_state
+        yield template_state
+    iterated[domain] = template_states
 
 
 def _get_state_if_valid(hass: HomeAssistant, entity_id: str) -> TemplateState | None:
@@ -2068,6 +2098,9 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
+        # Templates compile to different code, or fail to compile, depending
+        # on the filters and tests available in each kind of environment
+        self.code_cache_kind = "limited" if limited else "strict" if strict else ""
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | str | None
         ] = weakref.WeakValueDictionary()
@@ -2324,9 +2357,140 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             )
 
         if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+            cached = self.template_cache[source] = self._compile_with_code_cache(source)
 
         return cached
 
+    def _compile_with_code_cache(self, source: str | jinja2.nodes.Template) -> CodeType:
+        """Compile the template using the persistent code cache if available."""
+        if (
+            self.hass is None
+            or not isinstance(source, str)
+            or (code_cache := self.hass.data.get(_TEMPLATE_CODE_CACHE)) is None
+        ):
+            return super().compile(source)  # type: ignore[no-any-return]
+
+        key = code_cache.key(self.code_cache_kind, source)
+        if (code := code_cache.get(key)) is None:
+            code = super().compile(source)
+            code_cache.set(key, code)
+        return code
+
+
+class TemplateCodeCache:
+    """Persist the compiled code of templates across restarts.
+
+    Entries are keyed by the environment kind and a hash of the template
+    source, and hold the marshaled code object. The whole cache is
+    discarded when the Home Assistant, Jinja or Python version changes
+    since the code is only valid for the versions that compiled it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the template code cache."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass,
+            TEMPLATE_CODE_CACHE_STORAGE_VERSION,
+            TEMPLATE_CODE_CACHE_STORAGE_KEY,
+            private=True,
+        )
+        # Encoded code by key, from least to most recently used
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        # Templates may be compiled outside the event loop
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def async_load(self) -> None:
+        """Load the cache from storage."""
+        if not (data := await self._store.async_load()):
+            return
+        versions = {key: data.get(key) for key in _code_cache_versions()}
+        if versions != _code_cache_versions():
+            _LOGGER.debug("Discarding template code cache for %s", versions)
+            return
+        if not isinstance(entries := data.get("entries"), dict):
+            _LOGGER.debug("Discarding invalid template code cache")
+            return
+        with self._lock:
+            self._entries.update(
+                (key, encoded)
+                for key, encoded in entries.items()
+                if isinstance(encoded, str)
+            )
+
+    @staticmethod
+    def key(kind: str, source: str) -> str:
+        """Return the key of a template source for an environment kind."""
+        return f"{kind}:{hashlib.sha256(source.encode()).hexdigest()}"
+
+    def get(self, key: str) -> CodeType | None:
+        """Return the cached code of a template.
+
+        The code is only unmarshaled when a template is compiled, so
+        entries for templates that are not used are never decoded.
+        """
+        with self._lock:
+            if (encoded := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+        if encoded is None:
+            self.misses += 1
+            return None
+        try:
+            code = marshal.loads(base64.b64decode(encoded))
+            if not isinstance(code, CodeType):
+                raise TypeError(f"Unexpected {type(code).__name__} object")
+        except (ValueError, EOFError, TypeError) as err:
+            _LOGGER.debug("Discarding invalid template code cache entry: %s", err)
+            with self._lock:
+                self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return code  # type: ignore[no-any-return]
+
+    def set(self, key: str, code: CodeType) -> None:
+        """Add the code of a template to the cache and schedule a save.
+
+        Templates may be compiled outside the event loop, so the entries
+        are guarded by a lock and the save is scheduled thread-safe.
+        """
+        encoded = base64.b64encode(marshal.dumps(code)).decode()
+        with self._lock:
+            entries = self._entries
+            entries[key] = encoded
+            while len(entries) > TEMPLATE_CODE_CACHE_MAX_ENTRIES:
+                entries.popitem(last=False)
+        self.hass.loop.call_soon_threadsafe(
+            self._store.async_delay_save,
+            self._data_to_save,
+            TEMPLATE_CODE_CACHE_SAVE_DELAY,
+        )
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data of the cache to store."""
+        with self._lock:
+            entries = dict(self._entries)
+        return {**_code_cache_versions(), "entries": entries}
+
+
+@cache
+def _code_cache_versions() -> dict[str, str]:
+    """Return the versions the compiled code of templates depends on."""
+    return {
+        "ha_version": __version__,
+        "jinja_version": jinja2.__version__,
+        "python_version": sys.version,
+    }
+
+
+async def async_load_code_cache(hass: HomeAssistant) -> None:
+    """Load the persistent template code cache."""
+    code_cache = TemplateCodeCache(hass)
+    await code_cache.async_load()
+    hass.data[_TEMPLATE_CODE_CACHE] = code_cache
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
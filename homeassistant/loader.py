@@ -12,8 +12,10 @@ from dataclasses import dataclass
 import functools as ft
 import importlib
 import logging
+import os
 import pathlib
 import sys
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, TypeVar, cast
 
@@ -44,8 +46,13 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+# DATA_LOOP_IMPORT_TIME is a dict [str, float], the seconds the event loop
+# was blocked importing the component and platforms of an integration.
+DATA_LOOP_IMPORT_TIME = "loop_import_time"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
+CUSTOM_COMPONENTS_INDEX_STORAGE_KEY = "core.custom_components_index"
+CUSTOM_COMPONENTS_INDEX_STORAGE_VERSION = 1
 CUSTOM_WARNING = (
     "We found a custom integration %s which has not "
     "been tested by Home Assistant. This component might "
@@ -185,30 +192,99 @@ async def _async_get_custom_components(
     except ImportError:
         return {}
 
-    def get_sub_directories(paths: list[str]) -> list[pathlib.Path]:
-        """Return all sub directories in a set of paths."""
-        return [
-            entry
-            for path in paths
-            for entry in pathlib.Path(path).iterdir()
-            if entry.is_dir()
-        ]
-
-    dirs = await hass.async_add_executor_job(
-        get_sub_directories, custom_components.__path__
-    )
+    # pylint: disable-next=import-outside-toplevel
+    from .helpers.storage import Store
 
-    integrations = await hass.async_add_executor_job(
-        _resolve_integrations_from_root,
+    store: Store[dict[str, Any]] = Store(
         hass,
-        custom_components,
-        [comp.name for comp in dirs],
+        CUSTOM_COMPONENTS_INDEX_STORAGE_VERSION,
+        CUSTOM_COMPONENTS_INDEX_STORAGE_KEY,
+        private=True,
     )
-    return {
-        integration.domain: integration
-        for integration in integrations.values()
-        if integration is not None
-    }
+    index = await store.async_load() or {}
+    integrations, new_index = await hass.async_add_executor_job(
+        _resolve_custom_components, hass, custom_components, index
+    )
+    if new_index != index:
+        store.async_delay_save(lambda: new_index)
+    return integrations
+
+
+def _resolve_custom_components(
+    hass: HomeAssistant, root_module: ModuleType, index: dict[str, Any]
+) -> tuple[dict[str, Integration], dict[str, Any]]:
+    """Resolve the custom integrations using the index of a previous run.
+
+    The sub directories of a custom components directory are only listed
+    again when its mtime changed, and a manifest is only parsed again when
+    its mtime or size changed. Returns the integrations and the new index.
+    """
+    cached_paths: dict[str, Any] = index.get("paths", {})
+    cached_manifests: dict[str, Any] = index.get("manifests", {})
+    paths: dict[str, Any] = {}
+    manifests: dict[str, Any] = {}
+    integrations: dict[str, Integration] = {}
+    resolved: set[str] = set()
+
+    for path in root_module.__path__:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        if (cached := cached_paths.get(path)) and cached["mtime_ns"] == mtime_ns:
+            sub_directories: list[str] = cached["sub_directories"]
+        else:
+            with os.scandir(path) as entries:
+                sub_directories = sorted(
+                    entry.name for entry in entries if entry.is_dir()
+                )
+        paths[path] = {"mtime_ns": mtime_ns, "sub_directories": sub_directories}
+
+        for domain in sub_directories:
+            if domain in resolved:
+                continue
+            manifest_path = os.path.join(path, domain, "manifest.json")
+            try:
+                stat = os.stat(manifest_path)
+            except OSError:
+                continue
+            if (
+                (cached := cached_manifests.get(manifest_path))
+                and cached["mtime_ns"] == stat.st_mtime_ns
+                and cached["size"] == stat.st_size
+            ):
+                manifest: Manifest = cached["manifest"]
+            else:
+                try:
+                    with open(manifest_path, "rb") as manifest_file:
+                        manifest = cast(Manifest, json_loads(manifest_file.read()))
+                except (OSError, *JSON_DECODE_EXCEPTIONS) as err:
+                    _LOGGER.error(
+                        "Error parsing manifest.json file at %s: %s",
+                        manifest_path,
+                        err,
+                    )
+                    continue
+            manifests[manifest_path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "manifest": manifest,
+            }
+            resolved.add(domain)
+            try:
+                integration = Integration.from_manifest(
+                    hass,
+                    root_module,
+                    pathlib.Path(path) / domain,
+                    cast(Manifest, dict(manifest)),
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error loading integration: %s", domain)
+                continue
+            if integration is not None:
+                integrations[integration.domain] = integration
+
+    return integrations, {"paths": paths, "manifests": manifests}
 
 
 async def async_get_custom_components(
@@ -513,56 +589,70 @@ class Integration:
                 )
                 continue
 
-            integration = cls(
-                hass,
-                f"{root_module.__name__}.{domain}",
-                manifest_path.parent,
-                manifest,
-            )
+            return cls.from_manifest(hass, root_module, manifest_path.parent, manifest)
 
-            if integration.is_built_in:
-                return integration
+        return None
 
-            _LOGGER.warning(CUSTOM_WARNING, integration.domain)
-            if integration.version is None:
-                _LOGGER.error(
-                    (
-                        "The custom integration '%s' does not have a version key in the"
-                        " manifest file and was blocked from loading. See"
-                        " https://developers.home-assistant.io"
-                        "/blog/2021/01/29/custom-integration-changes#versions"
-                        " for more details"
-                    ),
-                    integration.domain,
-                )
-                return None
-            try:
-                AwesomeVersion(
-                    integration.version,
-                    ensure_strategy=[
-                        AwesomeVersionStrategy.CALVER,
-                        AwesomeVersionStrategy.SEMVER,
-                        AwesomeVersionStrategy.SIMPLEVER,
-                        AwesomeVersionStrategy.BUILDVER,
-                        AwesomeVersionStrategy.PEP440,
-                    ],
-                )
-            except AwesomeVersionException:
-                _LOGGER.error(
-                    (
-                        "The custom integration '%s' does not have a valid version key"
-                        " (%s) in the manifest file and was blocked from loading. See"
-                        " https://developers.home-assistant.io"
-                        "/blog/2021/01/29/custom-integration-changes#versions"
-                        " for more details"
-                    ),
-                    integration.domain,
-                    integration.version,
-                )
-                return None
+    @classmethod
+    def from_manifest(
+        cls,
+        hass: HomeAssistant,
+        root_module: ModuleType,
+        file_path: pathlib.Path,
+        manifest: Manifest,
+    ) -> Integration | None:
+        """Create an integration from its manifest.
+
+        Custom integrations without a valid version are blocked from loading.
+        """
+        integration = cls(
+            hass,
+            f"{root_module.__name__}.{file_path.name}",
+            file_path,
+            manifest,
+        )
+
+        if integration.is_built_in:
             return integration
 
-        return None
+        _LOGGER.warning(CUSTOM_WARNING, integration.domain)
+        if integration.version is None:
+            _LOGGER.error(
+                (
+                    "The custom integration '%s' does not have a version key in the"
+                    " manifest file and was blocked from loading. See"
+                    " https://developers.home-assistant.io"
+                    "/blog/2021/01/29/custom-integration-changes#versions"
+                    " for more details"
+                ),
+                integration.domain,
+            )
+            return None
+        try:
+            AwesomeVersion(
+                integration.version,
+                ensure_strategy=[
+                    AwesomeVersionStrategy.CALVER,
+                    AwesomeVersionStrategy.SEMVER,
+                    AwesomeVersionStrategy.SIMPLEVER,
+                    AwesomeVersionStrategy.BUILDVER,
+                    AwesomeVersionStrategy.PEP440,
+                ],
+            )
+        except AwesomeVersionException:
+            _LOGGER.error(
+                (
+                    "The custom integration '%s' does not have a valid version key"
+                    " (%s) in the manifest file and was blocked from loading. See"
+                    " https://developers.home-assistant.io"
+                    "/blog/2021/01/29/custom-integration-changes#versions"
+                    " for more details"
+                ),
+                integration.domain,
+                integration.version,
+            )
+            return None
+        return integration
 
     def __init__(
         self,
@@ -750,12 +840,87 @@ class Integration:
 
         return self._all_dependencies_resolved
 
+    async def async_get_component(self) -> ModuleType:
+        """Return the component, importing it in the executor if needed.
+
+        The config flow of the integration is imported in the same
+        executor job.
+        """
+        cache: dict[str, ModuleType] = self.hass.data.setdefault(DATA_COMPONENTS, {})
+        if self.domain not in cache:
+            try:
+                await self.hass.async_add_executor_job(
+                    self._import_component_and_platforms
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                # Import again in the event loop to raise or log the error
+                _LOGGER.debug(
+                    "Failed to import component %s in executor: %s", self.pkg_path, err
+                )
+        return self.get_component()
+
+    async def async_get_platform(self, platform_name: str) -> ModuleType:
+        """Return a platform for an integration, importing it in the executor."""
+        cache: dict[str, ModuleType] = self.hass.data.setdefault(DATA_COMPONENTS, {})
+        full_name = f"{self.domain}.{platform_name}"
+        if full_name not in cache:
+            try:
+                platform = await self.hass.async_add_executor_job(
+                    self._import_platform, platform_name
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                # Import again in the event loop to raise or log the error
+                _LOGGER.debug(
+                    "Failed to import platform %s.%s in executor: %s",
+                    self.pkg_path,
+                    platform_name,
+                    err,
+                )
+            else:
+                cache.setdefault(full_name, platform)
+        return self.get_platform(platform_name)
+
+    def _import_component_and_platforms(self) -> None:
+        """Import the component and its config flow.
+
+        Runs in the executor. The config flow is skipped if it fails to
+        import, the error is raised when it is imported again by its users.
+        Other platforms are imported in the executor when they are set up.
+        """
+        cache: dict[str, ModuleType] = self.hass.data[DATA_COMPONENTS]
+        cache.setdefault(self.domain, importlib.import_module(self.pkg_path))
+        if (
+            f"{self.domain}.config_flow" in cache
+            or self.file_path is None
+            or not self.file_path.joinpath("config_flow.py").exists()
+        ):
+            return
+        try:
+            cache.setdefault(
+                f"{self.domain}.config_flow", self._import_platform("config_flow")
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug(
+                "Failed to prefetch platform %s.config_flow: %s", self.pkg_path, err
+            )
+
+    def _record_loop_import_time(self, start: float) -> None:
+        """Record the time an import blocked the event loop."""
+        with suppress(RuntimeError):
+            if asyncio.get_running_loop() is not self.hass.loop:
+                return
+            import_time: dict[str, float] = self.hass.data.setdefault(
+                DATA_LOOP_IMPORT_TIME, {}
+            )
+            import_time[self.domain] = import_time.get(self.domain, 0) + timer() - start
+
     def get_component(self) -> ModuleType:
         """Return the component."""
         cache: dict[str, ModuleType] = self.hass.data.setdefault(DATA_COMPONENTS, {})
         if self.domain in cache:
             return cache[self.domain]
 
+        start = timer()
         try:
             cache[self.domain] = importlib.import_module(self.pkg_path)
         except ImportError:
@@ -765,6 +930,8 @@ class Integration:
                 "Unexpected exception importing component %s", self.pkg_path
             )
             raise ImportError(f"Exception importing {self.pkg_path}") from err
+        finally:
+            self._record_loop_import_time(start)
 
         return cache[self.domain]
 
@@ -775,6 +942,7 @@ class Integration:
         if full_name in cache:
             return cache[full_name]
 
+        start = timer()
         try:
             cache[full_name] = self._import_platform(platform_name)
         except ImportError:
@@ -788,6 +956,8 @@ class Integration:
             raise ImportError(
                 f"Exception importing {self.pkg_path}.{platform_name}"
             ) from err
+        finally:
+            self._record_loop_import_time(start)
 
         return cache[full_name]
 
@@ -800,6 +970,85 @@ class Integration:
         return f"<Integration {self.domain}: {self.pkg_path}>"
 
 
+@ft.cache
+def _load_builtin_manifests() -> dict[str, Manifest]:
+    """Load the manifests of the built-in integrations from the generated index.
+
+    The index is generated with python3 -m script.hassfest. In a development
+    checkout, the manifests that changed after the index was generated are
+    left out, so they are read from their manifest.json instead.
+    """
+    manifests_path = pathlib.Path(generated.__path__[0]) / "manifests.json"
+    try:
+        manifests = cast(dict[str, Manifest], json_loads(manifests_path.read_bytes()))
+    except (OSError, *JSON_DECODE_EXCEPTIONS) as err:
+        _LOGGER.error("Error loading the manifest index %s: %s", manifests_path, err)
+        return {}
+    if manifests_path.parents[2].joinpath("script", "hassfest").is_dir():
+        _remove_outdated_manifests(manifests, manifests_path)
+    return manifests
+
+
+def _remove_outdated_manifests(
+    manifests: dict[str, Manifest], manifests_path: pathlib.Path
+) -> None:
+    """Remove the manifests that changed after the index was generated."""
+    index_mtime_ns = manifests_path.stat().st_mtime_ns
+    components_path = manifests_path.parents[1] / "components"
+    outdated: list[str] = []
+    for domain in manifests:
+        try:
+            mtime_ns = (
+                components_path.joinpath(domain, "manifest.json").stat().st_mtime_ns
+            )
+        except OSError:
+            # The integration was removed
+            outdated.append(domain)
+            continue
+        if mtime_ns > index_mtime_ns:
+            outdated.append(domain)
+    if not outdated:
+        return
+    for domain in outdated:
+        del manifests[domain]
+    _LOGGER.warning(
+        (
+            "The manifest index is out of date for %s, their manifest.json is used"
+            " instead. Run python3 -m script.hassfest to update it"
+        ),
+        ", ".join(sorted(outdated)),
+    )
+
+
+def _resolve_builtin_integrations(
+    hass: HomeAssistant, root_module: ModuleType, domains: list[str]
+) -> dict[str, Integration]:
+    """Resolve multiple built-in integrations.
+
+    Integrations are resolved from the generated manifest index, and from
+    their manifest.json file when they are missing from the index.
+    """
+    manifests = _load_builtin_manifests()
+    base = pathlib.Path(root_module.__path__[0])
+    integrations: dict[str, Integration] = {}
+    not_indexed: list[str] = []
+    for domain in domains:
+        if (manifest := manifests.get(domain)) is None:
+            not_indexed.append(domain)
+            continue
+        integrations[domain] = Integration(
+            hass,
+            f"{root_module.__name__}.{domain}",
+            base / domain,
+            cast(Manifest, dict(manifest)),
+        )
+    if not_indexed:
+        integrations.update(
+            _resolve_integrations_from_root(hass, root_module, not_indexed)
+        )
+    return integrations
+
+
 def _resolve_integrations_from_root(
     hass: HomeAssistant, root_module: ModuleType, domains: list[str]
 ) -> dict[str, Integration]:
@@ -873,12 +1122,12 @@ async def async_get_integrations(
             if domain in needed:
                 del needed[domain]
 
-    # Now the rest use resolve_from_root
+    # Now the rest use the manifest index of the built-in integrations
     if needed:
         from . import components  # pylint: disable=import-outside-toplevel
 
         integrations = await hass.async_add_executor_job(
-            _resolve_integrations_from_root, hass, components, list(needed)
+            _resolve_builtin_integrations, hass, components, list(needed)
         )
         for domain, event in needed.items():
             int_or_exc = integrations.get(domain)
@@ -6,19 +6,24 @@ import asyncio
 import collections
 from collections.abc import Callable
 from contextlib import suppress
+from datetime import timedelta
+from functools import partial
 import json
 import logging
+import os
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 from typing import TypeVar
 
 from homeassistant import core
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, EVENT_STATE_CHANGED
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
     async_track_state_change,
     async_track_state_change_event,
 )
 from homeassistant.helpers.json import JSON_DUMP, JSONEncoder
+import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -120,6 +125,58 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+async def _fire_events_for_entity_listeners(hass, use_event_data_match):
+    """Fire 100k events with 500 listeners, each for one entity_id."""
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10**5
+    entity_ids = [f"light.kitchen_{idx}" for idx in range(500)]
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for entity_id in entity_ids:
+        if use_event_data_match:
+            hass.bus.async_listen(
+                event_name, listener, event_data_match=("entity_id", entity_id)
+            )
+            continue
+
+        @core.callback
+        def event_filter(event, entity_id=entity_id):
+            """Filter event."""
+            return event.data["entity_id"] == entity_id
+
+        hass.bus.async_listen(event_name, listener, event_filter=event_filter)
+
+    event_data = [{"entity_id": entity_id} for entity_id in entity_ids]
+    start = timer()
+
+    for idx in range(events_to_fire):
+        hass.bus.async_fire(event_name, event_data[idx % 500])
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
+@benchmark
+async def fire_events_with_entity_id_filters(hass):
+    """Fire 100k events with 500 listeners filtering on the entity_id."""
+    return await _fire_events_for_entity_listeners(hass, False)
+
+
+@benchmark
+async def fire_events_with_event_data_match(hass):
+    """Fire 100k events with 500 listeners indexed by the entity_id."""
+    return await _fire_events_for_entity_listeners(hass, True)
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -314,6 +371,652 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def state_machine_async_set(hass):
+    """Set the state of 100 power sensors a million times.
+
+    Reports the time and the memory allocated per async_set.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import tracemalloc
+
+    states_to_set = 10**6
+    entity_count = 100
+    attributes = {
+        "unit_of_measurement": "W",
+        "device_class": "power",
+        "state_class": "measurement",
+        "friendly_name": "Power",
+    }
+    for idx in range(entity_count):
+        hass.states.async_set(f"sensor.power_{idx}", "0", attributes)
+
+    start = timer()
+    for idx in range(states_to_set):
+        hass.states.async_set(
+            f"sensor.power_{idx % entity_count}", str(idx), attributes
+        )
+    runtime = timer() - start
+
+    # Keep every fired event alive to measure what a single
+    # async_set allocates for the state, context and event
+    events = []
+
+    @core.callback
+    def listener(event):
+        """Keep the event."""
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    traced_states = entity_count * 100
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for idx in range(traced_states):
+        hass.states.async_set(
+            f"sensor.power_{idx % entity_count}", str(-idx), attributes
+        )
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{runtime / states_to_set * 10**6:.2f} µs per async_set")
+    print(f"{(after - before) / traced_states:.0f} bytes allocated per async_set")
+    return runtime
+
+
+async def _async_resolve_integrations(hass, domains):
+    """Resolve the integrations and their dependencies like bootstrap does."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant import loader
+
+    integrations = await loader.async_get_integrations(hass, domains)
+    await asyncio.gather(
+        *(
+            integration.resolve_dependencies()
+            for integration in integrations.values()
+            if isinstance(integration, loader.Integration)
+        )
+    )
+    return integrations
+
+
+@benchmark
+async def resolve_integrations(hass):
+    """Resolve 300 configured built-in and 20 custom integrations at startup.
+
+    The first pass has no custom components index yet, the second pass
+    uses the index saved by the first one like a restart would.
+    """
+    # pylint: disable=import-outside-toplevel
+    import sys
+
+    from homeassistant import components, loader
+
+    # pylint: enable=import-outside-toplevel
+
+    components_dir = components.__path__[0]
+    builtin_domains = sorted(
+        name
+        for name in os.listdir(components_dir)
+        if os.path.isfile(os.path.join(components_dir, name, "manifest.json"))
+    )[:300]
+    custom_domains = [f"benchmark_custom_{idx}" for idx in range(20)]
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        for domain in custom_domains:
+            os.makedirs(os.path.join(config_dir, "custom_components", domain))
+            with open(
+                os.path.join(config_dir, "custom_components", domain, "manifest.json"),
+                "w",
+                encoding="utf-8",
+            ) as manifest_file:
+                json.dump(
+                    {
+                        "domain": domain,
+                        "name": domain,
+                        "codeowners": [],
+                        "dependencies": ["http"],
+                        "requirements": [],
+                        "version": "1.0.0",
+                    },
+                    manifest_file,
+                )
+
+        runtimes = []
+        try:
+            for _ in range(2):
+                hass.data.pop(loader.DATA_INTEGRATIONS, None)
+                hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+                # pylint: disable-next=protected-access
+                loader._load_builtin_manifests.cache_clear()
+                start = timer()
+                integrations = await _async_resolve_integrations(
+                    hass, [*builtin_domains, *custom_domains]
+                )
+                runtimes.append(timer() - start)
+                # Let the custom components index be saved
+                await asyncio.sleep(0.1)
+                await hass.async_block_till_done()
+        finally:
+            sys.path.remove(config_dir)
+            sys.modules.pop("custom_components", None)
+
+        resolved = sum(
+            isinstance(integration, loader.Integration)
+            for integration in integrations.values()
+        )
+        print(f"Resolved {resolved} integrations, first pass took {runtimes[0]}s")
+        await hass.async_stop()
+
+    return runtimes[1]
+
+
+@benchmark
+async def entity_registry_update_writes(hass):
+    """Write 1000 single entity updates of a registry of 5000 entities to disk.
+
+    Compares the bytes written per update with and without the journal.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import entity_registry as er
+
+    entity_count = 5000
+    updates = 1000
+    runtimes = {}
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await er.async_load(hass)
+        registry = er.async_get(hass)
+        store = registry._store  # pylint: disable=protected-access
+        entries = [
+            registry.async_get_or_create(
+                "sensor",
+                "benchmark",
+                f"unique_{idx}",
+                original_name=f"Benchmark sensor {idx}",
+            )
+            for idx in range(entity_count)
+        ]
+
+        def bytes_on_disk():
+            """Return the size of the data file and journal and the data mtime."""
+            stat = os.stat(store.path)
+            try:
+                journal_size = os.path.getsize(store.journal_path)
+            except FileNotFoundError:
+                journal_size = 0
+            return stat.st_mtime_ns, stat.st_size, journal_size
+
+        for journal in (False, True):
+            # pylint: disable-next=protected-access
+            store._journal = journal
+            await store._async_handle_write_data()  # pylint: disable=protected-access
+            mtime_ns, _, journal_size = bytes_on_disk()
+            written = 0
+            start = timer()
+            for idx in range(updates):
+                registry.async_update_entity(
+                    entries[idx % entity_count].entity_id,
+                    name=f"Renamed {journal} {idx}",
+                )
+                # pylint: disable-next=protected-access
+                await store._async_handle_write_data()
+                new_mtime_ns, size, new_journal_size = bytes_on_disk()
+                if new_mtime_ns != mtime_ns:
+                    written += size
+                written += max(new_journal_size - journal_size, 0)
+                mtime_ns, journal_size = new_mtime_ns, new_journal_size
+            runtimes[journal] = timer() - start
+            mode = "journal" if journal else "full"
+            print(
+                f"{mode}: {written / updates:.0f} bytes written per update,"
+                f" {runtimes[journal] / updates * 1000:.2f}ms per update"
+            )
+        await hass.async_stop()
+
+    return runtimes[True]
+
+
+@benchmark
+async def entity_write_ha_state(hass):
+    """Write the state of 1000 sensors with a device 100 times each.
+
+    Half of the writes change the state, the other half write an
+    unchanged state like a polling sensor that did not update would.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.sensor import SensorEntity
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    # pylint: enable=import-outside-toplevel
+
+    entity_count = 1000
+    writes = 100
+
+    class BenchmarkSensor(SensorEntity):
+        """Sensor named after its device."""
+
+        _attr_has_entity_name = True
+        _attr_name = "Power"
+        _attr_native_unit_of_measurement = "W"
+        _attr_should_poll = False
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        device_registry = dr.async_get(hass)
+        entity_registry = er.async_get(hass)
+        entities = []
+        for idx in range(entity_count):
+            device = device_registry.async_get_or_create(
+                config_entry_id="benchmark",
+                identifiers={("benchmark", str(idx))},
+                name=f"Benchmark device {idx}",
+            )
+            entry = entity_registry.async_get_or_create(
+                "sensor", "benchmark", f"unique_{idx}", device_id=device.id
+            )
+            entity = BenchmarkSensor()
+            entity.hass = hass
+            entity.entity_id = entry.entity_id
+            entity.registry_entry = entry
+            await entity.async_internal_added_to_hass()
+            entities.append(entity)
+
+        start = timer()
+        for idx in range(writes):
+            for entity in entities:
+                # pylint: disable-next=protected-access
+                entity._attr_native_value = idx - idx % 2
+                entity.async_write_ha_state()
+        runtime = timer() - start
+        await hass.async_stop()
+
+    return runtime
+
+
+@benchmark
+async def restore_state_dump(hass):
+    """Dump the restore states of 8000 entities after 100 of them changed.
+
+    Also reports the bytes written by the dump and the time it takes to
+    load the stored states and restore the first entity after a restart.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import restore_state
+
+    entity_count = 8000
+    changed_count = 100
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        data = await restore_state.RestoreStateData.async_get_instance(hass)
+        for idx in range(entity_count):
+            entity = restore_state.RestoreEntity()
+            entity.hass = hass
+            entity.entity_id = f"sensor.benchmark_{idx}"
+            data.async_restore_entity_added(entity)
+            hass.states.async_set(
+                entity.entity_id,
+                str(idx),
+                {"unit_of_measurement": "W", "friendly_name": f"Benchmark {idx}"},
+            )
+        await data.async_dump_states()
+        store = data.store
+        journal_path = f"{store.path}.journal"
+
+        def bytes_on_disk():
+            """Return the size of the data file and journal."""
+            journal_size = 0
+            if os.path.exists(journal_path):
+                journal_size = os.path.getsize(journal_path)
+            return os.path.getsize(store.path), journal_size
+
+        size, journal_size = bytes_on_disk()
+        start = timer()
+        for idx in range(changed_count):
+            hass.states.async_set(f"sensor.benchmark_{idx}", "changed")
+        await data.async_dump_states()
+        runtime = timer() - start
+        new_size, new_journal_size = bytes_on_disk()
+        written = new_journal_size - journal_size
+        if new_size != size or written <= 0:
+            written = new_size + new_journal_size
+
+        hass.data.pop(restore_state.DATA_RESTORE_STATE_TASK)
+        start = timer()
+        data = await restore_state.RestoreStateData.async_get_instance(hass)
+        data.async_get_last_stored_state("sensor.benchmark_0")
+        load_time = timer() - start
+        print(
+            f"Dump wrote {written} bytes, loading and restoring the first"
+            f" entity took {load_time}s"
+        )
+        await hass.async_stop()
+
+    return runtime
+
+
+@benchmark
+async def subscribe_entities_fan_out(hass):
+    """Fire 10000 state changes at 40 subscribe_entities connections.
+
+    The connections belong to 10 users, like dashboards and tablets that
+    are open at the same time. A quarter of them only subscribe to a
+    few entities.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth import models as auth_models
+    from homeassistant.auth.permissions import PermissionLookup
+    from homeassistant.auth.permissions.system_policies import ADMIN_POLICY
+    from homeassistant.components.websocket_api import const as websocket_const
+    from homeassistant.components.websocket_api.commands import (
+        handle_subscribe_entities,
+    )
+    from homeassistant.components.websocket_api.connection import ActiveConnection
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    # pylint: enable=import-outside-toplevel
+
+    entity_count = 1000
+    events_to_fire = 10**4
+    user_count = 10
+    connections_per_user = 4
+    filtered_entity_ids = [f"sensor.benchmark_{idx}" for idx in range(0, 100, 10)]
+    sent = 0
+
+    def send_message(message):
+        """Count the sent messages."""
+        nonlocal sent
+        sent += 1
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        perm_lookup = PermissionLookup(er.async_get(hass), dr.async_get(hass))
+        group = auth_models.Group(name="Administrators", policy=ADMIN_POLICY)
+        hass.data[websocket_const.DOMAIN] = {}
+
+        for idx in range(entity_count):
+            hass.states.async_set(f"sensor.benchmark_{idx}", "0")
+
+        msg_id = 0
+        for user_idx in range(user_count):
+            user = auth_models.User(
+                name=f"Benchmark {user_idx}",
+                perm_lookup=perm_lookup,
+                is_owner=user_idx == 0,
+                is_active=True,
+                groups=[group],
+            )
+            refresh_token = auth_models.RefreshToken(user, None, timedelta(minutes=30))
+            for conn_idx in range(connections_per_user):
+                connection = ActiveConnection(
+                    logging.getLogger(__name__),
+                    hass,
+                    send_message,
+                    user,
+                    refresh_token,
+                )
+                msg_id += 1
+                msg = {"id": msg_id, "type": "subscribe_entities"}
+                if conn_idx == 0:
+                    msg["entity_ids"] = filtered_entity_ids
+                handle_subscribe_entities(hass, connection, msg)
+
+        sent = 0
+        start = timer()
+        for idx in range(events_to_fire):
+            hass.states.async_set(f"sensor.benchmark_{idx % entity_count}", str(idx))
+        await hass.async_block_till_done()
+        runtime = timer() - start
+        print(f"Sent {sent} messages")
+        await hass.async_stop()
+
+    return runtime
+
+
+@benchmark
+async def websocket_initial_states(hass):
+    """Send the initial states of 8000 entities to 30 reconnecting connections.
+
+    Each connection calls get_states and subscribe_entities, and 10 states
+    change between the connections.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth import models as auth_models
+    from homeassistant.auth.permissions import PermissionLookup
+    from homeassistant.components.websocket_api import const as websocket_const
+    from homeassistant.components.websocket_api.commands import (
+        handle_get_states,
+        handle_subscribe_entities,
+    )
+    from homeassistant.components.websocket_api.connection import ActiveConnection
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    # pylint: enable=import-outside-toplevel
+
+    entity_count = 8000
+    connection_count = 30
+    changed_count = 10
+    sent = 0
+
+    def send_message(message):
+        """Count the sent bytes."""
+        nonlocal sent
+        sent += len(message)
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        user = auth_models.User(
+            name="Benchmark",
+            perm_lookup=PermissionLookup(er.async_get(hass), dr.async_get(hass)),
+            is_owner=True,
+            is_active=True,
+        )
+        refresh_token = auth_models.RefreshToken(user, None, timedelta(minutes=30))
+        hass.data[websocket_const.DOMAIN] = {}
+
+        for idx in range(entity_count):
+            hass.states.async_set(
+                f"sensor.benchmark_{idx}",
+                "0",
+                {"unit_of_measurement": "W", "friendly_name": f"Benchmark {idx}"},
+            )
+
+        start = timer()
+        for conn_idx in range(connection_count):
+            for idx in range(changed_count):
+                hass.states.async_set(
+                    f"sensor.benchmark_{conn_idx * changed_count + idx}", "1"
+                )
+            connection = ActiveConnection(
+                logging.getLogger(__name__), hass, send_message, user, refresh_token
+            )
+            handle_get_states(hass, connection, {"id": 1, "type": "get_states"})
+            handle_subscribe_entities(
+                hass, connection, {"id": 2, "type": "subscribe_entities"}
+            )
+        runtime = timer() - start
+        print(f"Sent {sent} bytes")
+        await hass.async_stop()
+
+    return runtime
+
+
+async def _async_setup_recorder(hass, config_dir):
+    """Set up the recorder for a benchmark and return the instance.
+
+    Uses a SQLite database in config_dir unless the
+    RECORDER_BENCHMARK_DB_URL environment variable points to another
+    database such as MariaDB or PostgreSQL.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant import bootstrap, config_entries
+    from homeassistant.components import recorder
+    from homeassistant.helpers import recorder as recorder_helper
+    from homeassistant.setup import async_setup_component
+
+    # pylint: enable=import-outside-toplevel
+
+    hass.config.config_dir = config_dir
+    config = {}
+    if db_url := os.environ.get("RECORDER_BENCHMARK_DB_URL"):
+        config[recorder.CONF_DB_URL] = db_url
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.load_registries(hass)
+    recorder_helper.async_initialize_recorder(hass)
+    await async_setup_component(hass, recorder.DOMAIN, {recorder.DOMAIN: config})
+    hass.state = core.CoreState.running
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    instance = recorder.get_instance(hass)
+    await instance.async_recorder_ready.wait()
+    return instance
+
+
+async def _async_write_states(
+    hass, instance, states_to_write, entity_count, attributes
+):
+    """Write states for entity_count sensors to the recorder database."""
+    for idx in range(states_to_write):
+        hass.states.async_set(
+            f"sensor.benchmark_{idx % entity_count}", str(idx), attributes
+        )
+        if idx % 1000 == 0:
+            # Avoid the recorder stopping because the backlog is too large
+            await instance.async_block_till_done()
+    await instance.async_block_till_done()
+
+
+@benchmark
+async def recorder_state_writes(hass):
+    """Write 100k state changes to the recorder database."""
+    states_to_write = 10**5
+    entity_count = 100
+    attributes = {"unit_of_measurement": "W", "friendly_name": "Power"}
+
+    with TemporaryDirectory() as config_dir:
+        instance = await _async_setup_recorder(hass, config_dir)
+        start = timer()
+        await _async_write_states(
+            hass, instance, states_to_write, entity_count, attributes
+        )
+        runtime = timer() - start
+        print(f"Wrote {states_to_write / runtime:.0f} rows/s")
+        await hass.async_stop()
+
+    return runtime
+
+
+@benchmark
+async def recorder_history_minimal_response(hass):
+    """Fetch a week of history for 200 sensors with 500 states each.
+
+    Measures the request the frontend makes for the history graphs,
+    with minimal_response and the compressed state format.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import history
+
+    states_to_write = 10**5
+    entity_count = 200
+    attributes = {
+        "state_class": "measurement",
+        "unit_of_measurement": "W",
+        "device_class": "power",
+        "friendly_name": "Power consumption of the benchmark device",
+    }
+
+    with TemporaryDirectory() as config_dir:
+        instance = await _async_setup_recorder(hass, config_dir)
+        await _async_write_states(
+            hass, instance, states_to_write, entity_count, attributes
+        )
+        entity_ids = [f"sensor.benchmark_{idx}" for idx in range(entity_count)]
+        start_time = dt_util.utcnow() - timedelta(days=7)
+
+        start = timer()
+        result = await instance.async_add_executor_job(
+            partial(
+                history.get_significant_states,
+                hass,
+                start_time,
+                entity_ids=entity_ids,
+                minimal_response=True,
+                compressed_state_format=True,
+            )
+        )
+        runtime = timer() - start
+        print(f"Fetched {sum(len(states) for states in result.values())} states")
+        await hass.async_stop()
+
+    return runtime
+
+
+@benchmark
+async def mqtt_retained_message_burst(hass):
+    """Replay a burst of 50k retained messages received by the paho thread.
+
+    Simulates the flood of retained messages after reconnecting to a
+    broker with 2000 discovered devices, without a broker.
+    """
+    # pylint: disable=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    from homeassistant import config_entries
+    from homeassistant.components.mqtt.client import MQTT
+    from homeassistant.components.mqtt.util import get_mqtt_data
+
+    # pylint: enable=import-outside-toplevel
+
+    messages_to_receive = 50000
+    device_count = 2000
+    conf = {"broker": "localhost", "port": 1883, "keepalive": 60}
+    entry = config_entries.ConfigEntry(1, "mqtt", "MQTT", conf, "user")
+    get_mqtt_data(hass, True)
+    client = MQTT(hass, entry, conf)
+    received = 0
+    all_received = asyncio.Event()
+
+    @core.callback
+    def _message_received(msg):
+        """Count the received messages."""
+        nonlocal received
+        received += 1
+        if received == messages_to_receive:
+            all_received.set()
+
+    for idx in range(device_count):
+        await client.async_subscribe(f"zigbee2mqtt/device_{idx}", _message_received, 0)
+    await client.async_subscribe("homeassistant/+/+/config", _message_received, 0)
+    await client.async_subscribe("tasmota/discovery/#", _message_received, 0)
+
+    messages = []
+    for idx in range(messages_to_receive):
+        msg = MQTTMessage(topic=f"zigbee2mqtt/device_{idx % device_count}".encode())
+        msg.payload = b'{"state": "ON", "brightness": 254, "linkquality": 120}'
+        msg.retain = True
+        messages.append(msg)
+
+    def _receive_messages():
+        """Receive the messages like the paho thread."""
+        for msg in messages:
+            client._mqtt_on_message(None, None, msg)  # pylint: disable=protected-access
+
+    start = timer()
+    await hass.async_add_executor_job(_receive_messages)
+    await all_received.wait()
+    runtime = timer() - start
+    print(f"Handled {messages_to_receive / runtime:.0f} messages/s")
+    client.cleanup()
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -208,7 +208,7 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        component = await integration.async_get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}")
         return False
@@ -342,7 +342,7 @@ async def async_prepare_setup_platform(
         return None
 
     try:
-        platform = integration.get_platform(domain)
+        platform = await integration.async_get_platform(domain)
     except ImportError as exc:
         log_error(f"Platform not found ({exc}).")
         return None
@@ -355,7 +355,7 @@ async def async_prepare_setup_platform(
     # If the integration is not set up yet, and can be set up, set it up.
     if integration.domain not in hass.config.components:
         try:
-            component = integration.get_component()
+            component = await integration.async_get_component()
         except ImportError as exc:
             log_error(f"Unable to import the component ({exc}).")
             return None
@@ -1,11 +1,20 @@
 """Helpers to generate ulids."""
 from __future__ import annotations
 
+from random import getrandbits
 import time
 
 from ulid_transform import bytes_to_ulid, ulid_at_time, ulid_hex, ulid_to_bytes
 
-__all__ = ["ulid", "ulid_hex", "ulid_at_time", "ulid_to_bytes", "bytes_to_ulid"]
+__all__ = [
+    "ulid",
+    "ulid_hex",
+    "ulid_at_time",
+    "ulid_to_bytes",
+    "bytes_to_ulid",
+    "ulid_randomness",
+    "ulid_from_randomness",
+]
 
 
 def ulid(timestamp: float | None = None) -> str:
@@ -26,3 +35,20 @@ def ulid(timestamp: float | None = None) -> str:
     ulid.parse(ulid_util.ulid())
     """
     return ulid_at_time(timestamp or time.time())
+
+
+def ulid_randomness() -> int:
+    """Generate the 80 random bits of a ULID."""
+    return getrandbits(80)
+
+
+def ulid_from_randomness(timestamp: float, randomness: int) -> str:
+    """Generate a ULID from a timestamp and random bits from ulid_randomness.
+
+    The same timestamp and random bits always result in the same ULID,
+    which allows a ULID to be generated only when it is used.
+    """
+    return bytes_to_ulid(
+        int(timestamp * 1000).to_bytes(6, byteorder="big")
+        + randomness.to_bytes(10, byteorder="big")
+    )
@@ -16,6 +16,7 @@ from . import (
     dhcp,
     json,
     manifest,
+    manifests,
     metadata,
     mqtt,
     mypy_config,
@@ -44,6 +45,7 @@ INTEGRATION_PLUGINS = [
     usb,
     zeroconf,
     config_flow,
+    manifests,
 ]
 HASS_PLUGINS = [
     coverage,
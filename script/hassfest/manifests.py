@@ -0,0 +1,46 @@
+"""Generate the index of the manifests of built-in integrations.
+
+Built-in integrations are resolved from this index, so it must be generated
+again with python3 -m script.hassfest after a manifest.json is changed.
+Validation fails when the index is out of date.
+"""
+from __future__ import annotations
+
+import json
+
+from .model import Config, Integration
+
+
+def _generate_and_validate(integrations: dict[str, Integration]) -> str:
+    """Validate and generate the manifest index."""
+    return json.dumps(
+        {
+            integration.path.name: integration.manifest
+            for _, integration in sorted(integrations.items())
+        },
+        indent=2,
+    )
+
+
+def validate(integrations: dict[str, Integration], config: Config) -> None:
+    """Validate the manifest index."""
+    manifests_path = config.root / "homeassistant/generated/manifests.json"
+    config.cache["manifests"] = content = _generate_and_validate(integrations)
+
+    if config.specific_integrations:
+        return
+
+    with open(str(manifests_path)) as fp:
+        if fp.read() != content + "\n":
+            config.add_error(
+                "manifests",
+                "File manifests.json is not up to date. Run python3 -m script.hassfest",
+                fixable=True,
+            )
+
+
+def generate(integrations: dict[str, Integration], config: Config) -> None:
+    """Generate the manifest index."""
+    manifests_path = config.root / "homeassistant/generated/manifests.json"
+    with open(str(manifests_path), "w") as fp:
+        fp.write(f"{config.cache['manifests']}\n")
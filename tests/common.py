@@ -542,7 +542,7 @@ def mock_device_registry(
     fixture instead.
     """
     registry = dr.DeviceRegistry(hass)
-    registry.devices = dr.DeviceRegistryItems()
+    registry.devices = dr.ActiveDeviceRegistryItems()
     if mock_entries is None:
         mock_entries = {}
     for key, entry in mock_entries.items():
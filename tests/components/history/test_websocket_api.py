@@ -1,6 +1,6 @@
 """The tests the History component websocket_api."""
 # pylint: disable=protected-access,invalid-name
-from datetime import timedelta
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 import async_timeout
@@ -539,6 +539,125 @@ async def test_history_stream_historical_only(
     }
 
 
+async def _async_record_numeric_states(hass: HomeAssistant, start: datetime) -> None:
+    """Record numeric states one second apart for downsampling."""
+    for idx, state in enumerate(
+        ("10", "12", "30", "11", "unavailable", "14", "2", "15", "13", "16", "17", "18")
+    ):
+        with freeze_time(start + timedelta(seconds=idx)):
+            hass.states.async_set("sensor.power", state, {"unit_of_measurement": "W"})
+            await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+
+async def test_history_during_period_max_points(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history_during_period downsamples numeric states with max_points."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await _async_record_numeric_states(hass, now + timedelta(seconds=1))
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "significant_changes_only": False,
+            "minimal_response": True,
+            "no_attributes": True,
+            "max_points": 6,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    # The minimum and maximum of each of the two buckets are kept, and
+    # the first, last and non-numeric states are never dropped
+    assert [state["s"] for state in response["result"]["sensor.power"]] == [
+        "10",
+        "30",
+        "11",
+        "unavailable",
+        "14",
+        "2",
+        "17",
+        "18",
+    ]
+    assert (
+        response["result"]["sensor.power"][-1]["lu"]
+        == (now + timedelta(seconds=12)).timestamp()
+    )
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "significant_changes_only": False,
+            "minimal_response": True,
+            "no_attributes": True,
+            "max_points": 12,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert len(response["result"]["sensor.power"]) == 12
+
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "max_points": 3,
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+async def test_history_stream_historical_only_max_points(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream downsamples numeric states with max_points."""
+    now = dt_util.utcnow() - timedelta(minutes=1)
+    await async_setup_component(hass, "history", {})
+    await _async_record_numeric_states(hass, now + timedelta(seconds=1))
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": now.isoformat(),
+            "end_time": (now + timedelta(seconds=13)).isoformat(),
+            "entity_ids": ["sensor.power"],
+            "significant_changes_only": False,
+            "minimal_response": True,
+            "no_attributes": True,
+            "max_points": 6,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert response["type"] == "event"
+    assert [state["s"] for state in response["event"]["states"]["sensor.power"]] == [
+        "10",
+        "30",
+        "11",
+        "unavailable",
+        "14",
+        "2",
+        "17",
+        "18",
+    ]
+
+
 async def test_history_stream_significant_domain_historical_only(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
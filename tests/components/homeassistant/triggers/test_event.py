@@ -202,6 +202,36 @@ async def test_if_fires_on_event_with_data_and_context(
     assert len(calls) == 1
 
 
+async def test_if_fires_on_all_events_with_data(hass: HomeAssistant, calls) -> None:
+    """Test the firing of all events with data."""
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: {
+                "trigger": {
+                    "platform": "event",
+                    "event_type": "*",
+                    "event_data": {"some_attr": "some_value"},
+                },
+                "action": {"service": "test.automation"},
+            }
+        },
+    )
+
+    hass.bus.async_fire("test_event", {"some_attr": "some_value", "another": "value"})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    hass.bus.async_fire("other_event", {"some_attr": "some_value"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    hass.bus.async_fire("test_event", {"some_attr": "other_value"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
 async def test_if_fires_on_event_with_templated_data_and_context(
     hass: HomeAssistant, calls, context_with_user
 ) -> None:
@@ -14,6 +14,7 @@ import voluptuous as vol
 from homeassistant.components import logbook, recorder
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
+from homeassistant.components.logbook import processor
 from homeassistant.components.logbook.models import LazyEventPartialState
 from homeassistant.components.logbook.processor import EventProcessor
 from homeassistant.components.logbook.queries.common import PSEUDO_EVENT_STATE_CHANGED
@@ -2964,3 +2965,24 @@ async def test_logbook_with_non_iterable_entity_filter(
         },
     )
     await hass.async_block_till_done()
+
+
+async def test_context_lookup_forgets_least_recently_seen_contexts(
+    hass: HomeAssistant,
+) -> None:
+    """Test the context lookup is bounded and forgets the oldest contexts."""
+    context_lookup = processor.ContextLookup(hass)
+    rows = [
+        MockRow(EVENT_LOGBOOK_ENTRY, context=ha.Context()),
+        MockRow(EVENT_LOGBOOK_ENTRY, context=ha.Context()),
+        MockRow(EVENT_LOGBOOK_ENTRY, context=ha.Context()),
+    ]
+    with patch.object(processor, "MAX_CONTEXT_LOOKUP_SIZE", 2):
+        context_ids = [context_lookup.memorize(row) for row in rows[:2]]
+        # Seeing the first context again makes it the most recently seen
+        assert context_lookup.memorize(rows[0]) == context_ids[0]
+        context_ids.append(context_lookup.memorize(rows[2]))
+
+    assert context_lookup.get(context_ids[0]) is rows[0]
+    assert context_lookup.get(context_ids[1]) is None
+    assert context_lookup.get(context_ids[2]) is rows[2]
@@ -253,6 +253,101 @@ async def test_get_events(
     assert isinstance(results[0]["when"], float)
 
 
+async def test_get_events_big_query(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test logbook get_events for a big query is fetched in chunks."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    for days_ago in (3, 2):
+        with freeze_time(now - timedelta(days=days_ago, hours=12)):
+            hass.states.async_set("binary_sensor.door", STATE_ON)
+            await hass.async_block_till_done()
+            hass.states.async_set("binary_sensor.door", str(days_ago))
+            await hass.async_block_till_done()
+    hass.states.async_set("binary_sensor.door", STATE_OFF)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    with patch.object(
+        websocket_api.EventProcessor,
+        "get_events",
+        autospec=True,
+        side_effect=websocket_api.EventProcessor.get_events,
+    ) as get_events_mock:
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "logbook/get_events",
+                "start_time": (now - timedelta(days=4)).isoformat(),
+            }
+        )
+        response = await client.receive_json()
+
+    assert response["success"]
+    assert [(event["entity_id"], event["state"]) for event in response["result"]] == [
+        ("binary_sensor.door", "3"),
+        ("binary_sensor.door", STATE_ON),
+        ("binary_sensor.door", "2"),
+        ("binary_sensor.door", STATE_OFF),
+    ]
+    assert get_events_mock.call_count == 4
+
+
+async def test_get_events_big_query_chunk_boundaries(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test logbook get_events for a big query includes events at chunk boundaries."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    start_time = now - timedelta(days=4)
+    # The first states have no old state and are not in the logbook
+    with freeze_time(now - timedelta(days=5)):
+        hass.states.async_set("binary_sensor.door", STATE_OFF)
+        hass.states.async_set("binary_sensor.window", STATE_OFF)
+        await hass.async_block_till_done()
+    for days_ago in (3, 2):
+        with freeze_time(now - timedelta(days=days_ago)):
+            hass.states.async_set("binary_sensor.door", str(days_ago))
+            await hass.async_block_till_done()
+        with freeze_time(now - timedelta(days=days_ago, microseconds=1)):
+            hass.states.async_set("binary_sensor.window", str(days_ago))
+            await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/get_events",
+            "start_time": start_time.isoformat(),
+        }
+    )
+    response = await client.receive_json()
+
+    assert response["success"]
+    assert [(event["entity_id"], event["state"]) for event in response["result"]] == [
+        ("binary_sensor.window", "3"),
+        ("binary_sensor.door", "3"),
+        ("binary_sensor.window", "2"),
+        ("binary_sensor.door", "2"),
+    ]
+
+
 async def test_get_events_entities_filtered_away(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
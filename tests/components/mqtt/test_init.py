@@ -1242,6 +1242,113 @@ async def test_subscribe_topic_sys_root_and_wildcard_subtree_topic(
     assert calls[0].payload == "test-payload"
 
 
+async def test_subscribe_unsubscribe_overlapping_wildcard_topics(
+    hass: HomeAssistant,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+    calls: list[ReceiveMessage],
+    record_calls: MessageCallbackType,
+) -> None:
+    """Test wildcard subscriptions sharing topic levels are matched and removed."""
+    await mqtt_mock_entry_no_yaml_config()
+    unsub_level = await mqtt.async_subscribe(hass, "test-topic/+/state", record_calls)
+    unsub_subtree = await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+    unsub_subtree_again = await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+
+    async_fire_mqtt_message(hass, "test-topic/device/state", "test-payload")
+    await hass.async_block_till_done()
+    assert [call.subscribed_topic for call in calls] == [
+        "test-topic/+/state",
+        "test-topic/#",
+        "test-topic/#",
+    ]
+
+    calls.clear()
+    unsub_subtree()
+    async_fire_mqtt_message(hass, "test-topic/device/state", "test-payload")
+    await hass.async_block_till_done()
+    assert [call.subscribed_topic for call in calls] == [
+        "test-topic/+/state",
+        "test-topic/#",
+    ]
+
+    calls.clear()
+    unsub_level()
+    unsub_subtree_again()
+    async_fire_mqtt_message(hass, "test-topic/device/state", "test-payload")
+    await hass.async_block_till_done()
+    assert not calls
+
+    with pytest.raises(HomeAssistantError):
+        unsub_level()
+
+
+async def test_handle_messages_from_paho_in_batches(
+    hass: HomeAssistant,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+    calls: list[ReceiveMessage],
+    record_calls: MessageCallbackType,
+) -> None:
+    """Test messages received by paho are handled in batches in order."""
+    # pylint: disable-next=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    await mqtt_mock_entry_no_yaml_config()
+    await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+    mqtt_client = hass.data["mqtt"].client
+
+    with patch("homeassistant.components.mqtt.client.MAX_MESSAGES_PER_BATCH", 100):
+        for idx in range(1000):
+            msg = MQTTMessage(topic=f"test-topic/{idx}".encode())
+            msg.payload = str(idx).encode()
+            mqtt_client._mqtt_on_message(None, None, msg)
+        assert not calls
+        # The event loop is woken up once and handles a batch
+        # before the next batch is scheduled
+        await asyncio.sleep(0)
+        assert len(calls) == 100
+        for _ in range(9):
+            await asyncio.sleep(0)
+        await hass.async_block_till_done()
+
+    assert [call.payload for call in calls] == [str(idx) for idx in range(1000)]
+
+
+async def test_handle_messages_from_paho_after_callback_error(
+    hass: HomeAssistant,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+    calls: list[ReceiveMessage],
+    record_calls: MessageCallbackType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failing message callback does not stop handling the messages."""
+    # pylint: disable-next=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    @callback
+    def raise_error(msg: ReceiveMessage) -> None:
+        """Raise an error."""
+        raise ValueError("Boom")
+
+    await mqtt_mock_entry_no_yaml_config()
+    await mqtt.async_subscribe(hass, "test-topic/bad", raise_error)
+    await mqtt.async_subscribe(hass, "test-topic/good", record_calls)
+    mqtt_client = hass.data["mqtt"].client
+
+    for topic in ("test-topic/bad", "test-topic/good"):
+        msg = MQTTMessage(topic=topic.encode())
+        msg.payload = b"batch"
+        mqtt_client._mqtt_on_message(None, None, msg)
+    await hass.async_block_till_done()
+    assert [call.payload for call in calls] == ["batch"]
+    assert "Exception while handling message on topic test-topic/bad" in caplog.text
+
+    msg = MQTTMessage(topic=b"test-topic/good")
+    msg.payload = b"next batch"
+    mqtt_client._mqtt_on_message(None, None, msg)
+    await hass.async_block_till_done()
+    assert [call.payload for call in calls] == ["batch", "next batch"]
+
+
 async def test_subscribe_special_characters(
     hass: HomeAssistant,
     mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
@@ -0,0 +1,15 @@
+"""Fixtures for the recorder component tests."""
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def mock_recorder_storage(hass_storage: dict[str, Any]) -> dict[str, Any]:
+    """Mock storage so the id caches are not saved to the testing config.
+
+    Many tests create their own instance of Home Assistant with an
+    on-disk database which would otherwise save the id cache snapshot
+    at shutdown.
+    """
+    return hass_storage
@@ -63,7 +63,7 @@ async def _async_get_states(
             attr_cache = {}
             return [
                 klass(row, attr_cache, None)
-                for row in history._get_rows_with_session(
+                for row in history.legacy._get_rows_with_session(
                     hass,
                     session,
                     utc_point_in_time,
@@ -477,6 +477,49 @@ def test_get_significant_states_minimal_response(
     )
 
 
+@pytest.mark.parametrize("compressed_state_format", [True, False])
+def test_get_significant_states_minimal_response_without_initial_attributes(
+    compressed_state_format: bool, hass_recorder: Callable[..., HomeAssistant]
+) -> None:
+    """Test minimal response fetches the attributes of the first state only.
+
+    When none of the entities need the attributes of every state the
+    states are fetched without attributes and only the first state of
+    each entity is fetched with its attributes.
+    """
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    entity_ids = ["media_player.test", "media_player.test3"]
+    hist = history.get_significant_states(
+        hass,
+        zero,
+        four,
+        entity_ids,
+        minimal_response=True,
+        compressed_state_format=compressed_state_format,
+    )
+    full_hist = history.get_significant_states(
+        hass,
+        zero,
+        four,
+        entity_ids,
+        compressed_state_format=compressed_state_format,
+    )
+    attr_key = "a" if compressed_state_format else "attributes"
+    for entity_id in entity_ids:
+        assert len(hist[entity_id]) == len(states[entity_id])
+        first_state = hist[entity_id][0]
+        if compressed_state_format:
+            assert first_state == full_hist[entity_id][0]
+            attributes = first_state["a"]
+        else:
+            assert_states_equal_without_context(states[entity_id][0], first_state)
+            attributes = first_state.attributes
+        assert attributes == {"media_title": str(sentinel.mt1)}
+        for state_idx in range(1, len(states[entity_id])):
+            assert attr_key not in hist[entity_id][state_idx]
+
+
 @pytest.mark.parametrize("time_zone", ["Europe/Berlin", "US/Hawaii", "UTC"])
 def test_get_significant_states_with_initial(
     time_zone, hass_recorder: Callable[..., HomeAssistant]
@@ -782,6 +825,9 @@ async def test_state_changes_during_period_query_during_migration_to_schema_25(
         return
 
     instance = await async_setup_recorder_instance(hass, {})
+    # Schema 25 predates the states_meta table so
+    # only the legacy history queries can be used
+    instance.states_meta_manager.active = False
 
     start = dt_util.utcnow()
     point = start + timedelta(seconds=1)
@@ -837,6 +883,9 @@ async def test_get_states_query_during_migration_to_schema_25(
         return
 
     instance = await async_setup_recorder_instance(hass, {})
+    # Schema 25 predates the states_meta table so
+    # only the legacy history queries can be used
+    instance.states_meta_manager.active = False
 
     start = dt_util.utcnow()
     point = start + timedelta(seconds=1)
@@ -888,6 +937,9 @@ async def test_get_states_query_during_migration_to_schema_25_multiple_entities(
         return
 
     instance = await async_setup_recorder_instance(hass, {})
+    # Schema 25 predates the states_meta table so
+    # only the legacy history queries can be used
+    instance.states_meta_manager.active = False
 
     start = dt_util.utcnow()
     point = start + timedelta(seconds=1)
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import sqlite3
 import threading
-from typing import cast
+from typing import Any, cast
 from unittest.mock import Mock, patch
 
 import pytest
@@ -35,6 +35,10 @@ from homeassistant.components.recorder.const import (
     KEEPALIVE_TIME,
     SupportedDialect,
 )
+from homeassistant.components.recorder.core import (
+    ID_CACHE_STORAGE_KEY,
+    ID_CACHE_STORAGE_VERSION,
+)
 from homeassistant.components.recorder.db_schema import (
     SCHEMA_VERSION,
     EventData,
@@ -42,9 +46,11 @@ from homeassistant.components.recorder.db_schema import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
 )
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_DISABLE,
     SERVICE_ENABLE,
@@ -63,6 +69,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState, Event, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er, recorder as recorder_helper
+from homeassistant.helpers.storage import Store
 from homeassistant.setup import async_setup_component, setup_component
 from homeassistant.util import dt as dt_util
 
@@ -351,17 +358,12 @@ def test_saving_state_with_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
-
     with patch("time.sleep"), patch.object(
-        get_instance(hass).event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        get_instance(hass),
+        "_insert_pending_states",
+        side_effect=OperationalError(
+            "insert the state", "fake params", "forced to fail"
+        ),
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -485,7 +487,7 @@ def test_saving_event(hass_recorder: Callable[..., HomeAssistant]) -> None:
     with session_scope(hass=hass) as session:
         for select_event, event_data in (
             session.query(Events, EventData)
-            .filter_by(event_type=event_type)
+            .filter(Events.event_type_id.in_(select_event_type_ids((event_type,))))
             .outerjoin(EventData, Events.data_id == EventData.data_id)
         ):
             select_event = cast(Events, select_event)
@@ -754,14 +756,65 @@ def test_saving_state_and_removing_entity(
     with session_scope(hass=hass) as session:
         states = list(session.query(States))
         assert len(states) == 3
-        assert states[0].entity_id == entity_id
+        assert states[0].states_meta_rel.entity_id == entity_id
         assert states[0].state == STATE_LOCKED
-        assert states[1].entity_id == entity_id
+        assert states[1].states_meta_rel.entity_id == entity_id
         assert states[1].state == STATE_UNLOCKED
-        assert states[2].entity_id == entity_id
+        assert states[2].states_meta_rel.entity_id == entity_id
         assert states[2].state is None
 
 
+@pytest.mark.parametrize("insert_executemany_returning", [True, False])
+def test_saving_many_states_for_the_same_entity_in_one_commit(
+    hass_recorder: Callable[..., HomeAssistant], insert_executemany_returning: bool
+) -> None:
+    """Test states of the same entity in one commit are linked to the old state."""
+    hass = hass_recorder()
+    instance = get_instance(hass)
+    assert instance.engine is not None
+
+    with patch.object(
+        type(instance.engine.dialect),
+        "insert_executemany_returning",
+        insert_executemany_returning,
+    ):
+        hass.states.set("lock.mine", STATE_LOCKED)
+        hass.states.set("lock.other", STATE_LOCKED)
+        hass.states.set("lock.mine", STATE_UNLOCKED)
+        hass.states.remove("lock.mine")
+        hass.states.set("lock.mine", STATE_LOCKED)
+        hass.states.set("lock.other", STATE_UNLOCKED)
+        wait_recording_done(hass)
+        hass.states.set("lock.mine", STATE_UNLOCKED)
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        by_entity: dict[str, list[tuple[int, str | None, int | None]]] = {}
+        for state in session.query(States).order_by(States.last_updated_ts):
+            by_entity.setdefault(state.states_meta_rel.entity_id, []).append(
+                (state.state_id, state.state, state.old_state_id)
+            )
+
+    mine = by_entity["lock.mine"]
+    assert [state for _, state, _ in mine] == [
+        STATE_LOCKED,
+        STATE_UNLOCKED,
+        None,
+        STATE_LOCKED,
+        STATE_UNLOCKED,
+    ]
+    assert mine[0][2] is None
+    assert mine[1][2] == mine[0][0]
+    assert mine[2][2] == mine[1][0]
+    assert mine[3][2] is None
+    assert mine[4][2] == mine[3][0]
+    other = by_entity["lock.other"]
+    assert [state for _, state, _ in other] == [STATE_LOCKED, STATE_UNLOCKED]
+    assert other[0][2] is None
+    assert other[1][2] == other[0][0]
+    assert instance._old_states["lock.mine"].state_id == mine[4][0]
+
+
 def test_saving_state_with_oversized_attributes(
     hass_recorder: Callable[..., HomeAssistant], caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -1269,10 +1322,10 @@ def test_saving_sets_old_state(hass_recorder: Callable[..., HomeAssistant]) -> N
         states = list(session.query(States))
         assert len(states) == 4
 
-        assert states[0].entity_id == "test.one"
-        assert states[1].entity_id == "test.two"
-        assert states[2].entity_id == "test.one"
-        assert states[3].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.one"
+        assert states[1].states_meta_rel.entity_id == "test.two"
+        assert states[2].states_meta_rel.entity_id == "test.one"
+        assert states[3].states_meta_rel.entity_id == "test.two"
 
         assert states[0].old_state_id is None
         assert states[1].old_state_id is None
@@ -1298,8 +1351,8 @@ def test_saving_state_with_serializable_data(
         states = list(session.query(States))
         assert len(states) == 2
 
-        assert states[0].entity_id == "test.two"
-        assert states[1].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.two"
+        assert states[1].states_meta_rel.entity_id == "test.two"
         assert states[0].old_state_id is None
         assert states[1].old_state_id == states[0].state_id
 
@@ -1349,7 +1402,11 @@ def test_service_disable_events_not_recording(
     event = events[0]
 
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
+        db_events = list(
+            session.query(Events).filter(
+                Events.event_type_id.in_(select_event_type_ids((event_type,)))
+            )
+        )
         assert len(db_events) == 0
 
     assert hass.services.call(
@@ -1371,7 +1428,7 @@ def test_service_disable_events_not_recording(
     with session_scope(hass=hass) as session:
         for select_event, event_data in (
             session.query(Events, EventData)
-            .filter_by(event_type=event_type)
+            .filter(Events.event_type_id.in_(select_event_type_ids((event_type,))))
             .outerjoin(EventData, Events.data_id == EventData.data_id)
         ):
             select_event = cast(Events, select_event)
@@ -1572,7 +1629,11 @@ def test_entity_id_filter(hass_recorder: Callable[..., HomeAssistant]) -> None:
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type="hello"))
+            db_events = list(
+                session.query(Events).filter(
+                    Events.event_type_id.in_(select_event_type_ids(("hello",)))
+                )
+            )
             assert len(db_events) == idx + 1, data
 
     for data in (
@@ -1583,7 +1644,11 @@ def test_entity_id_filter(hass_recorder: Callable[..., HomeAssistant]) -> None:
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type="hello"))
+            db_events = list(
+                session.query(Events).filter(
+                    Events.event_type_id.in_(select_event_type_ids(("hello",)))
+                )
+            )
             # Keep referring idx + 1, as no new events are being added
             assert len(db_events) == idx + 1, data
 
@@ -1611,7 +1676,11 @@ async def test_database_lock_and_unlock(
 
     def _get_db_events():
         with session_scope(hass=hass) as session:
-            return list(session.query(Events).filter_by(event_type=event_type))
+            return list(
+                session.query(Events).filter(
+                    Events.event_type_id.in_(select_event_type_ids((event_type,)))
+                )
+            )
 
     instance = get_instance(hass)
 
@@ -1661,7 +1730,11 @@ async def test_database_lock_and_overflow(
 
     def _get_db_events():
         with session_scope(hass=hass) as session:
-            return list(session.query(Events).filter_by(event_type=event_type))
+            return list(
+                session.query(Events).filter(
+                    Events.event_type_id.in_(select_event_type_ids((event_type,)))
+                )
+            )
 
     instance = get_instance(hass)
 
@@ -1795,7 +1868,7 @@ def test_deduplication_event_data_inside_commit_interval(
     with session_scope(hass=hass) as session:
         events = list(
             session.query(Events)
-            .filter(Events.event_type == "this_event")
+            .filter(Events.event_type_id.in_(select_event_type_ids(("this_event",))))
             .outerjoin(EventData, (Events.data_id == EventData.data_id))
         )
         assert len(events) == 20
@@ -1803,9 +1876,11 @@ def test_deduplication_event_data_inside_commit_interval(
         assert all(event.data_id == first_data_id for event in events)
 
 
-# Patch STATE_ATTRIBUTES_ID_CACHE_SIZE since otherwise
+# Patch CACHE_SIZE since otherwise
 # the CI can fail because the test takes too long to run
-@patch("homeassistant.components.recorder.core.STATE_ATTRIBUTES_ID_CACHE_SIZE", 5)
+@patch(
+    "homeassistant.components.recorder.table_managers.state_attributes.CACHE_SIZE", 5
+)
 def test_deduplication_state_attributes_inside_commit_interval(
     hass_recorder: Callable[..., HomeAssistant], caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -1832,7 +1907,8 @@ def test_deduplication_state_attributes_inside_commit_interval(
     with session_scope(hass=hass) as session:
         states = list(
             session.query(States)
-            .filter(States.entity_id == entity_id)
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
             .outerjoin(
                 StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
             )
@@ -1858,7 +1934,11 @@ async def test_async_block_till_done(
 
     def _fetch_states():
         with session_scope(hass=hass) as session:
-            return list(session.query(States).filter(States.entity_id == entity_id))
+            return list(
+                session.query(States)
+                .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == entity_id)
+            )
 
     await async_block_recorder(hass, 0.1)
     await instance.async_block_till_done()
@@ -2089,4 +2169,113 @@ async def test_lru_increases_with_many_entities(
         async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
         await async_wait_recording_done(hass)
 
-    assert recorder_mock._state_attributes_ids.get_size() == mock_entity_count * 2
+    assert (
+        recorder_mock.state_attributes_manager._id_map.get_size()
+        == mock_entity_count * 2
+    )
+
+
+async def test_lru_grows_when_full_and_ids_are_found_in_the_database(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test the attributes LRU cache doubles when it is too small for the working set."""
+    state_attributes_manager = recorder_mock.state_attributes_manager
+    state_attributes_manager._id_map.set_size(2)
+    for attr in range(3):
+        hass.states.async_set("test.recorder", "on", {"attr": attr})
+        await async_wait_recording_done(hass)
+    hass.states.async_set("test.recorder", "off", {"attr": 0})
+    await async_wait_recording_done(hass)
+
+    with patch.object(hass.states, "async_entity_ids_count", return_value=0):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+        await async_wait_recording_done(hass)
+
+    assert state_attributes_manager._id_map.get_size() == 4
+    assert state_attributes_manager.cache_misses >= 4
+    assert state_attributes_manager.cache_hit_rate is not None
+
+
+async def test_id_caches_are_saved_at_shutdown(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the attributes and event data ids are saved at shutdown."""
+    hass.states.async_set("test.recorder", "on", {"attr": 1})
+    hass.bus.async_fire("custom_event", {"data": 1})
+    await async_wait_recording_done(hass)
+
+    await hass.async_stop()
+
+    snapshot = hass_storage[ID_CACHE_STORAGE_KEY]["data"]
+    state_attributes = snapshot["state_attributes"]
+    assert state_attributes["ids"]
+    assert state_attributes["max_id"] == max(state_attributes["ids"])
+    assert snapshot["event_data"]["ids"]
+
+
+async def test_id_caches_are_restored_from_the_last_run(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the attributes and event data ids from the last run warm the caches."""
+    hass.states.async_set("test.recorder", "on", {"attr": 1})
+    hass.bus.async_fire("custom_event", {"data": 1})
+    await async_wait_recording_done(hass)
+
+    state_attributes_manager = recorder_mock.state_attributes_manager
+    event_data_manager = recorder_mock.event_data_manager
+    cached_attributes = dict(state_attributes_manager._id_map.items())
+    cached_event_data = dict(event_data_manager._id_map.items())
+    assert cached_attributes
+    assert cached_event_data
+    hass_storage[ID_CACHE_STORAGE_KEY] = {
+        "version": ID_CACHE_STORAGE_VERSION,
+        "key": ID_CACHE_STORAGE_KEY,
+        "data": {
+            "state_attributes": state_attributes_manager.snapshot(),
+            "event_data": event_data_manager.snapshot(),
+        },
+    }
+    state_attributes_manager.reset()
+    event_data_manager.reset()
+
+    # The store was already loaded at startup
+    with patch.object(
+        recorder_mock,
+        "_id_cache_store",
+        Store(hass, ID_CACHE_STORAGE_VERSION, ID_CACHE_STORAGE_KEY),
+    ):
+        await hass.async_add_executor_job(recorder_mock._restore_id_caches)
+
+    assert dict(state_attributes_manager._id_map.items()) == cached_attributes
+    assert dict(event_data_manager._id_map.items()) == cached_event_data
+
+
+async def test_id_caches_ignore_snapshot_from_another_database(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test a snapshot with ids beyond the max id in the database is ignored."""
+    hass.states.async_set("test.recorder", "on", {"attr": 1})
+    await async_wait_recording_done(hass)
+
+    state_attributes_manager = recorder_mock.state_attributes_manager
+    snapshot = state_attributes_manager.snapshot()
+    snapshot["max_id"] = snapshot["max_id"] + 1
+    hass_storage[ID_CACHE_STORAGE_KEY] = {
+        "version": ID_CACHE_STORAGE_VERSION,
+        "key": ID_CACHE_STORAGE_KEY,
+        "data": {
+            "state_attributes": snapshot,
+            "event_data": {"size": 0, "max_id": 0, "ids": []},
+        },
+    }
+    state_attributes_manager.reset()
+
+    # The store was already loaded at startup
+    with patch.object(
+        recorder_mock,
+        "_id_cache_store",
+        Store(hass, ID_CACHE_STORAGE_VERSION, ID_CACHE_STORAGE_KEY),
+    ):
+        await hass.async_add_executor_job(recorder_mock._restore_id_caches)
+
+    assert not state_attributes_manager._id_map.items()
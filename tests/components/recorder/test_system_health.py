@@ -23,6 +23,9 @@ async def test_recorder_system_health(
         return
 
     assert await async_setup_component(hass, "system_health", {})
+    hass.states.async_set("test.recorder", "on", {"attr": 1})
+    await async_wait_recording_done(hass)
+    hass.states.async_set("test.recorder", "off", {"attr": 1})
     await async_wait_recording_done(hass)
     info = await get_system_health_info(hass, "recorder")
     instance = get_instance(hass)
@@ -32,6 +35,8 @@ async def test_recorder_system_health(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "state_attributes_cache_hit_rate": "50.0%",
+        "event_data_cache_hit_rate": ANY,
     }
 
 
@@ -58,6 +63,7 @@ async def test_recorder_system_health_alternate_dbms(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "event_data_cache_hit_rate": ANY,
     }
 
 
@@ -89,6 +95,7 @@ async def test_recorder_system_health_db_url_missing_host(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "event_data_cache_hit_rate": ANY,
     }
 
 
@@ -113,4 +120,5 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "event_data_cache_hit_rate": ANY,
     }
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import SQLITE_URL_PREFIX, core, statistics
+from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.core import EVENT_STATE_CHANGED, Event, EventOrigin, State
 from homeassistant.helpers import recorder as recorder_helper
@@ -118,15 +119,21 @@ def test_migrate_times(caplog: pytest.LogCaptureFixture, tmpdir) -> None:
     with session_scope(hass=hass) as session:
         result = list(
             session.query(recorder.db_schema.Events).where(
-                recorder.db_schema.Events.event_type == "custom_event"
+                recorder.db_schema.Events.event_type_id.in_(
+                    select_event_type_ids(("custom_event",))
+                )
             )
         )
         assert len(result) == 1
         assert result[0].time_fired_ts == now_timestamp
         result = list(
-            session.query(recorder.db_schema.States).where(
-                recorder.db_schema.States.entity_id == "sensor.test"
+            session.query(recorder.db_schema.States)
+            .outerjoin(
+                recorder.db_schema.StatesMeta,
+                recorder.db_schema.States.metadata_id
+                == recorder.db_schema.StatesMeta.metadata_id,
             )
+            .where(recorder.db_schema.StatesMeta.entity_id == "sensor.test")
         )
         assert len(result) == 1
         assert result[0].last_changed_ts == one_second_past_timestamp
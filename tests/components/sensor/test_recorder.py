@@ -7,6 +7,7 @@ import math
 from statistics import mean
 from unittest.mock import patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant import loader
@@ -38,7 +39,7 @@ from homeassistant.setup import async_setup_component, setup_component
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM, US_CUSTOMARY_SYSTEM
 
-from tests.common import async_fire_time_changed
+from tests.common import async_fire_time_changed, fire_time_changed
 from tests.components.recorder.common import (
     assert_dict_of_states_equal_without_context_and_last_changed,
     assert_multiple_states_equal_without_context_and_last_changed,
@@ -1767,6 +1768,76 @@ def test_compile_hourly_statistics_unchanged(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+@pytest.mark.parametrize("enable_statistics", [True])
+def test_compile_statistics_from_accumulated_states(
+    hass_recorder: Callable[..., HomeAssistant],
+    caplog: pytest.LogCaptureFixture,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test compiling statistics from the running values of the ended period."""
+    now = dt_util.utcnow()
+    zero = datetime(now.year + 2, 1, 1, 10, 0, tzinfo=dt_util.UTC)
+    period1 = zero + timedelta(minutes=5)
+    period2 = zero + timedelta(minutes=10)
+    freezer.move_to(zero)
+    hass = hass_recorder()
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)  # Wait for the sensor recorder platform to be added
+
+    def run_tasks_at_time(test_time: datetime) -> None:
+        """Advance the clock and run the periodic tasks."""
+        freezer.move_to(test_time)
+        fire_time_changed(hass, test_time)
+        wait_recording_done(hass)
+
+    record_states(hass, zero, "sensor.test1", POWER_SENSOR_ATTRIBUTES)
+    record_states(hass, zero, "sensor.test2", ENERGY_SENSOR_ATTRIBUTES)
+    run_tasks_at_time(period1)
+    run_tasks_at_time(period1 + timedelta(seconds=10))
+    run_tasks_at_time(period2)
+    run_tasks_at_time(period2 + timedelta(seconds=10))
+
+    record_states(hass, period2, "sensor.test1", POWER_SENSOR_ATTRIBUTES, [20, 5, 0])
+    record_states(hass, period2, "sensor.test2", ENERGY_SENSOR_ATTRIBUTES, [10, 20, 40])
+    with patch.object(
+        history,
+        "get_full_significant_states_with_session",
+        wraps=history.get_full_significant_states_with_session,
+    ) as get_history_mock:
+        run_tasks_at_time(period2 + timedelta(minutes=5))
+        run_tasks_at_time(period2 + timedelta(minutes=5, seconds=10))
+    assert get_history_mock.call_count == 0
+
+    stats = statistics_during_period(hass, period2, period="5minute")
+    assert stats == {
+        "sensor.test1": [
+            {
+                "start": process_timestamp(period2).timestamp(),
+                "end": process_timestamp(period2 + timedelta(minutes=5)).timestamp(),
+                "mean": pytest.approx((30 * 5 + 20 * 50 + 5 * 200) / 300),
+                "min": pytest.approx(0),
+                "max": pytest.approx(30),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ],
+        "sensor.test2": [
+            {
+                "start": process_timestamp(period2).timestamp(),
+                "end": process_timestamp(period2 + timedelta(minutes=5)).timestamp(),
+                "mean": None,
+                "min": None,
+                "max": None,
+                "last_reset": None,
+                "state": pytest.approx(40),
+                "sum": pytest.approx(50),
+            }
+        ],
+    }
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+
 def test_compile_hourly_statistics_partially_unavailable(
     hass_recorder: Callable[..., HomeAssistant], caplog: pytest.LogCaptureFixture
 ) -> None:
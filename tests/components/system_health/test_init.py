@@ -61,7 +61,7 @@ async def test_info_endpoint_return_info(
 
     data = await gather_system_health_info(hass, hass_ws_client)
 
-    assert len(data) == 1
+    assert data.keys() == {"homeassistant", "websocket_api"}
     data = data["homeassistant"]
     assert data == {"info": {"hello": True}}
 
@@ -78,7 +78,7 @@ async def test_info_endpoint_register_callback(
     assert await async_setup_component(hass, "system_health", {})
     data = await gather_system_health_info(hass, hass_ws_client)
 
-    assert len(data) == 1
+    assert data.keys() == {"lovelace", "websocket_api"}
     data = data["lovelace"]
     assert data == {"info": {"storage": "YAML"}}
 
@@ -98,7 +98,7 @@ async def test_info_endpoint_register_callback_timeout(
     assert await async_setup_component(hass, "system_health", {})
     data = await gather_system_health_info(hass, hass_ws_client)
 
-    assert len(data) == 1
+    assert data.keys() == {"lovelace", "websocket_api"}
     data = data["lovelace"]
     assert data == {"info": {"error": {"type": "failed", "error": "timeout"}}}
 
@@ -115,7 +115,7 @@ async def test_info_endpoint_register_callback_exc(
     assert await async_setup_component(hass, "system_health", {})
     data = await gather_system_health_info(hass, hass_ws_client)
 
-    assert len(data) == 1
+    assert data.keys() == {"lovelace", "websocket_api"}
     data = data["lovelace"]
     assert data == {"info": {"error": {"type": "failed", "error": "unknown"}}}
 
@@ -0,0 +1,38 @@
+"""Test template system health."""
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+
+
+async def test_system_health_info(hass: HomeAssistant) -> None:
+    """Test system health info reports the template render counters."""
+    assert await async_setup_component(hass, "system_health", {})
+    assert await async_setup_component(
+        hass,
+        "template",
+        {
+            "template": {
+                "sensor": {
+                    "name": "Double",
+                    "state": "{{ states('sensor.a') | int(0) * 2 }}",
+                }
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    info = await get_system_health_info(hass, "template")
+    assert info["tracked_templates"] == 1
+    renders = info["renders"]
+
+    hass.states.async_set("sensor.a", "2")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.double").state == "4"
+
+    info = await get_system_health_info(hass, "template")
+    assert info["tracked_templates"] == 1
+    assert info["renders"] == renders + 1
+    assert info["render_time_ms"] >= 0
+    assert info["slowest_template"] == "{{ states('sensor.a') | int(0) * 2 }}"
+    assert info["slowest_template_renders"] == renders + 1
+    assert info["slowest_template_render_time_ms"] == info["render_time_ms"]
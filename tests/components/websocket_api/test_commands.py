@@ -7,19 +7,22 @@ from async_timeout import timeout
 import pytest
 import voluptuous as vol
 
-from homeassistant.components.websocket_api import const
+from homeassistant.components.websocket_api import const, state_snapshot
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
     TYPE_AUTH_OK,
     TYPE_AUTH_REQUIRED,
 )
 from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
-from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
+from homeassistant.components.websocket_api.entity_subscriptions import (
+    async_get_entity_subscriptions,
+)
+from homeassistant.const import EVENT_STATE_CHANGED, SIGNAL_BOOTSTRAP_INTEGRATIONS
 from homeassistant.core import Context, HomeAssistant, State, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.loader import async_get_integration
+from homeassistant.loader import DATA_LOOP_IMPORT_TIME, async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
 from homeassistant.util.json import json_loads
 
@@ -656,6 +659,95 @@ async def test_get_states_not_allows_nan(hass: HomeAssistant, websocket_client)
     ]
 
 
+async def test_get_states_with_unserializable_state_twice(
+    hass: HomeAssistant, websocket_client
+) -> None:
+    """Test get_states filters an unserializable state on every call."""
+
+    class CannotSerializeMe:
+        """Cannot serialize this."""
+
+    hass.states.async_set("greeting.hello", "world")
+    hass.states.async_set("greeting.bad", "data", {"hello": CannotSerializeMe()})
+    hass.states.async_set("greeting.bye", "universe")
+
+    for msg_id in (5, 6):
+        await websocket_client.send_json({"id": msg_id, "type": "get_states"})
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+        assert msg["success"]
+        assert msg["result"] == [
+            hass.states.get("greeting.hello").as_dict(),
+            hass.states.get("greeting.bye").as_dict(),
+        ]
+
+
+async def test_get_states_reuses_serialized_states(
+    hass: HomeAssistant, websocket_client
+) -> None:
+    """Test get_states only serializes states that changed."""
+    hass.states.async_set("greeting.hello", "world")
+    hass.states.async_set("greeting.bye", "universe")
+
+    with patch(
+        "homeassistant.components.websocket_api.state_snapshot._serialize_state",
+        wraps=state_snapshot._serialize_state,
+    ) as serialize_mock:
+        await websocket_client.send_json({"id": 5, "type": "get_states"})
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+        assert msg["result"] == [
+            hass.states.get("greeting.hello").as_dict(),
+            hass.states.get("greeting.bye").as_dict(),
+        ]
+        assert serialize_mock.call_count == 2
+
+        hass.states.async_set("greeting.bye", "moon")
+        await websocket_client.send_json({"id": 6, "type": "get_states"})
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+        assert msg["result"] == [
+            hass.states.get("greeting.hello").as_dict(),
+            hass.states.get("greeting.bye").as_dict(),
+        ]
+        assert serialize_mock.call_count == 3
+
+        hass.states.async_remove("greeting.bye")
+        hass.states.async_set("greeting.bye", "moon")
+        await websocket_client.send_json({"id": 7, "type": "get_states"})
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+        assert msg["result"] == [
+            hass.states.get("greeting.hello").as_dict(),
+            hass.states.get("greeting.bye").as_dict(),
+        ]
+        assert serialize_mock.call_count == 4
+
+
+async def test_get_states_skips_entities_not_in_state_machine(
+    hass: HomeAssistant, websocket_client
+) -> None:
+    """Test get_states skips state_changed events for unknown entities."""
+    hass.states.async_set("greeting.hello", "world")
+
+    await websocket_client.send_json({"id": 5, "type": "get_states"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.bus.async_fire(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": "greeting.ghost",
+            "old_state": None,
+            "new_state": State("greeting.ghost", "boo"),
+        },
+    )
+    await websocket_client.send_json({"id": 6, "type": "get_states"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == [hass.states.get("greeting.hello").as_dict()]
+
+
 async def test_subscribe_unsubscribe_events_whitelist(
     hass: HomeAssistant, websocket_client, hass_admin_user: MockUser
 ) -> None:
@@ -1064,6 +1156,60 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_shares_listener(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test subscribe_entities subscribers share a single state changed listener."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.living_room", "off")
+    clients = [await hass_ws_client(hass) for _ in range(3)]
+    # The state snapshot keeps listening after the subscribers are gone
+    state_snapshot.async_get_state_snapshot(hass)
+    init_count = sum(hass.bus.async_listeners().values())
+
+    await clients[0].send_json({"id": 5, "type": "subscribe_entities"})
+    await clients[1].send_json({"id": 6, "type": "subscribe_entities"})
+    await clients[2].send_json(
+        {"id": 5, "type": "subscribe_entities", "entity_ids": ["light.kitchen"]}
+    )
+    for client in clients:
+        msg = await client.receive_json()
+        assert msg["type"] == const.TYPE_RESULT
+        assert msg["success"]
+        msg = await client.receive_json()
+        assert msg["type"] == "event"
+
+    assert sum(hass.bus.async_listeners().values()) == init_count + 1
+    subscriptions = async_get_entity_subscriptions(hass)
+    assert subscriptions.subscriber_count == 3
+    assert subscriptions.group_count == 2
+
+    hass.states.async_set("light.living_room", "on")
+    hass.states.async_set("light.kitchen", "on")
+    for client, msg_id in zip(clients[:2], (5, 6)):
+        for entity_id in ("light.living_room", "light.kitchen"):
+            msg = await client.receive_json()
+            assert msg["id"] == msg_id
+            assert msg["type"] == "event"
+            assert msg["event"] == {"c": {entity_id: {"+": ANY}}}
+    msg = await clients[2].receive_json()
+    assert msg["id"] == 5
+    assert msg["event"] == {"c": {"light.kitchen": {"+": ANY}}}
+    assert subscriptions.state_changes == 2
+    assert subscriptions.messages_sent == 5
+
+    for client, msg_id in zip(clients, (5, 6, 5)):
+        await client.send_json(
+            {"id": msg_id + 10, "type": "unsubscribe_events", "subscription": msg_id}
+        )
+        msg = await client.receive_json()
+        assert msg["success"]
+
+    assert subscriptions.subscriber_count == 0
+    assert subscriptions.group_count == 0
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
 async def test_render_template_renders_template(
     hass: HomeAssistant, websocket_client
 ) -> None:
@@ -1756,6 +1902,7 @@ async def test_integration_setup_info(
         "august": datetime.timedelta(seconds=12.5),
         "isy994": datetime.timedelta(seconds=12.8),
     }
+    hass.data[DATA_LOOP_IMPORT_TIME] = {"august": 0.25}
     await websocket_client.send_json({"id": 7, "type": "integration/setup_info"})
 
     msg = await websocket_client.receive_json()
@@ -1763,8 +1910,8 @@ async def test_integration_setup_info(
     assert msg["type"] == const.TYPE_RESULT
     assert msg["success"]
     assert msg["result"] == [
-        {"domain": "august", "seconds": 12.5},
-        {"domain": "isy994", "seconds": 12.8},
+        {"domain": "august", "seconds": 12.5, "loop_import_seconds": 0.25},
+        {"domain": "isy994", "seconds": 12.8, "loop_import_seconds": 0},
     ]
 
 
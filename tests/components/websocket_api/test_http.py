@@ -1,7 +1,11 @@
 """Test Websocket API http module."""
 import asyncio
 from datetime import timedelta
+import json
+import logging
+import re
 from unittest.mock import patch
+import zlib
 
 from aiohttp import ServerDisconnectedError, WSMsgType, web
 import pytest
@@ -155,3 +159,71 @@ async def test_prepare_fail(
         await hass_ws_client(hass)
 
     assert "Timeout preparing request" in caplog.text
+
+
+async def test_sent_messages_are_counted(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the sent messages are counted and logged when disconnecting."""
+    caplog.set_level(logging.DEBUG, "homeassistant.components.websocket_api")
+    websocket_client = await hass_ws_client(hass)
+    await websocket_client.send_json({"id": 5, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "pong"
+    hass.states.async_set("light.kitchen", "on")
+    await websocket_client.send_json({"id": 6, "type": "get_states"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    await websocket_client.close()
+    await hass.async_block_till_done()
+
+    # auth_required, auth_ok, pong and the states
+    assert re.search(
+        r"Sent 4 messages with \d+ bytes, encoding took \d+\.\d{3} seconds",
+        caplog.text,
+    )
+    assert "compression: " in caplog.text
+
+
+async def test_compressed_messages(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test large messages are compressed for clients that support it."""
+    for idx in range(50):
+        hass.states.async_set(f"light.kitchen_{idx}", "on")
+    websocket_client = await hass_ws_client(hass)
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COMPRESSED_MESSAGES: 9},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    # Small messages are sent as JSON text
+    await websocket_client.send_json({"id": 6, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "pong"
+
+    await websocket_client.send_json({"id": 7, "type": "get_states"})
+    msg = await websocket_client.receive()
+    assert msg.type == WSMsgType.BINARY
+    msg = json.loads(zlib.decompress(msg.data))
+    assert msg["id"] == 7
+    assert len(msg["result"]) == 50
+
+
+async def test_messages_not_compressed_by_default(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test large messages are sent as JSON text by default."""
+    for idx in range(50):
+        hass.states.async_set(f"light.kitchen_{idx}", "on")
+    websocket_client = await hass_ws_client(hass)
+    await websocket_client.send_json({"id": 5, "type": "get_states"})
+    msg = await websocket_client.receive_json()
+    assert len(msg["result"]) == 50
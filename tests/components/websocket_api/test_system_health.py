@@ -0,0 +1,52 @@
+"""Tests for websocket API system health."""
+from unittest.mock import ANY
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+from tests.typing import WebSocketGenerator
+
+
+async def test_system_health_info(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test system health info endpoint."""
+    assert await async_setup_component(hass, "websocket_api", {})
+    assert await async_setup_component(hass, "system_health", {})
+    info = await get_system_health_info(hass, "websocket_api")
+    assert info == {
+        "entity_subscribers": 0,
+        "entity_subscriber_groups": 0,
+        "entity_state_changes": 0,
+        "entity_messages_sent": 0,
+        "messages_sent": 0,
+        "bytes_sent": 0,
+        "encode_time": 0,
+    }
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "subscribe_entities"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    msg = await client.receive_json()
+    assert msg["type"] == "event"
+
+    hass.states.async_set("light.kitchen", "on")
+    msg = await client.receive_json()
+    assert msg["id"] == 5
+    assert msg["event"]["a"]["light.kitchen"]["s"] == "on"
+
+    info = await get_system_health_info(hass, "websocket_api")
+    assert info == {
+        "entity_subscribers": 1,
+        "entity_subscriber_groups": 1,
+        "entity_state_changes": 1,
+        "entity_messages_sent": 1,
+        # auth_required, auth_ok, the result, the initial and the changed states
+        "messages_sent": 5,
+        "bytes_sent": ANY,
+        "encode_time": ANY,
+    }
+    assert info["bytes_sent"] > 0
+    assert info["encode_time"] >= 0
@@ -670,6 +670,46 @@ async def test_removing_area_id(device_registry: dr.DeviceRegistry) -> None:
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_for_area_and_config_entry(
+    device_registry: dr.DeviceRegistry,
+) -> None:
+    """Test looking up devices by area and config entry."""
+    entry1 = device_registry.async_get_or_create(
+        config_entry_id="123", identifiers={("bridgeid", "0123")}
+    )
+    entry2 = device_registry.async_get_or_create(
+        config_entry_id="456", identifiers={("bridgeid", "4567")}
+    )
+    entry1 = device_registry.async_update_device(entry1.id, area_id="kitchen")
+    entry2 = device_registry.async_update_device(
+        entry2.id, area_id="kitchen", add_config_entry_id="123"
+    )
+
+    assert dr.async_entries_for_area(device_registry, "kitchen") == [entry1, entry2]
+    assert dr.async_entries_for_config_entry(device_registry, "123") == [
+        entry1,
+        entry2,
+    ]
+    assert dr.async_entries_for_config_entry(device_registry, "456") == [entry2]
+
+    entry1 = device_registry.async_update_device(entry1.id, area_id="bedroom")
+    entry2 = device_registry.async_update_device(
+        entry2.id, remove_config_entry_id="456"
+    )
+    assert dr.async_entries_for_area(device_registry, "kitchen") == [entry2]
+    assert dr.async_entries_for_area(device_registry, "bedroom") == [entry1]
+    assert dr.async_entries_for_config_entry(device_registry, "456") == []
+
+    device_registry.async_clear_area_id("bedroom")
+    assert dr.async_entries_for_area(device_registry, "bedroom") == []
+
+    device_registry.async_remove_device(entry2.id)
+    assert dr.async_entries_for_area(device_registry, "kitchen") == []
+    assert dr.async_entries_for_config_entry(device_registry, "123") == [
+        device_registry.async_get(entry1.id)
+    ]
+
+
 async def test_specifying_via_device_create(device_registry: dr.DeviceRegistry) -> None:
     """Test specifying a via_device and removal of the hub device."""
     via = device_registry.async_get_or_create(
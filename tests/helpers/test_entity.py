@@ -17,12 +17,14 @@ from homeassistant.const import (
 )
 from homeassistant.core import Context, HomeAssistant, HomeAssistantError
 from homeassistant.helpers import device_registry as dr, entity, entity_registry as er
+import homeassistant.util.dt as dt_util
 
 from tests.common import (
     MockConfigEntry,
     MockEntity,
     MockEntityPlatform,
     MockPlatform,
+    async_fire_time_changed,
     get_test_home_assistant,
     mock_registry,
 )
@@ -983,3 +985,156 @@ async def test_repr_using_stringify_state() -> None:
 
     entity = MyEntity(entity_id="test.test", available=False)
     assert str(entity) == "<entity test.test=unavailable>"
+
+
+async def test_friendly_name_updated_with_device(hass: HomeAssistant) -> None:
+    """Test the friendly name follows device renames and device changes."""
+    config_entry = MockConfigEntry(entry_id="super-mock-id")
+    config_entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    other_device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("hue", "5678")},
+        name="Other Device",
+    )
+
+    async def async_setup_entry(hass, config_entry, async_add_entities):
+        """Mock setup entry method."""
+        async_add_entities(
+            [
+                MockEntity(
+                    unique_id="qwer",
+                    device_info={
+                        "identifiers": {("hue", "1234")},
+                        "name": "Device Bla",
+                    },
+                    has_entity_name=True,
+                    name="Entity Blu",
+                ),
+            ]
+        )
+        return True
+
+    platform = MockPlatform(async_setup_entry=async_setup_entry)
+    entity_platform = MockEntityPlatform(
+        hass, platform_name=config_entry.domain, platform=platform
+    )
+
+    assert await entity_platform.async_setup_entry(config_entry)
+    await hass.async_block_till_done()
+
+    entity_id = hass.states.async_entity_ids()[0]
+    assert (
+        hass.states.get(entity_id).attributes[ATTR_FRIENDLY_NAME]
+        == "Device Bla Entity Blu"
+    )
+
+    device = device_registry.async_get_device({("hue", "1234")})
+    device_registry.async_update_device(device.id, name_by_user="Renamed")
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get(entity_id).attributes[ATTR_FRIENDLY_NAME]
+        == "Renamed Entity Blu"
+    )
+
+    entity_registry.async_update_entity(entity_id, device_id=other_device.id)
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get(entity_id).attributes[ATTR_FRIENDLY_NAME]
+        == "Other Device Entity Blu"
+    )
+
+    # The previous device is no longer tracked
+    device_registry.async_update_device(device.id, name_by_user="Renamed again")
+    device_registry.async_update_device(other_device.id, name_by_user="Other")
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get(entity_id).attributes[ATTR_FRIENDLY_NAME] == "Other Entity Blu"
+    )
+
+
+async def test_write_unchanged_state_skipped(hass: HomeAssistant) -> None:
+    """Test writing an unchanged state does not reach the state machine."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent._attr_state = "on"
+    ent.async_write_ha_state()
+    state = hass.states.get("hello.world")
+
+    with patch.object(hass.states, "async_set") as mock_async_set:
+        ent.async_write_ha_state()
+        assert not mock_async_set.called
+
+        ent._attr_icon = "mdi:test"
+        ent.async_write_ha_state()
+        assert len(mock_async_set.mock_calls) == 1
+
+    assert hass.states.get("hello.world") is state
+
+    ent._attr_force_update = True
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world") is not state
+
+
+async def test_state_write_interval(hass: HomeAssistant) -> None:
+    """Test state writes within the interval are coalesced."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent._attr_state_write_interval = timedelta(seconds=10)
+    ent._attr_state = "0"
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").state == "0"
+
+    for value in range(1, 4):
+        ent._attr_state = str(value)
+        ent.async_write_ha_state()
+    assert hass.states.get("hello.world").state == "0"
+    assert hass.data[entity.DATA_COALESCED_STATE_WRITES] == {"hello.world": 3}
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass.states.get("hello.world").state == "3"
+
+    # The next write waits for the interval after the coalesced write
+    ent._attr_state = "4"
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").state == "3"
+
+    # Writes through async_update_ha_state are not coalesced
+    ent._attr_state = "5"
+    await ent.async_update_ha_state()
+    assert hass.states.get("hello.world").state == "5"
+
+    await ent.async_remove()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=22))
+    await hass.async_block_till_done()
+    assert hass.states.get("hello.world") is None
+    assert hass.data[entity.DATA_COALESCED_STATE_WRITES] == {"hello.world": 4}
+
+
+async def test_state_write_interval_from_platform(hass: HomeAssistant) -> None:
+    """Test the state write interval defaults to the one of the platform."""
+    platform = MockPlatform()
+    platform.STATE_WRITE_INTERVAL = timedelta(seconds=10)
+    entity_platform = MockEntityPlatform(hass, platform=platform)
+    ent = MockEntity(entity_id="test_domain.coalesced", state="0")
+    await entity_platform.async_add_entities([ent])
+    assert ent.state_write_interval == timedelta(seconds=10)
+
+    ent._values["state"] = "1"
+    ent.async_write_ha_state()
+    ent._values["state"] = "2"
+    ent.async_write_ha_state()
+    assert hass.states.get("test_domain.coalesced").state == "0"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass.states.get("test_domain.coalesced").state == "2"
+
+    ent._attr_state_write_interval = None
+    ent._values["state"] = "3"
+    ent.async_write_ha_state()
+    assert hass.states.get("test_domain.coalesced").state == "3"
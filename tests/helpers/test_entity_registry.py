@@ -2,6 +2,7 @@
 from typing import Any
 from unittest.mock import patch
 
+import attr
 import pytest
 import voluptuous as vol
 
@@ -1400,6 +1401,39 @@ def test_entity_registry_items() -> None:
     assert entities.get_entry(entry2.id) is None
 
 
+def test_entity_registry_items_indexes() -> None:
+    """Test the device, area and config entry indexes of EntityRegistryItems."""
+    entities = er.EntityRegistryItems()
+    entry1 = er.RegistryEntry(
+        "test.entity1", "1234", "hue", device_id="device1", config_entry_id="entry1"
+    )
+    entry2 = er.RegistryEntry(
+        "test.entity2", "2345", "hue", device_id="device1", area_id="area1"
+    )
+    entities["test.entity1"] = entry1
+    entities["test.entity2"] = entry2
+
+    assert entities.get_entries_for_device_id("device1") == [entry1, entry2]
+    assert entities.get_entries_for_area_id("area1") == [entry2]
+    assert entities.get_entries_for_config_entry_id("entry1") == [entry1]
+    assert entities.get_entries_for_device_id("device2") == []
+
+    # Updating an entry keeps its position for the values that did not change
+    entry1 = attr.evolve(entry1, area_id="area1", config_entry_id=None)
+    entities["test.entity1"] = entry1
+    assert entities.get_entries_for_device_id("device1") == [entry1, entry2]
+    assert entities.get_entries_for_area_id("area1") == [entry2, entry1]
+    assert entities.get_entries_for_config_entry_id("entry1") == []
+
+    del entities["test.entity2"]
+    assert entities.get_entries_for_device_id("device1") == [entry1]
+    assert entities.get_entries_for_area_id("area1") == [entry1]
+
+    entities.pop("test.entity1")
+    assert entities.get_entries_for_device_id("device1") == []
+    assert entities.get_entries_for_area_id("area1") == []
+
+
 async def test_disabled_by_str_not_allowed(hass: HomeAssistant) -> None:
     """Test we need to pass disabled by type."""
     reg = er.async_get(hass)
@@ -1517,3 +1551,22 @@ def test_migrate_entity_to_new_platform(
             new_unique_id=new_unique_id,
             new_config_entry_id=new_config_entry.entry_id,
         )
+
+
+async def test_stored_data_reused_for_unchanged_entries(
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test the stored data of unchanged entries is not rebuilt."""
+    entry1 = entity_registry.async_get_or_create("light", "hue", "1234")
+    entry2 = entity_registry.async_get_or_create("light", "hue", "5678")
+    data = entity_registry._data_to_save()
+
+    entity_registry.async_update_entity(entry2.entity_id, name="Renamed")
+    new_data = entity_registry._data_to_save()
+    assert new_data["entities"][0] is data["entities"][0]
+    assert new_data["entities"][0]["entity_id"] == entry1.entity_id
+    assert new_data["entities"][1] is not data["entities"][1]
+    assert new_data["entities"][1]["name"] == "Renamed"
+
+    entity_registry.async_remove(entry1.entity_id)
+    assert entity_registry._data_to_save()["entities"] == [new_data["entities"][1]]
@@ -18,12 +18,18 @@ from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_STATE_CHANGE_CALLBACKS,
+    TRACK_STATE_CHANGE_DOMAIN_CALLBACKS,
+    TRACK_STATE_CHANGE_DOMAIN_LISTENER,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_template_render_stats,
+    async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -3011,6 +3017,92 @@ async def test_async_track_template_result_multiple_templates(
     ]
 
 
+async def test_async_track_template_result_domain_uses_shared_index(
+    hass: HomeAssistant,
+) -> None:
+    """Test templates tracking a domain are dispatched by the shared domain index."""
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "2")
+    template_domain = Template("{{ states.sensor | map(attribute='state') | list }}")
+    template_entity = Template("{{ states.sensor.one.state }}")
+    template_all = Template("{{ states | count }}")
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        refresh_runs.append([update.result for update in updates])
+
+    info = async_track_template_result(
+        hass,
+        [
+            TrackTemplate(template_domain, None, timedelta(0)),
+            TrackTemplate(template_entity, None),
+        ],
+        refresh_listener,
+    )
+    info_all = async_track_template_result(
+        hass, [TrackTemplate(template_all, None, timedelta(0))], refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    # The entities in the tracked domain are not added to the entity index
+    assert "sensor.one" not in hass.data.get(TRACK_STATE_CHANGE_CALLBACKS, {})
+    assert len(hass.data[TRACK_STATE_CHANGE_DOMAIN_CALLBACKS]["sensor"]) == 1
+    assert len(hass.data[TRACK_STATE_CHANGE_DOMAIN_CALLBACKS][MATCH_ALL]) == 1
+
+    hass.states.async_set("sensor.one", "3")
+    await hass.async_block_till_done()
+    assert refresh_runs == [[["3", "2"], 3]]
+
+    refresh_runs.clear()
+    hass.states.async_set("sensor.three", "4")
+    await hass.async_block_till_done()
+    assert refresh_runs == [[["3", "4", "2"]], [3]]
+
+    refresh_runs.clear()
+    hass.states.async_remove("sensor.two")
+    await hass.async_block_till_done()
+    assert refresh_runs == [[["3", "4"]], [2]]
+
+    info.async_remove()
+    info_all.async_remove()
+    assert (
+        TRACK_STATE_CHANGE_DOMAIN_CALLBACKS not in hass.data
+        or not hass.data[TRACK_STATE_CHANGE_DOMAIN_CALLBACKS]
+    )
+    assert TRACK_STATE_CHANGE_DOMAIN_LISTENER not in hass.data
+
+
+async def test_async_track_template_result_render_stats(hass: HomeAssistant) -> None:
+    """Test the render counters of tracked templates."""
+    template_1 = Template("{{ states.switch.test.state }}")
+    template_2 = Template("{{ states.light.test.state }}")
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_1, None), TrackTemplate(template_2, None)],
+        ha.callback(lambda event, updates: None),
+    )
+    hass.states.async_set("switch.test", "on")
+    hass.states.async_set("switch.test", "off")
+    await hass.async_block_till_done()
+
+    assert info.render_stats[template_1].renders == 3
+    assert info.render_stats[template_2].renders == 1
+    assert info.render_stats[template_1].render_time > 0
+    assert (
+        info.render_stats[template_1].max_render_time
+        <= info.render_stats[template_1].render_time
+    )
+    assert {template for template, _ in async_get_template_render_stats(hass)} == {
+        template_1,
+        template_2,
+    }
+
+    info.async_remove()
+    assert async_get_template_render_stats(hass) == []
+
+
 async def test_async_track_template_result_multiple_templates_mixing_domain(
     hass: HomeAssistant,
 ) -> None:
@@ -4483,6 +4575,50 @@ async def test_async_track_entity_registry_updated_event_with_a_callback_that_th
     assert event_data[0] == {"action": "create", "entity_id": "switch.puppy_feeder"}
 
 
+async def test_async_track_device_registry_updated_event(hass: HomeAssistant) -> None:
+    """Test tracking device registry updates for a device_id."""
+    event_data = []
+
+    @ha.callback
+    def run_callback(event):
+        event_data.append(event.data)
+
+    @ha.callback
+    def failing_callback(event):
+        raise ValueError
+
+    unsub1 = async_track_device_registry_updated_event(
+        hass, "device_1", failing_callback
+    )
+    unsub2 = async_track_device_registry_updated_event(
+        hass, ["device_1", "device_2"], run_callback
+    )
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED,
+        {"action": "update", "device_id": "device_1", "changes": {}},
+    )
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED, {"action": "create", "device_id": "device_3"}
+    )
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED, {"action": "remove", "device_id": "device_2"}
+    )
+    await hass.async_block_till_done()
+
+    unsub1()
+    unsub2()
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED, {"action": "remove", "device_id": "device_1"}
+    )
+    await hass.async_block_till_done()
+
+    assert event_data == [
+        {"action": "update", "device_id": "device_1", "changes": {}},
+        {"action": "remove", "device_id": "device_2"},
+    ]
+    async_track_device_registry_updated_event(hass, [], run_callback)()
+
+
 async def test_async_track_entity_registry_updated_event_with_empty_list(
     hass: HomeAssistant,
 ) -> None:
@@ -1,5 +1,8 @@
 """The tests for the Restore component."""
+import asyncio
 from datetime import datetime, timedelta
+import json
+import os
 from typing import Any
 from unittest.mock import patch
 
@@ -10,13 +13,15 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import (
     DATA_RESTORE_STATE_TASK,
     STORAGE_KEY,
+    STORAGE_MINOR_VERSION,
+    STORAGE_VERSION,
     RestoreEntity,
     RestoreStateData,
     StoredState,
 )
 from homeassistant.util import dt as dt_util
 
-from tests.common import async_fire_time_changed
+from tests.common import async_fire_time_changed, async_test_home_assistant
 
 
 async def test_caching_data(hass: HomeAssistant) -> None:
@@ -380,3 +385,183 @@ async def test_restoring_invalid_entity_id(
 
     state = await entity.async_get_last_state()
     assert state is None
+
+
+def _stored_state_data(entity_id: str, state: str, last_seen: datetime) -> dict:
+    """Return the data of a stored state as it is loaded from storage."""
+    now = dt_util.utcnow().isoformat()
+    return {
+        "state": {
+            "entity_id": entity_id,
+            "state": state,
+            "attributes": {},
+            "last_changed": now,
+            "last_updated": now,
+            "context": {"id": "3c2243ff5f30447eb12e7348cfd5b8ff", "user_id": None},
+        },
+        "extra_data": None,
+        "last_seen": last_seen.isoformat(),
+    }
+
+
+async def test_stored_states_decoded_when_restored(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test stored states are decoded when restored and written back otherwise."""
+    now = dt_util.utcnow()
+    stored_data = {
+        "input_boolean.b0": _stored_state_data("input_boolean.b0", "on", now),
+        "input_boolean.b1": _stored_state_data("input_boolean.b1", "off", now),
+        "input_boolean.b2": _stored_state_data(
+            "input_boolean.b2", "off", now - timedelta(days=9)
+        ),
+    }
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": STORAGE_MINOR_VERSION,
+        "key": STORAGE_KEY,
+        "data": list(stored_data.values()),
+    }
+
+    data = await RestoreStateData.async_get_instance(hass)
+    assert data.last_states == {}
+    assert data.last_states_data == stored_data
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await entity.async_internal_added_to_hass()
+    state = await entity.async_get_last_state()
+    assert state.state == "on"
+    assert list(data.last_states) == ["input_boolean.b0"]
+    assert list(data.last_states_data) == ["input_boolean.b1", "input_boolean.b2"]
+
+    hass.states.async_set("input_boolean.b0", "off")
+    written_states = data.async_get_stored_data()
+
+    # b0 is written from the current state
+    # b1 is written back as it was loaded
+    # b2 is not written, since it is expired
+    assert list(written_states) == ["input_boolean.b0", "input_boolean.b1"]
+    assert written_states["input_boolean.b0"]["state"]["state"] == "off"
+    assert written_states["input_boolean.b1"] == stored_data["input_boolean.b1"]
+
+
+async def test_dump_reuses_unchanged_states(hass: HomeAssistant) -> None:
+    """Test the data of unchanged states is reused by the next dump."""
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await entity.async_internal_added_to_hass()
+    hass.states.async_set("input_boolean.b0", "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    first = data.async_get_stored_data()["input_boolean.b0"]
+    assert data.async_get_stored_data()["input_boolean.b0"] is first
+
+    # The last_seen time of an unchanged state is refreshed after a day
+    with patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=first["last_seen"] + timedelta(hours=23),
+    ):
+        assert data.async_get_stored_data()["input_boolean.b0"] is first
+    later = first["last_seen"] + timedelta(days=1, minutes=1)
+    with patch("homeassistant.util.dt.utcnow", return_value=later):
+        refreshed = data.async_get_stored_data()["input_boolean.b0"]
+    assert refreshed["last_seen"] == later
+    assert refreshed["state"] == first["state"]
+
+    hass.states.async_set("input_boolean.b0", "off")
+    changed = data.async_get_stored_data()["input_boolean.b0"]
+    assert changed["state"]["state"] == "off"
+
+
+async def test_journal_compacted_at_stop(tmpdir) -> None:
+    """Test the stored states are compacted into the data file at stop."""
+    loop = asyncio.get_running_loop()
+    hass = await async_test_home_assistant(loop)
+    hass.config.config_dir = await hass.async_add_executor_job(
+        tmpdir.mkdir, "temp_storage"
+    )
+
+    for idx in range(10):
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = f"input_boolean.b{idx}"
+        await entity.async_internal_added_to_hass()
+        hass.states.async_set(entity.entity_id, "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    data.async_setup_dump()
+    await hass.async_block_till_done()
+    hass.states.async_set("input_boolean.b0", "off")
+    await data.async_dump_states()
+    assert await hass.async_add_executor_job(os.path.exists, data.store.journal_path)
+
+    hass.states.async_set("input_boolean.b1", "off")
+    await hass.async_stop(force=True)
+
+    assert (
+        await hass.async_add_executor_job(os.path.exists, data.store.journal_path)
+        is False
+    )
+
+    def _load_states() -> dict[str, str]:
+        with open(data.store.path, encoding="utf-8") as data_file:
+            stored = json.load(data_file)
+        return {
+            item["state"]["entity_id"]: item["state"]["state"]
+            for item in stored["data"]
+        }
+
+    states = await hass.async_add_executor_job(_load_states)
+    assert states == {
+        "input_boolean.b0": "off",
+        "input_boolean.b1": "off",
+        **{f"input_boolean.b{idx}": "on" for idx in range(2, 10)},
+    }
+
+
+async def test_load_minor_version_1(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test loading the stored states written by minor version 1."""
+    now = dt_util.utcnow()
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [
+            _stored_state_data("input_boolean.b0", "on", now),
+            _stored_state_data("input_boolean.b1", "off", now),
+        ],
+    }
+
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b1"
+    state = await entity.async_get_last_state()
+    assert state.state == "off"
+
+    data = await RestoreStateData.async_get_instance(hass)
+    assert list(data.last_states_data) == ["input_boolean.b0"]
+
+
+async def test_stored_states_readable_by_minor_version_1(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the stored states are still written as a list of major version 1."""
+    entity = RestoreEntity()
+    entity.hass = hass
+    entity.entity_id = "input_boolean.b0"
+    await entity.async_internal_added_to_hass()
+    hass.states.async_set("input_boolean.b0", "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+    await data.async_dump_states()
+
+    stored = hass_storage[STORAGE_KEY]
+    assert stored["version"] == 1
+    assert stored["minor_version"] == STORAGE_MINOR_VERSION
+    assert [item["state"]["entity_id"] for item in stored["data"]] == [
+        "input_boolean.b0"
+    ]
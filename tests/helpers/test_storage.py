@@ -2,6 +2,7 @@
 import asyncio
 from datetime import timedelta
 import json
+import os
 from typing import Any, NamedTuple
 from unittest.mock import Mock, patch
 
@@ -547,3 +548,156 @@ async def test_saving_load_round_trip(tmpdir) -> None:
     }
 
     await hass.async_stop(force=True)
+
+
+@pytest.mark.parametrize(
+    ("old", "new"),
+    [
+        ({"a": 1}, {"a": 2}),
+        ({"a": 1}, {"b": 1}),
+        ({"a": {"b": 1, "c": 2}}, {"a": {"b": 1, "c": 3, "d": None}}),
+        ({"a": [1, 2, 3]}, {"a": [1, 3]}),
+        ({"a": [1, 2, 3]}, {"a": [0, 1, 2, 3, 4]}),
+        ({"a": [1, 2, 3]}, {"a": []}),
+        ({"a": [{"id": 1}, {"id": 2}]}, {"a": [{"id": 1}, {"id": 2, "b": [1]}]}),
+        ({"a": [{"id": 1}, {"id": 2}]}, {"a": [{"id": 2}, {"id": 1}]}),
+        ({"a": [1, 2]}, {"a": {"b": 1}}),
+        ([{"id": 1}, {"id": 2}, {"id": 3}], [{"id": 0}, {"id": 2}, {"id": 4}]),
+        ([1, 2, 3], [1, 3]),
+    ],
+)
+def test_journal_diff_round_trip(old: Any, new: Any) -> None:
+    """Test applying the journal diff of two values."""
+    ops = storage._journal_diff(old, new)
+    assert ops
+    data = json.loads(json.dumps(old))
+    storage._apply_journal_ops(data, json.loads(json.dumps(ops)))
+    assert data == new
+
+
+def test_journal_diff_not_patchable() -> None:
+    """Test data that cannot be patched."""
+    assert storage._journal_diff({"a": 1}, {"a": 1}) == []
+    assert storage._journal_diff(1, 2) is None
+    assert storage._journal_diff([1], {"a": 1}) is None
+    # The changed items of a list of the same length are updated in place
+    assert storage._journal_diff([{"a": 1}, 2, 3], [{"a": 2}, 2, 4]) == [
+        ["set", [0, "a"], 2],
+        ["set", [2], 4],
+    ]
+    assert storage._journal_diff({"a": {1: 1}}, {"a": {1: 2}}) == [
+        ["set", ["a"], {1: 2}]
+    ]
+    assert storage._journal_diff({1: 1}, {1: 2}) is None
+
+
+async def test_journal(tmpdir) -> None:
+    """Test changes are appended to the journal and read back when loading."""
+    loop = asyncio.get_running_loop()
+    hass = await async_test_home_assistant(loop)
+    hass.config.config_dir = await hass.async_add_executor_job(
+        tmpdir.mkdir, "temp_storage"
+    )
+
+    def read_files(store: storage.Store) -> tuple[str, str | None]:
+        with open(store.path, encoding="utf-8") as data_file:
+            data = data_file.read()
+        try:
+            with open(store.journal_path, encoding="utf-8") as journal_file:
+                journal = journal_file.read()
+        except FileNotFoundError:
+            journal = None
+        return data, journal
+
+    async def async_load() -> Any:
+        return await storage.Store(
+            hass, MOCK_VERSION, MOCK_KEY, journal=True
+        ).async_load()
+
+    items = [{"id": str(idx), "name": f"Item {idx}"} for idx in range(100)]
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+    await store.async_save({"items": items})
+    data_file, journal = await hass.async_add_executor_job(read_files, store)
+    assert journal is None
+
+    journal_id = json.loads(data_file)["journal_id"]
+    items = [*items[:10], {**items[10], "name": "Renamed"}, *items[11:]]
+    await store.async_save({"items": items})
+    items = [*items[:11], *items[12:]]
+    await store.async_save({"items": items})
+    assert await hass.async_add_executor_job(read_files, store) == (
+        data_file,
+        f'{{"id":"{journal_id}","ops":[["set",["items",10,"name"],"Renamed"]]}}\n'
+        f'{{"id":"{journal_id}","ops":[["splice",["items"],11,1,[]]]}}\n',
+    )
+    assert await async_load() == {"items": items}
+
+    # Unchanged data is not written
+    await store.async_save({"items": list(items)})
+    assert (await hass.async_add_executor_job(read_files, store))[1].count("\n") == 2
+
+    # A partially written entry is ignored
+    with open(store.journal_path, "a", encoding="utf-8") as journal_file:
+        journal_file.write('{"id":')
+    assert await async_load() == {"items": items}
+
+    # The next entry starts on a fresh line and is applied
+    items = [*items[:10], {**items[10], "name": "Renamed again"}, *items[11:]]
+    await store.async_save({"items": items})
+    journal = (await hass.async_add_executor_job(read_files, store))[1]
+    assert journal.splitlines()[2:] == [
+        '{"id":',
+        f'{{"id":"{journal_id}","ops":[["set",["items",10,"name"],"Renamed again"]]}}',
+    ]
+    assert await async_load() == {"items": items}
+
+    # The journal is compacted when it grows too large
+    items = [{**item, "name": f"Renamed item {item['id']}"} for item in items]
+    await store.async_save({"items": items})
+    new_data_file, journal = await hass.async_add_executor_job(read_files, store)
+    assert journal is None
+    assert new_data_file != data_file
+    assert await async_load() == {"items": items}
+
+    # A journal of a previous data file is ignored
+    await hass.async_add_executor_job(
+        lambda: open(store.journal_path, "w", encoding="utf-8").write(
+            '{"id":"old","ops":[["del",["items"]]]}\n'
+        )
+    )
+    assert await async_load() == {"items": items}
+
+    await store.async_remove()
+    assert await async_load() is None
+    assert (
+        await hass.async_add_executor_job(os.path.exists, store.journal_path) is False
+    )
+
+    await hass.async_stop(force=True)
+
+
+async def test_journal_compacted_at_final_write(tmpdir) -> None:
+    """Test the journal is compacted into the data file at the final write."""
+    loop = asyncio.get_running_loop()
+    hass = await async_test_home_assistant(loop)
+    hass.config.config_dir = await hass.async_add_executor_job(
+        tmpdir.mkdir, "temp_storage"
+    )
+
+    items = [{"id": str(idx), "name": f"Item {idx}"} for idx in range(100)]
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY, journal=True)
+    await store.async_save({"items": items})
+    items = [*items[:10], {**items[10], "name": "Renamed"}, *items[11:]]
+    await store.async_save({"items": items})
+    assert await hass.async_add_executor_job(os.path.exists, store.journal_path)
+
+    await hass.async_stop(force=True)
+
+    assert (
+        await hass.async_add_executor_job(os.path.exists, store.journal_path) is False
+    )
+    # The data file alone has all changes
+    data = await hass.async_add_executor_job(
+        storage.Store(hass, MOCK_VERSION, MOCK_KEY)._load_data
+    )
+    assert data["data"] == {"items": items}
@@ -1,9 +1,11 @@
 """Test Home Assistant template helper methods."""
 from __future__ import annotations
 
+import base64
 from collections.abc import Iterable
 from datetime import datetime, timedelta
 import logging
+import marshal
 import math
 import random
 from typing import Any
@@ -42,7 +44,7 @@ from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import UnitSystem
 
-from tests.common import MockConfigEntry
+from tests.common import MockConfigEntry, flush_store
 
 
 def _set_up_units(hass: HomeAssistant) -> None:
@@ -243,6 +245,26 @@ def test_iterating_domain_states(hass: HomeAssistant) -> None:
     )
 
 
+def test_iterating_domain_states_reuses_unchanged_template_states(
+    hass: HomeAssistant,
+) -> None:
+    """Test iterating domain states only creates template states for changes."""
+    hass.states.async_set("sensor.back_door", "open")
+    hass.states.async_set("sensor.temperature", 10)
+    domain_states = template.DomainStates(hass, "sensor")
+
+    first = list(domain_states)
+    hass.states.async_set("sensor.temperature", 11)
+    second = list(domain_states)
+
+    assert [state.state for state in second] == ["open", "11"]
+    assert second[0] is first[0]
+    assert second[1] is not first[1]
+
+    hass.states.async_remove("sensor.back_door")
+    assert [state.state for state in domain_states] == ["11"]
+
+
 def test_loop_controls(hass: HomeAssistant) -> None:
     """Test that loop controls are enabled."""
     assert (
@@ -4354,3 +4376,124 @@ async def test_render_to_info_with_exception(hass: HomeAssistant) -> None:
 
     assert info.all_states is False
     assert info.entities == {"test_domain.object"}
+
+
+async def test_template_code_cache(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the compiled code of templates is persisted and reused."""
+    await template.async_load_code_cache(hass)
+    code_cache: template.TemplateCodeCache = hass.data[template._TEMPLATE_CODE_CACHE]
+
+    tpl = template.Template("{{ 1 + value }}", hass)
+    assert tpl.async_render({"value": 1}) == 2
+    assert code_cache.misses == 1
+    tpl2 = template.Template("{{ 1 + value }}", hass)
+    assert tpl2.async_render({"value": 2}) == 3
+    # The code is still in the in-memory cache of the environment
+    assert code_cache.hits == 0
+    assert code_cache.misses == 1
+
+    template.Template("{{ 3 + value }}", hass).ensure_valid()
+    assert code_cache.misses == 2
+
+    await hass.async_block_till_done()
+    await flush_store(code_cache._store)
+    data = hass_storage[template.TEMPLATE_CODE_CACHE_STORAGE_KEY]["data"]
+    assert len(data["entries"]) == 2
+
+    # Simulate a restart
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_code_cache(hass)
+    code_cache = hass.data[template._TEMPLATE_CODE_CACHE]
+    with patch("jinja2.Environment.compile", side_effect=AssertionError("compiled")):
+        tpl = template.Template("{{ 1 + value }}", hass)
+        assert tpl.async_render({"value": 4}) == 5
+    assert code_cache.hits == 1
+    assert code_cache.misses == 0
+
+
+async def test_template_code_cache_compiled_outside_event_loop(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test templates compiled in the executor are added to the code cache."""
+    await template.async_load_code_cache(hass)
+    code_cache: template.TemplateCodeCache = hass.data[template._TEMPLATE_CODE_CACHE]
+
+    def _compile_templates() -> None:
+        for value in range(3):
+            template.Template(f"{{{{ {value} + value }}}}", hass).ensure_valid()
+
+    with patch.object(template, "TEMPLATE_CODE_CACHE_MAX_ENTRIES", 2):
+        await hass.async_add_executor_job(_compile_templates)
+    assert code_cache.misses == 3
+
+    await hass.async_block_till_done()
+    await flush_store(code_cache._store)
+    data = hass_storage[template.TEMPLATE_CODE_CACHE_STORAGE_KEY]["data"]
+    # The least recently used entry was evicted
+    assert list(data["entries"]) == [
+        code_cache.key("", "{{ 1 + value }}"),
+        code_cache.key("", "{{ 2 + value }}"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "version_key", ["ha_version", "jinja_version", "python_version"]
+)
+async def test_template_code_cache_version_change(
+    hass: HomeAssistant, hass_storage: dict[str, Any], version_key: str
+) -> None:
+    """Test the template code cache is discarded when the versions change."""
+    await template.async_load_code_cache(hass)
+    code_cache: template.TemplateCodeCache = hass.data[template._TEMPLATE_CODE_CACHE]
+    template.Template("{{ 2 + value }}", hass).ensure_valid()
+    await hass.async_block_till_done()
+    await flush_store(code_cache._store)
+    hass_storage[template.TEMPLATE_CODE_CACHE_STORAGE_KEY]["data"][
+        version_key
+    ] = "0.0.0"
+
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_code_cache(hass)
+    code_cache = hass.data[template._TEMPLATE_CODE_CACHE]
+    template.Template("{{ 2 + value }}", hass).ensure_valid()
+    assert code_cache.hits == 0
+    assert code_cache.misses == 1
+
+
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        "not base64!",
+        base64.b64encode(b"\xff").decode(),
+        base64.b64encode(marshal.dumps(b"")[:-1]).decode(),
+        base64.b64encode(marshal.dumps("not code")).decode(),
+        1,
+    ],
+)
+async def test_template_code_cache_invalid_entry(
+    hass: HomeAssistant, hass_storage: dict[str, Any], encoded: Any
+) -> None:
+    """Test invalid entries of the template code cache are discarded."""
+    await template.async_load_code_cache(hass)
+    code_cache: template.TemplateCodeCache = hass.data[template._TEMPLATE_CODE_CACHE]
+    template.Template("{{ 2 + value }}", hass).ensure_valid()
+    await hass.async_block_till_done()
+    await flush_store(code_cache._store)
+    data = hass_storage[template.TEMPLATE_CODE_CACHE_STORAGE_KEY]["data"]
+    key = code_cache.key("", "{{ 2 + value }}")
+    data["entries"][key] = encoded
+
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_code_cache(hass)
+    code_cache = hass.data[template._TEMPLATE_CODE_CACHE]
+    tpl = template.Template("{{ 2 + value }}", hass)
+    assert tpl.async_render({"value": 1}) == 3
+    assert code_cache.hits == 0
+    assert code_cache.misses == 1
+
+    await hass.async_block_till_done()
+    await flush_store(code_cache._store)
+    data = hass_storage[template.TEMPLATE_CODE_CACHE_STORAGE_KEY]["data"]
+    assert data["entries"][key] != encoded
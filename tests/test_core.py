@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import array
 import asyncio
+from collections.abc import Callable
 from datetime import datetime, timedelta
 import functools
 import gc
@@ -566,6 +567,149 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_event_data_match_listener(hass: HomeAssistant) -> None:
+    """Test listeners indexed by a value of the event data."""
+    calls = []
+    filtered_calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def filtered_listener(event):
+        """Mock filtered listener."""
+        filtered_calls.append(event)
+
+    @ha.callback
+    def filter(event):
+        """Mock filter."""
+        return not event.data["filtered"]
+
+    unsub = hass.bus.async_listen(
+        "test", listener, event_data_match=("entity_id", "light.kitchen")
+    )
+    unsub_filtered = hass.bus.async_listen(
+        "test",
+        filtered_listener,
+        event_filter=filter,
+        event_data_match=("entity_id", "light.kitchen"),
+    )
+    assert hass.bus.async_listeners()["test"] == 2
+
+    hass.bus.async_fire("test", {"entity_id": "light.bedroom", "filtered": False})
+    hass.bus.async_fire("test", {"entity_id": ["light.kitchen"], "filtered": False})
+    hass.bus.async_fire("test", {"filtered": False})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other", {"entity_id": "light.kitchen", "filtered": False})
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+    assert len(filtered_calls) == 0
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "filtered": True})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert len(filtered_calls) == 0
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "filtered": False})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert len(filtered_calls) == 1
+
+    unsub()
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "filtered": False})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert len(filtered_calls) == 2
+
+    unsub_filtered()
+    assert "test" not in hass.bus.async_listeners()
+    assert not hass.bus._match_listeners
+
+
+async def test_eventbus_event_data_match_listener_match_all(
+    hass: HomeAssistant,
+) -> None:
+    """Test indexed listeners of all events run after the unindexed ones."""
+    calls = []
+
+    def listener(name: str) -> Callable[[ha.Event], None]:
+        """Return a mock listener."""
+
+        @ha.callback
+        def mock_listener(event: ha.Event) -> None:
+            calls.append((name, event.event_type))
+
+        return mock_listener
+
+    unsubs = [
+        hass.bus.async_listen(
+            "test",
+            listener("test_indexed"),
+            run_immediately=True,
+            event_data_match=("key", "value"),
+        ),
+        hass.bus.async_listen("test", listener("test"), run_immediately=True),
+        hass.bus.async_listen(
+            MATCH_ALL,
+            listener("all_indexed"),
+            run_immediately=True,
+            event_data_match=("key", "value"),
+        ),
+        hass.bus.async_listen(MATCH_ALL, listener("all"), run_immediately=True),
+    ]
+
+    hass.bus.async_fire("test", {"key": "value"})
+    assert calls == [
+        ("all", "test"),
+        ("all_indexed", "test"),
+        ("test", "test"),
+        ("test_indexed", "test"),
+    ]
+
+    calls.clear()
+    hass.bus.async_fire("other", {"key": "value"})
+    hass.bus.async_fire("other", {"key": "other_value"})
+    assert calls == [("all", "other"), ("all_indexed", "other"), ("all", "other")]
+
+    calls.clear()
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE, {"key": "value"})
+    assert calls == []
+
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_eventbus_remove_listener_while_firing(hass: HomeAssistant) -> None:
+    """Test listeners removing themselves while firing do not skip others."""
+    calls = []
+
+    def _async_listen_once_immediately(
+        event_data_match: tuple[str, str] | None
+    ) -> None:
+        """Listen with a listener that removes itself."""
+
+        @ha.callback
+        def listener(event):
+            """Mock listener."""
+            calls.append(event)
+            unsub()
+
+        unsub = hass.bus.async_listen(
+            "test", listener, run_immediately=True, event_data_match=event_data_match
+        )
+
+    for _ in range(2):
+        _async_listen_once_immediately(None)
+        _async_listen_once_immediately(("entity_id", "light.kitchen"))
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 4
+    assert "test" not in hass.bus.async_listeners()
+
+
 async def test_eventbus_run_immediately(hass: HomeAssistant) -> None:
     """Test we can call events immediately."""
     calls = []
@@ -882,6 +1026,39 @@ async def test_statemachine_force_update(hass: HomeAssistant) -> None:
     assert len(events) == 1
 
 
+async def test_statemachine_reuses_unchanged_attributes(hass: HomeAssistant) -> None:
+    """Test the attributes of the old state are reused when they did not change."""
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    old_state = hass.states.get("sensor.power")
+
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    new_state = hass.states.get("sensor.power")
+    assert new_state.attributes is old_state.attributes
+
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "kW"})
+    assert hass.states.get("sensor.power").attributes == {"unit_of_measurement": "kW"}
+    assert new_state.attributes == {"unit_of_measurement": "W"}
+
+
+async def test_statemachine_lazy_context_id_survives_expire(
+    hass: HomeAssistant,
+) -> None:
+    """Test the id of a lazy context matches after the old state expired."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("sensor.power", "2")
+    await hass.async_block_till_done()
+
+    first_context = events[0].context
+    expired_context = events[1].data["old_state"].context
+    assert expired_context is not first_context
+    assert expired_context.origin_event is None
+    assert first_context.origin_event is events[0]
+    assert expired_context.id == first_context.id
+    assert expired_context == first_context
+    assert events[1].context.id != first_context.id
+
+
 def test_service_call_repr() -> None:
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1578,6 +1755,34 @@ async def test_async_entity_ids_count(hass: HomeAssistant) -> None:
 
     assert hass.states.async_entity_ids_count() == 5
     assert hass.states.async_entity_ids_count("light") == 3
+    assert hass.states.async_entity_ids_count(["light", "switch"]) == 4
+
+    hass.states.async_remove("light.bowl")
+    hass.states.async_remove("switch.link")
+
+    assert hass.states.async_entity_ids_count() == 3
+    assert hass.states.async_entity_ids_count("light") == 2
+    assert hass.states.async_entity_ids_count("switch") == 0
+    assert hass.states.async_entity_ids("light") == ["light.frog", "light.cow"]
+    assert hass.states.async_entity_ids("switch") == []
+    assert hass.states.async_all("switch") == []
+
+
+async def test_async_all_domain_filter_keeps_order(hass: HomeAssistant) -> None:
+    """Test states of several domains are returned in the order they were added."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.link", "off")
+    hass.states.async_set("light.frog", "on")
+    hass.states.async_set("sensor.temp", "20")
+    hass.states.async_set("switch.kitchen", "on")
+    hass.states.async_set("light.bowl", "off")
+
+    expected = ["light.bowl", "switch.link", "light.frog", "switch.kitchen"]
+    assert hass.states.async_entity_ids(["switch", "light"]) == expected
+    assert [
+        state.entity_id for state in hass.states.async_all(["switch", "light"])
+    ] == expected
+    assert hass.states.async_entity_ids("light") == ["light.bowl", "light.frog"]
 
 
 async def test_hassjob_forbid_coroutine() -> None:
@@ -1,4 +1,10 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
+import json
+import os
+import pathlib
+import sys
+from typing import Any
 from unittest.mock import patch
 
 import pytest
@@ -7,8 +13,9 @@ from homeassistant import loader
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
 from homeassistant.core import HomeAssistant, callback
+import homeassistant.util.dt as dt_util
 
-from .common import MockModule, mock_integration
+from .common import MockModule, async_fire_time_changed, mock_integration
 
 
 async def test_component_dependencies(hass: HomeAssistant) -> None:
@@ -493,6 +500,86 @@ async def test_get_custom_components(
         mock_get.assert_called_once_with(hass)
 
 
+async def test_get_builtin_integration_from_manifest_index(
+    hass: HomeAssistant,
+) -> None:
+    """Test built-in integrations are resolved from the generated manifest index."""
+    with patch(
+        "homeassistant.loader.Integration.resolve_from_root",
+        side_effect=AssertionError("read manifest.json"),
+    ):
+        integration = await loader.async_get_integration(hass, "http")
+
+    assert integration.pkg_path == "homeassistant.components.http"
+    assert integration.file_path == pathlib.Path(http.__file__).parent
+    manifest = json.loads((integration.file_path / "manifest.json").read_text())
+    assert integration.manifest == {**manifest, "is_built_in": True}
+
+
+def test_remove_outdated_manifests(
+    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test manifests changed after the index was generated are not used."""
+    manifests_path = tmp_path / "generated" / "manifests.json"
+    manifests_path.parent.mkdir()
+    for domain in ("unchanged", "changed"):
+        manifest_path = tmp_path / "components" / domain / "manifest.json"
+        manifest_path.parent.mkdir(parents=True)
+        manifest_path.write_text("{}")
+    manifests_path.write_text("{}")
+    index_mtime_ns = manifests_path.stat().st_mtime_ns
+    os.utime(
+        tmp_path / "components" / "changed" / "manifest.json",
+        ns=(index_mtime_ns + 1, index_mtime_ns + 1),
+    )
+
+    manifests: dict[str, Any] = {"unchanged": {}, "changed": {}, "removed": {}}
+    loader._remove_outdated_manifests(manifests, manifests_path)
+    assert manifests == {"unchanged": {}}
+    assert "The manifest index is out of date for changed, removed" in caplog.text
+
+
+async def test_get_custom_components_index(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    enable_custom_integrations: None,
+) -> None:
+    """Test custom components are resolved using the index of the last run."""
+    integrations = await loader._async_get_custom_components(hass)
+    assert {"test", "test_package"} <= integrations.keys()
+    assert "test_no_version" not in integrations
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    index = hass_storage[loader.CUSTOM_COMPONENTS_INDEX_STORAGE_KEY]["data"]
+    custom_components = sys.modules["custom_components"]
+
+    with patch("homeassistant.loader.os.scandir") as mock_scandir, patch(
+        "homeassistant.loader.json_loads"
+    ) as mock_json_loads:
+        cached_integrations, new_index = await hass.async_add_executor_job(
+            loader._resolve_custom_components,
+            hass,
+            custom_components,
+            index,
+        )
+    assert not mock_scandir.mock_calls
+    assert not mock_json_loads.mock_calls
+    assert cached_integrations.keys() == integrations.keys()
+    assert cached_integrations["test"].manifest == integrations["test"].manifest
+    assert new_index == index
+
+    # A changed manifest is parsed again
+    test_manifest_path = str(integrations["test"].file_path / "manifest.json")
+    index["manifests"][test_manifest_path]["mtime_ns"] = 0
+    with patch(
+        "homeassistant.loader.json_loads", wraps=loader.json_loads
+    ) as mock_json_loads:
+        await hass.async_add_executor_job(
+            loader._resolve_custom_components, hass, custom_components, index
+        )
+    assert len(mock_json_loads.mock_calls) == 1
+
+
 async def test_get_config_flows(hass: HomeAssistant) -> None:
     """Verify that custom components with config_flow are available."""
     test_1_integration = _get_test_integration(hass, "test_1", False)
@@ -725,3 +812,47 @@ async def test_loggers(hass: HomeAssistant) -> None:
         },
     )
     assert integration.loggers == ["name1", "name2"]
+
+
+async def test_async_get_component_prefetches_config_flow(hass: HomeAssistant) -> None:
+    """Test the component and its config flow are imported in the executor."""
+    integration = await loader.async_get_integration(hass, "hue")
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_add_executor_job:
+        assert await integration.async_get_component() is hue
+    assert len(mock_add_executor_job.mock_calls) == 1
+
+    cache = hass.data[loader.DATA_COMPONENTS]
+    assert "hue.config_flow" in cache
+    # Entity platforms are only imported when they are set up
+    assert "hue.light" not in cache
+    assert "hue.diagnostics" not in cache
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_add_executor_job:
+        assert await integration.async_get_platform("light") is hue_light
+    assert len(mock_add_executor_job.mock_calls) == 1
+    assert integration.get_platform("light") is hue_light
+    assert "hue" not in hass.data.get(loader.DATA_LOOP_IMPORT_TIME, {})
+
+
+async def test_async_get_platform_import_error(hass: HomeAssistant) -> None:
+    """Test import errors of platforms imported in the executor are raised."""
+    integration = mock_integration(hass, MockModule("mock_integration"))
+    with pytest.raises(ImportError):
+        await integration.async_get_platform("light")
+    assert "mock_integration.light" not in hass.data[loader.DATA_COMPONENTS]
+
+
+async def test_loop_import_time(hass: HomeAssistant) -> None:
+    """Test the time imports block the event loop is recorded."""
+    integration = await loader.async_get_integration(hass, "http")
+    assert integration.get_component() is http
+    assert integration.get_component() is http
+    loop_import_time = hass.data[loader.DATA_LOOP_IMPORT_TIME]
+    assert loop_import_time["http"] > 0
+
+    with pytest.raises(ImportError):
+        await hass.async_add_executor_job(integration.get_platform, "non_existing")
+    assert loop_import_time.keys() == {"http"}
@@ -14,3 +14,13 @@ async def test_ulid_util_uuid_hex() -> None:
 async def test_ulid_util_uuid() -> None:
     """Verify we can generate a ulid."""
     assert len(ulid_util.ulid()) == 26
+
+
+async def test_ulid_util_from_randomness() -> None:
+    """Verify the same time and random bits generate the same ulid."""
+    randomness = ulid_util.ulid_randomness()
+    ulid = ulid_util.ulid_from_randomness(1681000000.123, randomness)
+    assert len(ulid) == 26
+    assert ulid == ulid_util.ulid_from_randomness(1681000000.123, randomness)
+    assert ulid_util.ulid_to_bytes(ulid)[:6] == int(1681000000123).to_bytes(6, "big")
+    assert ulid_util.ulid_to_bytes(ulid)[6:] == randomness.to_bytes(10, "big")